@@ -0,0 +1,242 @@
+"""
+Funnel and time-in-stage analytics over the status history.
+
+Every status change is appended to ``status_transitions`` in the same
+transaction as the change. A window query (``LEAD`` over each
+application's transitions) turns the history into stays: a status and how
+long the application sat in it, or NULL for the status it is in now.
+
+Stays are cached per user, together with running aggregates that both
+reports are read from, the ``user_stats.data_version`` and the last
+transition id they reflect. A request whose data version still matches is
+answered from the cache. When the version has moved, only applications
+with transitions newer than the cached id are re-queried, and their old
+contribution to the aggregates is swapped for the new one. History is
+append-only, so that is exact; the one thing it cannot see is applications
+being deleted, which the ``total_applications`` counter gives away and
+which triggers a full rebuild.
+"""
+import os
+from bisect import insort
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.cache import TTLCache
+from app.models import Application, ApplicationStatus, StatusTransition, UserStats
+from app.schemas import FunnelResponse, FunnelStage, StageDuration
+
+ANALYTICS_CACHE_SIZE = int(os.getenv("ANALYTICS_CACHE_SIZE", "1000"))
+ANALYTICS_CACHE_SECONDS = float(os.getenv("ANALYTICS_CACHE_SECONDS", "3600"))
+
+# The forward path of an application; rejected and withdrawn can end it at any step
+PIPELINE = [
+    ApplicationStatus.SAVED,
+    ApplicationStatus.APPLIED,
+    ApplicationStatus.PHONE_SCREEN,
+    ApplicationStatus.INTERVIEW,
+    ApplicationStatus.FINAL_INTERVIEW,
+    ApplicationStatus.OFFER,
+]
+STAGE_RANK = {status: rank for rank, status in enumerate(PIPELINE)}
+SECONDS_PER_DAY = 86400
+
+# [(status, seconds spent in it, or None for the current status)] of one application
+Stays = List[Tuple[ApplicationStatus, Optional[float]]]
+
+@dataclass
+class _History:
+    version: int
+    total_applications: int
+    last_transition_id: int
+    stays: Dict[int, Stays] = field(default_factory=dict)
+    reached: List[int] = field(default_factory=lambda: [0] * len(PIPELINE))
+    current: Counter = field(default_factory=Counter)
+    # Completed stays per status, kept sorted for the percentiles
+    spans: Dict[ApplicationStatus, List[float]] = field(
+        default_factory=lambda: {status: [] for status in ApplicationStatus}
+    )
+    span_totals: Counter = field(default_factory=Counter)
+
+    def _count(self, stays: Stays, sign: int) -> None:
+        furthest = -1
+        for status, _ in stays:
+            rank = STAGE_RANK.get(status, -1)
+            if rank > furthest:
+                furthest = rank
+        for rank in range(furthest + 1):
+            self.reached[rank] += sign
+        self.current[stays[-1][0]] += sign
+
+    def update(self, application_id: int, stays: Stays, keep_sorted: bool = True) -> None:
+        """
+        Replace one application's stays, which can only have grown since last
+        seen. With ``keep_sorted=False`` new spans are appended unsorted and
+        the caller must call :meth:`sort` once done.
+        """
+        old = self.stays.get(application_id, [])
+        if old:
+            self._count(old, -1)
+        self._count(stays, 1)
+        completed_before = sum(seconds is not None for _, seconds in old)
+        for status, seconds in stays[completed_before:]:
+            if seconds is not None:
+                seconds = max(seconds, 0.0)
+                if keep_sorted:
+                    insort(self.spans[status], seconds)
+                else:
+                    self.spans[status].append(seconds)
+                self.span_totals[status] += seconds
+        self.stays[application_id] = stays
+
+    def sort(self) -> None:
+        for spans in self.spans.values():
+            spans.sort()
+
+_histories = TTLCache(maxsize=ANALYTICS_CACHE_SIZE, ttl=ANALYTICS_CACHE_SECONDS)
+
+async def record_change(
+    db: AsyncSession, user_id: int, application_id: int,
+    from_status: Optional[ApplicationStatus], to_status: Optional[ApplicationStatus],
+) -> None:
+    """Append an application's move from ``from_status`` to ``to_status``, if it moved."""
+    if to_status is None or to_status == from_status:
+        return
+    await db.execute(insert(StatusTransition).values(
+        application_id=application_id, user_id=user_id, from_status=from_status, to_status=to_status,
+    ))
+
+async def record_created(db: AsyncSession, user_id: int, rows: Iterable[Tuple[int, ApplicationStatus]]) -> None:
+    """Start the history of applications inserted in bulk, given ``(id, status)`` pairs."""
+    history = [
+        {"application_id": application_id, "user_id": user_id, "from_status": None, "to_status": status}
+        for application_id, status in rows if status is not None
+    ]
+    if history:
+        await db.execute(insert(StatusTransition), history)
+
+def backfill(db: Session, user_id: Optional[int] = None) -> int:
+    """Give applications without any history a first transition to their current status."""
+    has_history = select(StatusTransition.id).where(StatusTransition.application_id == Application.id).exists()
+    query = select(Application.id, Application.user_id, Application.status, Application.created_at).where(
+        ~has_history, Application.status.is_not(None)
+    )
+    if user_id is not None:
+        query = query.where(Application.user_id == user_id)
+    rows = db.execute(query).all()
+    for application_id, owner_id, status, created_at in rows:
+        db.add(StatusTransition(
+            application_id=application_id, user_id=owner_id, from_status=None, to_status=status,
+            **({"changed_at": created_at} if created_at else {}),
+        ))
+    db.commit()
+    return len(rows)
+
+def _seconds_between(dialect_name: str, start, end):
+    if dialect_name == "sqlite":
+        return (func.julianday(end) - func.julianday(start)) * SECONDS_PER_DAY
+    return func.extract("epoch", end - start)
+
+async def _query_stays(
+    db: AsyncSession, user_id: int, after_transition_id: int = 0
+) -> Tuple[Dict[int, Stays], int]:
+    """
+    Stays of the user's applications that have a transition newer than
+    ``after_transition_id`` (all of them by default), and the newest
+    transition id seen.
+    """
+    t = StatusTransition
+    left_at = func.lead(t.changed_at).over(partition_by=t.application_id, order_by=(t.changed_at, t.id))
+    query = select(
+        t.application_id, t.to_status, _seconds_between(db.bind.dialect.name, t.changed_at, left_at), t.id
+    ).where(t.user_id == user_id)
+    if after_transition_id:
+        query = query.where(t.application_id.in_(
+            select(t.application_id).where(t.user_id == user_id, t.id > after_transition_id)
+        ))
+    query = query.order_by(t.application_id, t.changed_at, t.id)
+
+    stays: Dict[int, Stays] = {}
+    last_id = after_transition_id
+    # Core rows: at tens of thousands of transitions the ORM result layer dominates
+    for application_id, status, seconds, transition_id in await (await db.connection()).execute(query):
+        stays.setdefault(application_id, []).append((status, seconds))
+        if transition_id > last_id:
+            last_id = transition_id
+    return stays, last_id
+
+async def _history(db: AsyncSession, user_id: int) -> _History:
+    row = (await db.execute(
+        select(UserStats.data_version, UserStats.total_applications).where(UserStats.user_id == user_id)
+    )).first()
+    version, total_applications = row or (0, 0)
+    cached: Optional[_History] = _histories.get(user_id)
+    if cached is not None and cached.version == version:
+        return cached
+
+    if cached is not None:
+        after = cached.last_transition_id
+        changed, last_id = await _query_stays(db, user_id, after)
+        if _histories.get(user_id) is not cached or cached.last_transition_id != after:
+            return await _history(db, user_id)  # refreshed by a concurrent request meanwhile
+        created = sum(application_id not in cached.stays for application_id in changed)
+        if total_applications == cached.total_applications + created:
+            for application_id, stays in changed.items():
+                cached.update(application_id, stays)
+            cached.version, cached.total_applications, cached.last_transition_id = version, total_applications, last_id
+            return cached
+
+    # First request, or applications were deleted: start over
+    all_stays, last_id = await _query_stays(db, user_id)
+    history = _History(version, total_applications, last_id)
+    for application_id, stays in all_stays.items():
+        history.update(application_id, stays, keep_sorted=False)
+    history.sort()
+    _histories.set(user_id, history)
+    return history
+
+def _ratio(part: int, whole: int) -> Optional[float]:
+    return round(part / whole, 4) if whole else None
+
+def _days(seconds: float) -> float:
+    return round(seconds / SECONDS_PER_DAY, 2)
+
+async def funnel(db: AsyncSession, user_id: int) -> FunnelResponse:
+    """How many applications reached each pipeline stage, and the conversion between stages."""
+    history = await _history(db, user_id)
+    reached = history.reached
+    applied_rank = STAGE_RANK[ApplicationStatus.APPLIED]
+    return FunnelResponse(
+        total_applications=len(history.stays),
+        stages=[
+            FunnelStage(
+                status=status,
+                reached=reached[rank],
+                conversion_from_previous=_ratio(reached[rank], reached[rank - 1]) if rank else None,
+                conversion_from_applied=_ratio(reached[rank], reached[applied_rank]) if rank > applied_rank else None,
+            )
+            for rank, status in enumerate(PIPELINE)
+        ],
+        rejected=history.current[ApplicationStatus.REJECTED],
+        withdrawn=history.current[ApplicationStatus.WITHDRAWN],
+    )
+
+async def stage_durations(db: AsyncSession, user_id: int) -> List[StageDuration]:
+    """How long applications stay in each status before moving on, and how many are in it now."""
+    history = await _history(db, user_id)
+    durations = []
+    for status in ApplicationStatus:
+        spans = history.spans[status]
+        n = len(spans)
+        durations.append(StageDuration(
+            status=status,
+            completed=n,
+            current=history.current[status],
+            avg_days=_days(history.span_totals[status] / n) if n else None,
+            median_days=_days((spans[(n - 1) // 2] + spans[n // 2]) / 2) if n else None,
+            p90_days=_days(spans[min(n - 1, int(n * 0.9))]) if n else None,
+            max_days=_days(spans[-1]) if n else None,
+        ))
+    return durations
@@ -1,11 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
+import os
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache import TTLCache
+from app.database import get_async_db
 from app.models import User
 from app.schemas import TokenData
 import bcrypt
@@ -14,8 +20,29 @@ SECRET_KEY = "your-secret-key-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Verified tokens and user records are cached so repeat requests with the
+# same token skip jwt.decode and the users lookup.
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "300"))
+
+_token_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+_user_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+# bcrypt cost factor for new hashes; existing hashes with a different cost
+# are transparently rehashed on the next successful login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# bcrypt is deliberately slow CPU work (~100-300 ms per call). It runs on a
+# bounded pool of worker threads (bcrypt releases the GIL) so it never stalls
+# the event loop and at most this many hashes run at once.
+PASSWORD_HASH_CONCURRENCY = int(os.getenv("PASSWORD_HASH_CONCURRENCY", str(os.cpu_count() or 2)))
+
+_password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_CONCURRENCY, thread_name_prefix="password-hash"
+)
+
 # Use bcrypt directly to avoid passlib compatibility issues
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -45,10 +72,27 @@ def get_password_hash(password: str) -> str:
         return pwd_context.hash(password)
     except (AttributeError, Exception):
         # Fallback to direct bcrypt if passlib fails (compatibility issue with newer bcrypt)
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when a bcrypt hash was made with a cost factor other than BCRYPT_ROUNDS."""
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the password worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -59,36 +103,96 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    return db.query(User).filter(User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    return await db.scalar(select(User).where(User.email == email))
+
+def invalidate_user(user_id: Optional[int] = None, email: Optional[str] = None) -> None:
+    """Drop cached records for a user whose row changed."""
+    if user_id is not None:
+        _user_cache.pop(("id", user_id))
+    if email is not None:
+        _user_cache.pop(("email", email))
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    invalidate_user(target.id, target.email)
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    user = get_user_by_email(db, email)
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await get_password_hash_async(password)
+        await db.commit()
     return user
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def decode_token(token: str) -> TokenData:
+    """Verify a token and return its claims, caching the result until the token expires."""
+    token_data = _token_cache.get(token)
+    if token_data is not None:
+        return token_data
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
     except JWTError:
-        raise credentials_exception
-    user = get_user_by_email(db, email=token_data.email)
+        raise _credentials_exception()
+    email: str = payload.get("sub")
+    if email is None:
+        raise _credentials_exception()
+    token_data = TokenData(email=email, user_id=payload.get("user_id"))
+    expires_in = payload["exp"] - time.time() if "exp" in payload else None
+    _token_cache.set(token, token_data, ttl=expires_in)
+    return token_data
+
+async def _load_user(db: AsyncSession, token_data: TokenData) -> Optional[User]:
+    key = ("id", token_data.user_id) if token_data.user_id is not None else ("email", token_data.email)
+    user = _user_cache.get(key)
+    if user is not None:
+        return user
+    user = await get_user_by_email(db, email=token_data.email)
     if user is None:
-        raise credentials_exception
+        return None
+    # Detach so the cached copy is never expired by another request's commit
+    db.expunge(user)
+    _user_cache.set(("id", user.id), user)
+    _user_cache.set(("email", user.email), user)
     return user
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    token_data = decode_token(token)
+    user = await _load_user(db, token_data)
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+async def get_current_user_id(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> int:
+    """
+    Resolve only the current user's id.
+
+    Tokens carry a ``user_id`` claim, so this normally needs no database
+    access at all; tokens issued before the claim existed fall back to the
+    cached user lookup.
+    """
+    token_data = decode_token(token)
+    if token_data.user_id is not None:
+        return token_data.user_id
+    user = await _load_user(db, token_data)
+    if user is None:
+        raise _credentials_exception()
+    return user.id
+
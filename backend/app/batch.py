@@ -0,0 +1,146 @@
+"""
+Several creates, updates and deletes in one request and one transaction.
+
+Operations run in order through the same write path as the entity
+endpoints (``app.crud``, ``app.deletes``), so counters, status history and
+data versions move exactly as if each had been its own request. Nothing is
+committed until every operation has succeeded: the first failure rolls the
+whole batch back and is reported with the operation's index.
+
+An operation may name its record with ``ref``. Later operations then write
+``"$<ref>"`` for that record's id, as the ``id`` of an update or delete or
+in a reference field such as ``company_id``.
+
+Literal ids in reference fields are checked against the user's own rows
+up front, one query per referenced table, so a batch that points at a
+missing or foreign record fails before anything is written.
+"""
+from typing import Any, Dict, List, Optional, Tuple, Type
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud, deletes
+from app.bulk import ENTITIES, owned_ids
+from app.schemas import (
+    ApplicationResponse, ApplicationUpdate, BatchOperation, BatchResult, CompanyResponse, CompanyUpdate,
+    ContactResponse, ContactUpdate, InterviewResponse, InterviewUpdate,
+)
+
+MAX_BATCH_OPERATIONS = 500
+
+# entity -> (name in error messages, update schema, response schema)
+BATCH_ENTITIES: Dict[str, Tuple[str, Type[BaseModel], Type[BaseModel]]] = {
+    "applications": ("Application", ApplicationUpdate, ApplicationResponse),
+    "companies": ("Company", CompanyUpdate, CompanyResponse),
+    "contacts": ("Contact", ContactUpdate, ContactResponse),
+    "interviews": ("Interview", InterviewUpdate, InterviewResponse),
+}
+
+# Fields that accept "$<ref>", and the entity the reference must name
+REFERENCE_FIELDS = {
+    "company_id": "companies",
+    "application_id": "applications",
+}
+
+# ref -> (entity, id)
+Refs = Dict[str, Tuple[str, int]]
+
+def _resolve(value: Any, entity: str, refs: Refs) -> Any:
+    if not isinstance(value, str) or not value.startswith("$"):
+        return value
+    if value[1:] not in refs:
+        raise HTTPException(status_code=400, detail=f"Unknown reference '{value}'")
+    referenced_entity, row_id = refs[value[1:]]
+    if referenced_entity != entity:
+        raise HTTPException(status_code=400, detail=f"'{value}' refers to {referenced_entity}, not {entity}")
+    return row_id
+
+def _target(operation: BatchOperation, refs: Refs) -> int:
+    row_id = _resolve(operation.id, operation.entity, refs)
+    if not isinstance(row_id, int):
+        raise HTTPException(
+            status_code=400, detail=f"{operation.method} needs an id: a number or a '$<ref>'"
+        )
+    return row_id
+
+def _literal_reference(operation: BatchOperation) -> Optional[Tuple[str, str, int]]:
+    """(field, referenced entity, id) when the operation gives its reference field as a number."""
+    reference = ENTITIES[operation.entity].reference
+    if reference is None:
+        return None
+    value = operation.data.get(reference[0])
+    if not isinstance(value, int) or isinstance(value, bool):
+        return None
+    return reference[0], REFERENCE_FIELDS[reference[0]], value
+
+async def _check_references(db: AsyncSession, user_id: int, operations: List[BatchOperation]) -> None:
+    """Raise for the first operation whose literal company_id/application_id is not the user's."""
+    literals = [_literal_reference(operation) for operation in operations]
+    wanted: Dict[str, set] = {}
+    for literal in filter(None, literals):
+        wanted.setdefault(literal[1], set()).add(literal[2])
+    owned = {
+        entity: await owned_ids(db, ENTITIES[entity].model, user_id, ids) for entity, ids in wanted.items()
+    }
+    for index, literal in enumerate(literals):
+        if literal is not None and literal[2] not in owned[literal[1]]:
+            field, _, value = literal
+            raise HTTPException(
+                status_code=404, detail={"operation": index, "detail": f"{field} {value} not found"}
+            )
+
+async def _apply(db: AsyncSession, user_id: int, operation: BatchOperation, refs: Refs) -> BatchResult:
+    label, update_schema, response_schema = BATCH_ENTITIES[operation.entity]
+    data = {
+        field: _resolve(value, REFERENCE_FIELDS[field], refs) if field in REFERENCE_FIELDS else value
+        for field, value in operation.data.items()
+    }
+    if operation.method == "create":
+        values = ENTITIES[operation.entity].create_schema.model_validate(data).model_dump()
+        row = await crud.create(db, operation.entity, user_id, values)
+    else:
+        row_id = _target(operation, refs)
+        if operation.method == "delete":
+            if not await deletes.delete_rows(db, operation.entity, user_id, [row_id]):
+                raise HTTPException(status_code=404, detail=f"{label} {row_id} not found")
+            return BatchResult(method=operation.method, entity=operation.entity, id=row_id, ref=operation.ref)
+        values = update_schema.model_validate(data).model_dump(exclude_unset=True)
+        row = await crud.update(db, operation.entity, user_id, row_id, values)
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"{label} {row_id} not found")
+
+    if operation.ref is not None:
+        refs[operation.ref] = (operation.entity, row.id)
+    return BatchResult(
+        method=operation.method, entity=operation.entity, id=row.id, ref=operation.ref,
+        data=response_schema.model_validate(dict(row._mapping)).model_dump(mode="json"),
+    )
+
+async def run(db: AsyncSession, user_id: int, operations: List[BatchOperation]) -> List[BatchResult]:
+    """
+    Apply ``operations`` in order in the session's transaction; the caller
+    commits. On the first failure the transaction is rolled back and an
+    HTTPException carries ``{"operation": index, "detail": ...}``.
+    """
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_OPERATIONS} operations per batch")
+    await _check_references(db, user_id, operations)
+    refs: Refs = {}
+    results = []
+    for index, operation in enumerate(operations):
+        try:
+            if operation.ref is not None and operation.ref in refs:
+                raise HTTPException(status_code=400, detail=f"Reference '{operation.ref}' is already defined")
+            results.append(await _apply(db, user_id, operation, refs))
+        except HTTPException as exc:
+            status_code, detail = exc.status_code, exc.detail
+        except ValidationError as exc:
+            status_code, detail = 422, exc.errors(include_url=False, include_context=False)
+        except IntegrityError as exc:
+            status_code, detail = 409, f"Constraint violated: {exc.orig}"
+        else:
+            continue
+        await db.rollback()
+        raise HTTPException(status_code=status_code, detail={"operation": index, "detail": detail})
+    return results
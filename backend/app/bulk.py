@@ -0,0 +1,212 @@
+"""
+Bulk creation shared by the ``/bulk`` endpoints and ``/api/import``.
+
+Rows are validated one at a time with the entity's ``*Create`` schema, so a
+bad row is reported instead of failing the whole request. Valid rows are
+inserted in batches. Each batch costs one lookup for company names and
+referenced ids, one multi-row INSERT (two for applications, whose status
+history starts too), one counter update and one commit.
+"""
+import csv
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass
+from itertools import islice
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import analytics, reminders, stats
+from app.models import Application, Company, Contact, Interview
+from app.schemas import (
+    ApplicationCreate, BulkResult, CompanyCreate, ContactCreate, InterviewCreate, RowError
+)
+
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "1000"))
+
+# (row number, raw record or a parse error for that row)
+RawRow = Tuple[int, Union[dict, RowError]]
+
+@dataclass(frozen=True)
+class BulkEntity:
+    model: type
+    create_schema: Type[BaseModel]
+    total_counter: str
+    # Foreign key field that must point at one of the user's own rows
+    reference: Optional[Tuple[str, type]] = None
+    # Date the activity time series buckets this entity by
+    dated_field: Optional[str] = None
+
+ENTITIES: Dict[str, BulkEntity] = {
+    "applications": BulkEntity(
+        Application, ApplicationCreate, "total_applications", ("company_id", Company), "applied_date"
+    ),
+    "companies": BulkEntity(Company, CompanyCreate, "total_companies"),
+    "contacts": BulkEntity(Contact, ContactCreate, "total_contacts", ("company_id", Company)),
+    "interviews": BulkEntity(
+        Interview, InterviewCreate, "total_interviews", ("application_id", Application), "scheduled_at"
+    ),
+}
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+async def _company_ids_by_name(db: AsyncSession, user_id: int, names: set) -> Dict[str, int]:
+    if not names:
+        return {}
+    rows = await db.execute(
+        select(Company.name, Company.id)
+        .where(Company.user_id == user_id, Company.name.in_(names))
+        .order_by(Company.id)
+    )
+    ids: Dict[str, int] = {}
+    for name, company_id in rows:
+        ids.setdefault(name, company_id)
+    return ids
+
+async def owned_ids(db: AsyncSession, model: type, user_id: int, ids: set) -> set:
+    """The ids among ``ids`` that exist in ``model`` and belong to the user."""
+    if not ids:
+        return set()
+    return set(await db.scalars(select(model.id).where(model.user_id == user_id, model.id.in_(ids))))
+
+def _counter_deltas(entity_name: str, rows: List[dict]) -> Dict[str, int]:
+    if entity_name != "applications":
+        return {ENTITIES[entity_name].total_counter: len(rows)}
+    deltas: Counter = Counter()
+    for row in rows:
+        deltas.update(stats.application_delta(row["status"], 1))
+    return dict(deltas)
+
+async def insert_batch(
+    db: AsyncSession, entity_name: str, user_id: int, batch: List[RawRow]
+) -> Tuple[List[int], List[RowError]]:
+    """
+    Validate and insert one batch in the session's transaction.
+
+    Rows may name their company with ``company_name`` instead of
+    ``company_id``. Returns the new ids (in row order) and per-row errors.
+    """
+    spec = ENTITIES[entity_name]
+    errors: List[RowError] = []
+    resolves_company = spec.reference is not None and spec.reference[0] == "company_id"
+
+    company_ids = {}
+    if resolves_company:
+        names = {
+            raw["company_name"] for _, raw in batch
+            if isinstance(raw, dict) and raw.get("company_name") and not raw.get("company_id")
+        }
+        company_ids = await _company_ids_by_name(db, user_id, names)
+
+    validated: List[Tuple[int, dict]] = []
+    for row_number, raw in batch:
+        if isinstance(raw, RowError):
+            errors.append(raw)
+            continue
+        raw = dict(raw)
+        company_name = raw.pop("company_name", None) if resolves_company else None
+        if company_name and not raw.get("company_id"):
+            if company_name not in company_ids:
+                errors.append(RowError(row=row_number, detail=f"Unknown company '{company_name}'"))
+                continue
+            raw["company_id"] = company_ids[company_name]
+        try:
+            values = spec.create_schema.model_validate(raw).model_dump()
+        except ValidationError as exc:
+            errors.append(RowError(row=row_number, detail=_describe(exc)))
+            continue
+        validated.append((row_number, values))
+
+    if spec.reference is not None:
+        field, referenced_model = spec.reference
+        wanted = {values[field] for _, values in validated if values.get(field) is not None}
+        owned = await owned_ids(db, referenced_model, user_id, wanted)
+        kept = []
+        for row_number, values in validated:
+            if values.get(field) is not None and values[field] not in owned:
+                errors.append(RowError(row=row_number, detail=f"{field} {values[field]} not found"))
+            else:
+                kept.append((row_number, values))
+        validated = kept
+
+    errors.sort(key=lambda error: error.row)
+    if not validated:
+        return [], errors
+
+    rows = [{**values, "user_id": user_id} for _, values in validated]
+    # One multi-row INSERT; asking for RETURNING in parameter order would make
+    # SQLite insert row by row. New ids ascend in row order, so sort them instead.
+    table = spec.model.__table__
+    returned = [table.c.id]
+    if spec.model is Interview:
+        # Reminders need the time as stored (naive), not the validated input
+        returned.append(table.c.scheduled_at)
+    inserted = sorted(tuple(row) for row in await db.execute(insert(table).returning(*returned), rows))
+    ids = [row[0] for row in inserted]
+    if spec.model is Application:
+        await analytics.record_created(db, user_id, zip(ids, (row["status"] for row in rows)))
+    elif spec.model is Interview:
+        reminders.scheduled(db, inserted)
+    dated = [row.get(spec.dated_field) for row in rows] if spec.dated_field else ()
+    await stats.adjust(db, user_id, dated=dated, **_counter_deltas(entity_name, rows))
+    return ids, errors
+
+async def bulk_create(
+    db: AsyncSession, entity_name: str, user_id: int, rows: Iterable[RawRow]
+) -> BulkResult:
+    """Insert ``rows`` in batches of BULK_BATCH_SIZE, committing after each batch."""
+    result = BulkResult(created=0, ids=[], errors=[])
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, BULK_BATCH_SIZE))
+        if not batch:
+            break
+        ids, errors = await insert_batch(db, entity_name, user_id, batch)
+        await db.commit()
+        result.created += len(ids)
+        result.ids.extend(ids)
+        result.errors.extend(errors)
+    return result
+
+def _decoded_lines(stream: BinaryIO) -> Iterator[str]:
+    for line_number, line in enumerate(stream):
+        yield line.decode("utf-8-sig" if line_number == 0 else "utf-8")
+
+def parse_csv(stream: BinaryIO) -> Iterator[RawRow]:
+    """
+    Yield rows of a CSV file with a header line; empty cells are treated as
+    missing. A line that is not UTF-8 ends the file with an error row, as
+    the reader cannot tell where the record it belongs to stops.
+    """
+    row_number = 0
+    try:
+        for row_number, record in enumerate(csv.DictReader(_decoded_lines(stream)), start=1):
+            yield row_number, {
+                key.strip(): value for key, value in record.items()
+                if key and value not in (None, "")
+            }
+    except UnicodeDecodeError:
+        yield row_number + 1, RowError(
+            row=row_number + 1, detail="Not valid UTF-8; this row and the rest of the file were not imported"
+        )
+
+def parse_ndjson(stream: BinaryIO) -> Iterator[RawRow]:
+    """Yield one JSON object per non-blank line."""
+    for row_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield row_number, RowError(row=row_number, detail=f"Invalid JSON: {exc}")
+            continue
+        if not isinstance(record, dict):
+            yield row_number, RowError(row=row_number, detail="Expected a JSON object")
+            continue
+        yield row_number, record
@@ -0,0 +1,68 @@
+"""
+Conditional GETs from the per-user data version.
+
+Every write bumps ``user_stats.data_version`` (see ``app.stats``), so the
+version identifies the state of everything a user can read. The
+dependencies here run before a route's queries: they read the version with
+one primary-key lookup, answer a matching ``If-None-Match`` with 304
+straight away, and otherwise set ``ETag`` and ``Last-Modified`` on the
+response.
+"""
+import time
+from datetime import timezone
+from email.utils import format_datetime
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.models import UserStats
+from app.auth import get_current_user_id
+
+# Dashboard numbers also move with the clock (interviews enter and leave
+# the "upcoming" window), so its ETag rolls over this often even without writes.
+DASHBOARD_ETAG_SECONDS = 60
+# Time series default to a range ending today, so their ETag rolls over at UTC midnight
+DAILY_ETAG_SECONDS = 86400
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" name the same version
+    strip = lambda tag: tag.strip().removeprefix("W/")
+    return strip(etag) in {strip(tag) for tag in if_none_match.split(",")}
+
+def etag_guard(time_bucket_seconds: Optional[int] = None):
+    """Build a route dependency that sets or checks the ETag for the current user."""
+
+    async def check(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
+        current_user_id: int = Depends(get_current_user_id)
+    ) -> None:
+        row = (await db.execute(
+            select(UserStats.data_version, UserStats.modified_at).where(UserStats.user_id == current_user_id)
+        )).first()
+        version, modified_at = row if row is not None else (0, None)
+        tag = f"u{current_user_id}.v{version}"
+        if time_bucket_seconds:
+            tag += f".t{int(time.time()) // time_bucket_seconds}"
+        headers = {
+            "ETag": f'W/"{tag}"',
+            "Cache-Control": "private, no-cache",
+            "Vary": "Authorization",
+        }
+        if modified_at is not None:
+            headers["Last-Modified"] = format_datetime(modified_at.replace(tzinfo=timezone.utc), usegmt=True)
+        if _matches(request.headers.get("if-none-match"), headers["ETag"]):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return check
+
+conditional_get = etag_guard()
+conditional_dashboard_get = etag_guard(DASHBOARD_ETAG_SECONDS)
+conditional_daily_get = etag_guard(DAILY_ETAG_SECONDS)
@@ -0,0 +1,125 @@
+"""
+Single-statement creates and edits for the entity routers and ``/api/batch``.
+
+A create is one ``INSERT ... RETURNING`` and an edit one
+``UPDATE ... WHERE id = ? AND user_id = ? RETURNING``. Routes build the
+response from the returned row, so nothing is loaded into the session,
+flushed or refreshed. Column defaults and ``onupdate`` (``updated_at``)
+still apply, as they are part of the table definition. Side effects of a
+write (counters, status history) are issued by :func:`create` and
+:func:`update` in the same transaction; the caller commits.
+
+Before writing, :func:`create` and :func:`update` check that a
+``company_id`` or ``application_id`` names one of the user's own rows, so
+a bad reference is a 404 or 422 rather than a foreign key error, and
+nobody can attach records to another user's data.
+"""
+from typing import Any, Dict, Optional, Sequence
+from fastapi import HTTPException
+from sqlalchemy import insert, select, update as update_statement
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import analytics, reminders, stats
+from app.bulk import ENTITIES, owned_ids
+from app.models import Application, Interview
+
+# Columns an edit must read before overwriting them, for the counters,
+# status history or time-series history version
+TRACKED_COLUMNS = {
+    "applications": ("status", "applied_date"),
+    "interviews": ("scheduled_at",),
+}
+
+async def insert_row(db: AsyncSession, model: type, values: Dict[str, Any]) -> Row:
+    """Insert one row and return all of its columns."""
+    table = model.__table__
+    return (await db.execute(insert(table).values(**values).returning(table))).one()
+
+async def update_row(
+    db: AsyncSession, model: type, row_id: int, user_id: int, values: Dict[str, Any]
+) -> Optional[Row]:
+    """
+    Apply ``values`` to the user's row ``row_id`` and return all of its
+    columns, or None if the user has no such row.
+    """
+    table = model.__table__
+    owned = (table.c.id == row_id, table.c.user_id == user_id)
+    if not values:
+        return (await db.execute(select(table).where(*owned))).first()
+    return (await db.execute(update_statement(table).where(*owned).values(**values).returning(table))).first()
+
+async def current_values(
+    db: AsyncSession, model: type, row_id: int, user_id: int, names: Sequence[str]
+) -> Optional[Row]:
+    """
+    The columns ``names`` of the user's row ``row_id`` before an edit, for
+    writes whose side effects depend on what is being replaced.
+    """
+    table = model.__table__
+    return (await db.execute(
+        select(*(table.c[name] for name in names)).where(table.c.id == row_id, table.c.user_id == user_id)
+    )).first()
+
+async def check_reference(db: AsyncSession, entity_name: str, user_id: int, values: Dict[str, Any]) -> None:
+    """
+    Raise unless the reference field in ``values`` (``company_id``,
+    ``application_id``), if given, names one of the user's own rows.
+    """
+    reference = ENTITIES[entity_name].reference
+    if reference is None or reference[0] not in values:
+        return
+    field, referenced_model = reference
+    value = values[field]
+    if value is None:
+        if not ENTITIES[entity_name].model.__table__.c[field].nullable:
+            raise HTTPException(status_code=422, detail=f"{field} may not be null")
+        return
+    if not await owned_ids(db, referenced_model, user_id, {value}):
+        raise HTTPException(status_code=404, detail=f"{field} {value} not found")
+
+async def create(db: AsyncSession, entity_name: str, user_id: int, values: Dict[str, Any]) -> Row:
+    """Insert one validated ``entity_name`` record for ``user_id`` with its side effects."""
+    spec = ENTITIES[entity_name]
+    await check_reference(db, entity_name, user_id, values)
+    row = await insert_row(db, spec.model, {**values, "user_id": user_id})
+    if spec.model is Application:
+        await analytics.record_created(db, user_id, [(row.id, row.status)])
+        deltas = stats.application_delta(row.status, 1)
+    else:
+        deltas = {spec.total_counter: 1}
+    if spec.model is Interview:
+        reminders.scheduled(db, [(row.id, row.scheduled_at)])
+    dated = [getattr(row, spec.dated_field)] if spec.dated_field else ()
+    await stats.adjust(db, user_id, dated=dated, **deltas)
+    return row
+
+async def update(
+    db: AsyncSession, entity_name: str, user_id: int, row_id: int, values: Dict[str, Any]
+) -> Optional[Row]:
+    """
+    Apply validated ``values`` to the user's record with its side effects.
+    Returns None if the user has no such record.
+    """
+    spec = ENTITIES[entity_name]
+    await check_reference(db, entity_name, user_id, values)
+    tracked = TRACKED_COLUMNS.get(entity_name, ())
+    # Only edits that touch a tracked column pay for reading it first
+    before = None
+    if any(name in values for name in tracked):
+        before = await current_values(db, spec.model, row_id, user_id, tracked)
+    row = await update_row(db, spec.model, row_id, user_id, values)
+    if row is None:
+        return None
+
+    old = before._mapping if before is not None else row._mapping
+    deltas: Dict[str, int] = {}
+    if spec.model is Application:
+        await analytics.record_change(db, user_id, row.id, old["status"], row.status)
+        deltas = stats.status_change_delta(old["status"], row.status)
+    dated = []
+    if spec.dated_field and old[spec.dated_field] != row._mapping[spec.dated_field]:
+        dated = [old[spec.dated_field], row._mapping[spec.dated_field]]
+    if spec.model is Interview and "scheduled_at" in values:
+        reminders.scheduled(db, [(row.id, row.scheduled_at)])
+    await stats.adjust(db, user_id, dated=dated, **deltas)
+    return row
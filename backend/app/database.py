@@ -1,17 +1,102 @@
-from sqlalchemy import create_engine
+from typing import Dict
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
 import os
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./job_hunt_erp.db")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
-)
+# Async drivers used by the API for each sync database URL
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+# SQLite connection profile, applied to every new connection. Each pragma can
+# be overridden with SQLITE_<NAME> (e.g. SQLITE_SYNCHRONOUS=FULL) or skipped
+# by setting it to an empty string.
+#   journal_mode=WAL      readers no longer block on the writer and vice versa
+#   synchronous=NORMAL    safe with WAL; fsync at checkpoints, not every commit
+#   mmap_size             read pages straight from the OS page cache
+#   cache_size            negative values are KiB: 64 MiB of page cache
+#   temp_store=MEMORY     sorts and temp b-trees stay off disk
+#   busy_timeout          wait for a competing writer instead of failing at once
+#   foreign_keys=ON       enforce declared foreign keys
+SQLITE_PRAGMA_DEFAULTS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": str(256 * 1024 * 1024),
+    "cache_size": "-65536",
+    "temp_store": "MEMORY",
+    "busy_timeout": "5000",
+    "foreign_keys": "ON",
+}
+
+SQLITE_PRAGMAS = {
+    name: os.getenv(f"SQLITE_{name.upper()}", default)
+    for name, default in SQLITE_PRAGMA_DEFAULTS.items()
+}
+SQLITE_PRAGMAS = {name: value for name, value in SQLITE_PRAGMAS.items() if value}
+
+# Connection pool for file databases. With WAL many readers can work in
+# parallel, so keep a few connections warm rather than reconnecting.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+
+def to_async_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its asyncio counterpart."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """Keyword arguments for create_engine / create_async_engine for ``url``."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return {}
+    options = {"connect_args": {"check_same_thread": False}}
+    if parsed.database in (None, "", ":memory:"):
+        # Every connection to :memory: is a new empty database; share one
+        options["poolclass"] = StaticPool
+    else:
+        options["poolclass"] = AsyncAdaptedQueuePool if is_async else QueuePool
+        options["pool_size"] = DB_POOL_SIZE
+        options["max_overflow"] = DB_MAX_OVERFLOW
+    return options
+
+def configure_sqlite(engine: Engine, pragmas: Dict[str, str] = SQLITE_PRAGMAS) -> None:
+    """Apply ``pragmas`` to every new DBAPI connection made by a SQLite ``engine``."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(SQLALCHEMY_DATABASE_URL))
+
+# The sync engine serves migrations, maintenance commands and scripts
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+configure_sqlite(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The async engine serves the API so queries never block the event loop
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True))
+configure_sqlite(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -21,3 +106,6 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,118 @@
+"""
+Deletes by id: one DELETE statement per request, no rows loaded.
+
+The statement removes every requested row the user owns and returns what
+the counters need. The foreign keys' ``ON DELETE`` actions (migration 8)
+take the dependents along: a company's applications, an application's
+interviews and status history. Contacts of a deleted company are kept,
+with ``company_id`` set to NULL. Cascaded rows are counted just before the
+delete in the same transaction, so ``user_stats`` moves by exactly what
+went away. Each cascaded row is charged to its own user: rows written
+before references were checked may hang off another user's company.
+"""
+from collections import Counter, defaultdict
+from typing import DefaultDict, Iterable, List, Optional
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import reminders, stats
+from app.bulk import ENTITIES
+from app.models import Application, Company, Contact, Interview
+
+MAX_DELETE_IDS = 10000
+
+def parse_ids(values: Optional[List[str]]) -> List[int]:
+    """Read ids given as ``?ids=1,2,3``, ``?ids=1&ids=2`` or a mix of both."""
+    try:
+        ids = {int(part) for value in values or [] for part in value.split(",") if part.strip()}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if not ids:
+        raise HTTPException(status_code=400, detail="No ids given")
+    if len(ids) > MAX_DELETE_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_DELETE_IDS} ids per request")
+    return sorted(ids)
+
+# user_id -> counter deltas, and user_id -> time-series dates touched
+Deltas = DefaultDict[int, Counter]
+Dated = DefaultDict[int, list]
+
+async def _count_applications(db: AsyncSession, condition, deltas: Deltas, dated: Dated) -> None:
+    rows = await db.execute(
+        select(
+            Application.user_id, Application.status, func.count(),
+            func.min(Application.applied_date), func.min(Application.created_at),
+        )
+        .where(condition)
+        .group_by(Application.user_id, Application.status)
+    )
+    for user_id, status, count, first_applied, first_created in rows:
+        for column, sign in stats.application_delta(status, -1).items():
+            deltas[user_id][column] += sign * count
+        # Their status history goes too, and starts at created_at
+        dated[user_id] += [first_applied, first_created]
+
+async def _count_interviews(db: AsyncSession, condition, deltas: Deltas, dated: Dated) -> None:
+    rows = await db.execute(
+        select(Interview.user_id, func.count(), func.min(Interview.scheduled_at))
+        .where(condition)
+        .group_by(Interview.user_id)
+    )
+    for user_id, count, first_scheduled in rows:
+        deltas[user_id]["total_interviews"] -= count
+        dated[user_id].append(first_scheduled)
+
+async def delete_rows(db: AsyncSession, entity_name: str, user_id: int, ids: Iterable[int]) -> List[int]:
+    """
+    Delete the user's ``entity_name`` rows among ``ids`` in the session's
+    transaction and adjust the counters. Returns the ids actually deleted;
+    ids that do not exist or belong to someone else are skipped.
+    """
+    spec = ENTITIES[entity_name]
+    model = spec.model
+    conditions = (model.user_id == user_id, model.id.in_(list(ids)))
+    owned = select(model.id).where(*conditions)
+
+    deltas: Deltas = defaultdict(Counter)
+    dated: Dated = defaultdict(list)
+    if model is Company:
+        cascaded = Application.company_id.in_(owned)
+        await _count_applications(db, cascaded, deltas, dated)
+        await _count_interviews(
+            db, Interview.application_id.in_(select(Application.id).where(cascaded)), deltas, dated
+        )
+        # Contacts lose their company; other owners' cached pages must go stale
+        for contact_owner in await db.scalars(
+            select(Contact.user_id).where(Contact.company_id.in_(owned)).distinct()
+        ):
+            deltas[contact_owner]
+    elif model is Application:
+        await _count_interviews(db, Interview.application_id.in_(owned), deltas, dated)
+
+    returned = [model.id]
+    if spec.dated_field:
+        returned.append(getattr(model, spec.dated_field))
+    if model is Application:
+        returned += [Application.status, Application.created_at]
+    rows = (await db.execute(
+        delete(model).where(*conditions).returning(*returned)
+        .execution_options(synchronize_session=False)
+    )).all()
+    if not rows:
+        return []
+
+    if model is Application:
+        for _, applied_date, status, created_at in rows:
+            for column, sign in stats.application_delta(status, -1).items():
+                deltas[user_id][column] += sign
+            dated[user_id] += [applied_date, created_at]
+    else:
+        deltas[user_id][spec.total_counter] -= len(rows)
+        if spec.dated_field:
+            dated[user_id] += [row[1] for row in rows]
+    for affected in sorted(deltas.keys() | dated.keys()):
+        await stats.adjust(db, affected, dated=dated[affected], **deltas[affected])
+    deleted_ids = [row[0] for row in rows]
+    if model is Interview:
+        reminders.deleted(db, deleted_ids)
+    return deleted_ids
@@ -0,0 +1,173 @@
+"""
+Opt-in query diagnostics: a slow-query log with query plans, and N+1
+detection per request.
+
+Enabled with ``QUERY_DIAGNOSTICS=1``. Any statement slower than
+``SLOW_QUERY_MS`` is logged with its bound parameters and ``EXPLAIN QUERY
+PLAN`` output. Within one request, the same statement shape (the SQL with
+IN-lists and multi-row VALUES collapsed) executed more than
+``N_PLUS_ONE_THRESHOLD`` times is flagged as an N+1 pattern, which is what
+lazy loads of ``Application.company`` or ``Interview.application`` while
+serialising a page look like. Findings accumulate in ``report`` and are
+written to ``QUERY_DIAGNOSTICS_REPORT`` as JSON after each request that
+produced one.
+"""
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.metrics import RouteTemplates
+
+ENABLED = os.getenv("QUERY_DIAGNOSTICS", "").lower() in ("1", "true", "yes", "on")
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+REPORT_PATH = os.getenv("QUERY_DIAGNOSTICS_REPORT", "query_diagnostics.json")
+
+# Only these can be explained; PRAGMA, BEGIN and friends are skipped
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+OUTSIDE_REQUEST = "(no request)"
+
+logger = logging.getLogger(__name__)
+
+_placeholder_list = re.compile(r"\((?:\?|%\(\w+\)s|\$\d+)(?:, (?:\?|%\(\w+\)s|\$\d+))*\)")
+_repeated_groups = re.compile(r"(\(\?(?:, \?)*\))(?:, \(\?(?:, \?)*\))+")
+
+def statement_shape(statement: str) -> str:
+    """Normalise ``statement`` so executions differing only in list lengths compare equal."""
+    shape = " ".join(statement.split())
+    shape = _repeated_groups.sub(r"\1, ...", shape)
+    return _placeholder_list.sub("(?, ...)", shape)
+
+@dataclass
+class RequestQueries:
+    """Statements seen during one request."""
+    shapes: Counter = field(default_factory=Counter)
+    slow: List[dict] = field(default_factory=list)
+
+_current_request: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+class Report:
+    """Findings aggregated by statement shape (and route, for N+1)."""
+
+    def __init__(self):
+        self.slow_queries: Dict[Tuple[str, str], dict] = {}
+        self.n_plus_one: Dict[Tuple[str, str], dict] = {}
+
+    def add_slow(self, route: str, finding: dict) -> None:
+        entry = self.slow_queries.setdefault((route, finding["shape"]), {
+            "route": route, "statement": finding["shape"], "count": 0, "max_ms": 0.0, "total_ms": 0.0,
+        })
+        entry["count"] += 1
+        entry["total_ms"] = round(entry["total_ms"] + finding["ms"], 3)
+        if finding["ms"] >= entry["max_ms"]:
+            entry.update(max_ms=finding["ms"], parameters=finding["parameters"], plan=finding["plan"])
+
+    def add_n_plus_one(self, route: str, shape: str, repeats: int) -> None:
+        entry = self.n_plus_one.setdefault((route, shape), {
+            "route": route, "statement": shape, "requests": 0, "max_repeats": 0,
+        })
+        entry["requests"] += 1
+        entry["max_repeats"] = max(entry["max_repeats"], repeats)
+
+    def to_dict(self) -> dict:
+        return {
+            "settings": {"slow_query_ms": SLOW_QUERY_MS, "n_plus_one_threshold": N_PLUS_ONE_THRESHOLD},
+            "slow_queries": sorted(self.slow_queries.values(), key=lambda e: -e["max_ms"]),
+            "n_plus_one": sorted(self.n_plus_one.values(), key=lambda e: -e["max_repeats"]),
+        }
+
+    def write(self, path: str = REPORT_PATH) -> None:
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        os.replace(temporary, path)
+
+    def clear(self) -> None:
+        self.slow_queries.clear()
+        self.n_plus_one.clear()
+
+report = Report()
+
+def _explain(conn, statement: str, parameters) -> List[str]:
+    explain = "EXPLAIN QUERY PLAN" if conn.dialect.name == "sqlite" else "EXPLAIN"
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"{explain} {statement}", parameters)
+            return [str(row[-1]) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except Exception as exc:  # diagnostics must never break the statement being diagnosed
+        return [f"plan unavailable: {exc}"]
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement on ``engine``, logging slow ones and counting shapes per request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._diagnostics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_diagnostics_started", None)
+        if started is None:
+            return
+        ms = (time.perf_counter() - started) * 1000
+        queries = _current_request.get()
+        shape = statement_shape(statement)
+        if queries is not None:
+            queries.shapes[shape] += 1
+        if ms < SLOW_QUERY_MS:
+            return
+
+        explainable = not executemany and statement.lstrip().upper().startswith(EXPLAINABLE)
+        plan = _explain(conn, statement, parameters) if explainable else []
+        logger.warning(
+            "slow query (%.1f ms): %s\n  parameters: %r\n  plan: %s",
+            ms, statement, parameters, "; ".join(plan) or "-",
+        )
+        finding = {
+            "shape": shape, "ms": round(ms, 3),
+            "parameters": None if executemany else list(parameters or ()), "plan": plan,
+        }
+        if queries is not None:
+            queries.slow.append(finding)
+        else:
+            report.add_slow(OUTSIDE_REQUEST, finding)
+            report.write()
+
+class DiagnosticsMiddleware:
+    """Collect each request's statements and report slow queries and N+1 patterns by route."""
+
+    def __init__(self, app):
+        self.app = app
+        self.route_template = RouteTemplates()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = _current_request.set(queries)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_request.reset(token)
+            route = f"{scope['method']} {self.route_template(scope)}"
+            repeated = [(shape, n) for shape, n in queries.shapes.items() if n > N_PLUS_ONE_THRESHOLD]
+            for shape, repeats in repeated:
+                logger.warning("possible N+1 in %s: statement ran %d times: %s", route, repeats, shape)
+                report.add_n_plus_one(route, shape, repeats)
+            for finding in queries.slow:
+                report.add_slow(route, finding)
+            if repeated or queries.slow:
+                report.write()
@@ -0,0 +1,40 @@
+"""
+``?expand=`` support: related records loaded by the same query and nested
+in the response, so a page needs one request and a fixed number of
+statements.
+"""
+from typing import List, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import joinedload
+from app.models import Application, Company, Contact, Interview
+
+# entity -> expand name -> loader option. All expansions are many-to-one, so
+# they are joined into the list query itself. Each join is limited to rows
+# owned by the same user as the record it hangs off, so a reference to
+# someone else's row expands to null instead of exposing it.
+_application = Interview.application.and_(Application.user_id == Interview.user_id)
+EXPANSIONS = {
+    "applications": {
+        "company": joinedload(Application.company.and_(Company.user_id == Application.user_id)),
+    },
+    "contacts": {
+        "company": joinedload(Contact.company.and_(Company.user_id == Contact.user_id)),
+    },
+    "interviews": {
+        "application": joinedload(_application),
+        # The company is nested under its application, which has the interview's owner
+        "company": joinedload(_application).joinedload(Application.company.and_(Company.user_id == Interview.user_id)),
+    },
+}
+
+def loader_options(entity: str, expand: Optional[str]) -> List:
+    """Loader options for a comma-separated ``expand`` value; unknown names are a 400."""
+    available = EXPANSIONS[entity]
+    names = {name.strip() for name in (expand or "").split(",") if name.strip()}
+    unknown = names - available.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot expand {', '.join(sorted(unknown))}; choose from {', '.join(available)}",
+        )
+    return [available[name] for name in sorted(names)]
@@ -0,0 +1,70 @@
+"""
+Sparse fieldsets (``?fields=``) for the list endpoints.
+
+Only the requested columns are loaded, validated and serialised. Plain
+lists select them as row tuples (see ``app.serialization``); with
+``?expand=`` the ORM objects are loaded with ``load_only`` and go through a
+response model trimmed to those fields. ``id`` is always included, and so
+are nested records asked for with ``?expand=``.
+"""
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type, get_args
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy.orm import load_only
+from app.schemas import LoadedRelationships
+
+ALWAYS_INCLUDED = ("id",)
+
+def _is_nested(annotation) -> bool:
+    return any(isinstance(t, type) and issubclass(t, BaseModel) for t in (annotation, *get_args(annotation)))
+
+def _nested_fields(schema: Type[BaseModel]) -> List[str]:
+    return [name for name, field in schema.model_fields.items() if _is_nested(field.annotation)]
+
+def parse_fields(schema: Type[BaseModel], fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Validate a comma-separated ``fields`` value against ``schema``.
+    Returns None when no fields were requested (the full model is used).
+    """
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    nested = _nested_fields(schema)
+    allowed = [name for name in schema.model_fields if name not in nested]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}; choose from {', '.join(allowed)}",
+        )
+    return tuple(dict.fromkeys(ALWAYS_INCLUDED + tuple(names)))
+
+def loader_options(model, names: Optional[Tuple[str, ...]]) -> List:
+    if not names:
+        return []
+    return [load_only(*(getattr(model, name) for name in names))]
+
+@lru_cache(maxsize=256)
+def _list_adapter(schema: Type[BaseModel], names: Tuple[str, ...]) -> TypeAdapter:
+    fields = {
+        name: (schema.model_fields[name].annotation, schema.model_fields[name])
+        for name in names + tuple(_nested_fields(schema))
+    }
+    trimmed = create_model(f"{schema.__name__}Fields", __base__=LoadedRelationships, **fields)
+    return TypeAdapter(List[trimmed])
+
+def render(items, schema: Type[BaseModel], names: Tuple[str, ...], response: Response) -> Response:
+    """
+    Serialise ``items`` with ``schema`` trimmed to ``names``.
+
+    The route's full response model cannot validate partially loaded rows,
+    so the JSON is produced here and returned as-is, carrying over headers
+    already set on ``response`` (such as the next-page cursor).
+    """
+    adapter = _list_adapter(schema, names)
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(items), exclude_unset=True),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
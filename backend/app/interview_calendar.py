@@ -0,0 +1,160 @@
+"""
+Interview calendar: the interviews in a date range, the conflicts between
+them, and an iCalendar (RFC 5545) feed.
+
+Interviews are read with one range scan on the ``(user_id, scheduled_at)``
+index, so they arrive ordered by start time. They have no stored length;
+each is taken to last CALENDAR_INTERVIEW_MINUTES. Conflicts are found in a
+single sweep over the start-ordered list. A heap, ordered by end time,
+holds the interviews still running or that ended less than
+CALENDAR_GAP_MINUTES earlier. Each interview is compared only with those,
+so the pass costs O(n log n) plus one step per conflict reported, instead
+of comparing every pair.
+"""
+import heapq
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncSessionLocal
+from app.models import Application, Company, Interview
+
+CALENDAR_INTERVIEW_MINUTES = int(os.getenv("CALENDAR_INTERVIEW_MINUTES", "60"))
+# Interviews closer together than this are reported as back-to-back
+CALENDAR_GAP_MINUTES = int(os.getenv("CALENDAR_GAP_MINUTES", "15"))
+MAX_CALENDAR_DAYS = 731
+# Range of /calendar without from/to: today and the next DEFAULT_DAYS days
+DEFAULT_DAYS = 30
+# Range of the .ics feed without from/to, around today
+FEED_PAST_DAYS = 30
+FEED_FUTURE_DAYS = 365
+# Interviews fetched per round trip while streaming the feed
+FEED_CHUNK_SIZE = 500
+
+@dataclass(frozen=True)
+class Conflict:
+    first_id: int
+    second_id: int
+    kind: str  # "overlap" or "back_to_back"
+    # From the end of the first to the start of the second; negative for an overlap
+    gap_minutes: float
+
+def duration() -> timedelta:
+    return timedelta(minutes=CALENDAR_INTERVIEW_MINUTES)
+
+def day_range(start: date, end: date) -> Tuple[datetime, datetime]:
+    """[start of ``start``, start of the day after ``end``), as naive UTC."""
+    return datetime.combine(start, time.min), datetime.combine(end + timedelta(days=1), time.min)
+
+def _query(user_id: int, start: datetime, stop: datetime):
+    return (
+        select(
+            Interview.id, Interview.application_id, Interview.interview_type, Interview.scheduled_at,
+            Interview.location, Interview.interviewer_name, Interview.notes,
+            Interview.created_at, Interview.updated_at,
+            Application.job_title, Company.name.label("company_name"),
+        )
+        .join(Application, Application.id == Interview.application_id)
+        .join(Company, Company.id == Application.company_id)
+        .where(Interview.user_id == user_id, Interview.scheduled_at >= start, Interview.scheduled_at < stop)
+        .order_by(Interview.scheduled_at, Interview.id)
+    )
+
+async def interviews_between(db: AsyncSession, user_id: int, start: datetime, stop: datetime) -> List:
+    """The user's interviews starting in [start, stop), ordered by start time."""
+    return (await db.execute(_query(user_id, start, stop))).all()
+
+def find_conflicts(interviews: Iterable[Tuple[int, datetime, datetime]], gap: Optional[timedelta] = None) -> List[Conflict]:
+    """
+    Overlapping and back-to-back pairs among ``(id, start, end)`` intervals.
+    Input already ordered by start (as from :func:`interviews_between`) is
+    sorted in linear time.
+    """
+    gap = timedelta(minutes=CALENDAR_GAP_MINUTES) if gap is None else gap
+    conflicts = []
+    running: List[Tuple[datetime, int]] = []  # heap of (end, id)
+    for interview_id, start, end in sorted(interviews, key=lambda item: (item[1], item[0])):
+        # Whatever ended a full gap before this start cannot touch it or anything later
+        while running and running[0][0] + gap <= start:
+            heapq.heappop(running)
+        for other_end, other_id in running:
+            conflicts.append(Conflict(
+                first_id=other_id,
+                second_id=interview_id,
+                kind="overlap" if start < other_end else "back_to_back",
+                gap_minutes=round((start - other_end).total_seconds() / 60, 2),
+            ))
+        heapq.heappush(running, (end, interview_id))
+    return conflicts
+
+# iCalendar
+
+def _utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc) if value.tzinfo is not None else value
+
+def _timestamp(value: datetime) -> str:
+    return f"{_utc(value):%Y%m%dT%H%M%SZ}"
+
+def _text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+def _fold(line: str) -> bytes:
+    """Encode one content line, folded at 75 octets without splitting a character."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return encoded + b"\r\n"
+    parts, current, limit = [], b"", 75
+    for char in line:
+        piece = char.encode()
+        if len(current) + len(piece) > limit:
+            parts.append(current)
+            current, limit = b"", 74  # continuation lines start with a space
+        current += piece
+    parts.append(current)
+    return b"\r\n ".join(parts) + b"\r\n"
+
+def _event(row, host: str) -> bytes:
+    title = f"{row.interview_type.capitalize()} interview" if row.interview_type else "Interview"
+    summary = f"{title}: {row.job_title}" + (f" at {row.company_name}" if row.company_name else "")
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:interview-{row.id}@{host}",
+        f"DTSTAMP:{_timestamp(row.updated_at or row.created_at or datetime.utcnow())}",
+        f"DTSTART:{_timestamp(row.scheduled_at)}",
+        f"DTEND:{_timestamp(row.scheduled_at + duration())}",
+        f"SUMMARY:{_text(summary)}",
+    ]
+    if row.location:
+        lines.append(f"LOCATION:{_text(row.location)}")
+    description = "\n".join(filter(None, [
+        f"Interviewer: {row.interviewer_name}" if row.interviewer_name else None, row.notes,
+    ]))
+    if description:
+        lines.append(f"DESCRIPTION:{_text(description)}")
+    lines.append("END:VEVENT")
+    return b"".join(_fold(line) for line in lines)
+
+async def ics_feed(user_id: int, start: datetime, stop: datetime, host: str) -> AsyncIterator[bytes]:
+    """
+    Stream the interviews in [start, stop) as a VCALENDAR, a chunk of
+    events at a time. The body is produced after the request's
+    dependencies have been torn down, so the feed opens its own session.
+    """
+    yield b"".join(_fold(line) for line in [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Job Hunt ERP//Interviews//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        "X-WR-CALNAME:Interviews",
+    ])
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(_query(user_id, start, stop).execution_options(yield_per=FEED_CHUNK_SIZE))
+        async for rows in result.partitions():
+            yield b"".join(_event(row, host) for row in rows)
+    yield _fold("END:VCALENDAR")
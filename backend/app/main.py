@@ -1,16 +1,32 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
+from fastapi.responses import PlainTextResponse
+from app.auth import get_current_user_id
+from app.database import async_engine, engine
 from app import models  # Import models to register them with SQLAlchemy
-from app.routers import auth, applications, companies, contacts, interviews, dashboard
+from app import diagnostics, metrics, migrations, reminders
+from app.pagination import NEXT_CURSOR_HEADER
+from app.routers import (
+    auth, applications, companies, contacts, interviews, dashboard, imports, export, search, analytics, batch,
+)
+
+# Bring the database schema up to the latest migration
+migrations.upgrade(engine)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Interview reminders (REMINDERS=0 to turn off)
+    if reminders.ENABLED:
+        await reminders.scheduler.start()
+    yield
+    await reminders.scheduler.stop()
 
 app = FastAPI(
     title="Job Hunt ERP",
     description="Enterprise Resource Planning system for job search process",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -20,8 +36,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified", "Server-Timing"],
 )
 
+# Opt-in slow-query log and N+1 detection (QUERY_DIAGNOSTICS=1)
+if diagnostics.ENABLED:
+    diagnostics.instrument_engine(async_engine.sync_engine)
+    app.add_middleware(diagnostics.DiagnosticsMiddleware)
+
+# Per-route latency and SQL accounting. Middleware added last runs first, so
+# this stays outermost and times everything above, diagnostics included.
+metrics.instrument_engine(async_engine.sync_engine)
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(applications.router, prefix="/api/applications", tags=["applications"])
@@ -29,6 +56,11 @@ app.include_router(companies.router, prefix="/api/companies", tags=["companies"]
 app.include_router(contacts.router, prefix="/api/contacts", tags=["contacts"])
 app.include_router(interviews.router, prefix="/api/interviews", tags=["interviews"])
 app.include_router(dashboard.router, prefix="/api/dashboard", tags=["dashboard"])
+app.include_router(imports.router, prefix="/api/import", tags=["import"])
+app.include_router(export.router, prefix="/api/export", tags=["export"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+app.include_router(batch.router, prefix="/api/batch", tags=["batch"])
 
 @app.get("/")
 async def root():
@@ -38,3 +70,12 @@ async def root():
 async def health():
     return {"status": "healthy"}
 
+# Route names and traffic are not for the public; METRICS_PUBLIC=1 opens it to scrapers
+@app.get(
+    "/api/metrics", response_class=PlainTextResponse,
+    dependencies=[] if metrics.PUBLIC else [Depends(get_current_user_id)]
+)
+async def metrics_endpoint():
+    """Request and SQL metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
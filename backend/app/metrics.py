@@ -0,0 +1,184 @@
+"""
+Request metrics and per-request SQL accounting.
+
+``MetricsMiddleware`` times every HTTP request and records it under its
+route template: a latency histogram, a count per status code and the number
+of requests in flight. Cursor events on the engine add each statement's
+count and time to the request that issued it; the totals go into per-route
+histograms and into a ``Server-Timing`` header on the response.
+``registry.render()`` exposes everything in the Prometheus text format, at
+``/api/metrics`` for signed-in users, or for anyone with ``METRICS_PUBLIC=1``.
+"""
+import os
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.routing import compile_path
+
+PUBLIC = os.getenv("METRICS_PUBLIC", "").lower() in ("1", "true", "yes", "on")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Requests that matched no route share one label, so random paths cannot grow the registry
+UNMATCHED_ROUTE = "unmatched"
+
+@dataclass
+class RequestTiming:
+    """Database work done on behalf of the current request."""
+    statements: int = 0
+    db_seconds: float = 0.0
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;desc="{self.statements} statements";dur={self.db_seconds * 1000:.2f}, '
+            f"total;dur={total_seconds * 1000:.2f}"
+        )
+
+_current_request: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: str):
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f"{name}_sum{{{labels}}} {self.sum}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Registry:
+    """In-process metric store for this worker."""
+
+    def __init__(self):
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.db_statements: Dict[Tuple[str, str], Histogram] = {}
+        self.db_seconds: Dict[Tuple[str, str], Histogram] = {}
+        self.in_flight = 0
+
+    def record(self, method: str, route: str, status: int, seconds: float, timing: RequestTiming) -> None:
+        key = (method, route)
+        self.requests[(method, route, status)] = self.requests.get((method, route, status), 0) + 1
+        if key not in self.latency:
+            self.latency[key] = Histogram(LATENCY_BUCKETS)
+            self.db_statements[key] = Histogram(STATEMENT_BUCKETS)
+            self.db_seconds[key] = Histogram(LATENCY_BUCKETS)
+        self.latency[key].observe(seconds)
+        self.db_statements[key].observe(timing.statements)
+        self.db_seconds[key].observe(timing.db_seconds)
+
+    def render(self) -> str:
+        lines = [
+            "# HELP http_requests_total Requests handled, by route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(f'http_requests_total{{method="{method}",route="{_label(route)}",status="{status}"}} {count}')
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+        ]
+        for name, help_text, histograms in [
+            ("http_request_duration_seconds", "Request latency.", self.latency),
+            ("http_request_db_statements", "SQL statements executed per request.", self.db_statements),
+            ("http_request_db_duration_seconds", "Time spent in SQL statements per request.", self.db_seconds),
+        ]:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for (method, route), histogram in sorted(histograms.items()):
+                lines.extend(histogram.samples(name, f'method="{method}",route="{_label(route)}"'))
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute every statement run on ``engine`` to the request in progress, if any."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and _current_request.get() is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        timing = _current_request.get()
+        started = getattr(context, "_metrics_started", None)
+        if timing is not None and started is not None:
+            timing.statements += 1
+            timing.db_seconds += time.perf_counter() - started
+
+class RouteTemplates:
+    """Resolve a handled request to the template of the route it matched."""
+
+    def __init__(self):
+        self._templates: Optional[Dict[str, List[Tuple[Pattern, str]]]] = None
+
+    def __call__(self, scope) -> str:
+        route = scope.get("route")
+        if route is None:
+            return UNMATCHED_ROUTE
+        # Routes of included routers only know the path relative to their
+        # prefix, so the full template is looked up among the OpenAPI paths
+        # ending with it.
+        if self._templates is None:
+            self._templates = {}
+            for path, operations in scope["app"].openapi()["paths"].items():
+                for method in operations:
+                    self._templates.setdefault(method.upper(), []).append((compile_path(path)[0], path))
+        for pattern, template in self._templates.get(scope["method"], ()):
+            if template.endswith(route.path) and pattern.match(scope["path"]):
+                return template
+        return route.path
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and SQL work per route."""
+
+    def __init__(self, app):
+        self.app = app
+        self.route_template = RouteTemplates()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current_request.set(timing)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", timing.server_timing(time.perf_counter() - start)
+                )
+            await send(message)
+
+        registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            registry.in_flight -= 1
+            _current_request.reset(token)
+            registry.record(scope["method"], self.route_template(scope), status, time.perf_counter() - start, timing)
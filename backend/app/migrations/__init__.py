@@ -0,0 +1,160 @@
+"""
+Versioned schema migrations.
+
+Each module in ``app.migrations.versions`` describes one schema change and
+exposes ``revision`` (an increasing integer), ``description``, and
+``upgrade(conn)`` / ``downgrade(conn)`` functions. Applied revisions are
+recorded in the ``schema_migrations`` table, and every revision runs in its
+own transaction so a failed step leaves the database at the previous
+revision.
+
+A revision that rebuilds SQLite tables sets ``disable_foreign_keys = True``.
+It then runs with foreign key enforcement off, as SQLite's table-rebuild
+procedure requires (otherwise dropping the old table would cascade into its
+children), inside an explicit transaction that is only committed if
+``PRAGMA foreign_key_check`` finds nothing.
+"""
+import importlib
+import pkgutil
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Callable, List, Optional
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import func
+
+from app.migrations import versions
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("revision", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+@dataclass
+class Migration:
+    revision: int
+    description: str
+    module: ModuleType
+
+    def upgrade(self, conn: Connection) -> None:
+        self.module.upgrade(conn)
+
+    def downgrade(self, conn: Connection) -> None:
+        self.module.downgrade(conn)
+
+def load_migrations() -> List[Migration]:
+    """Return every migration in ``app.migrations.versions``, oldest first."""
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(Migration(module.revision, module.description, module))
+    migrations.sort(key=lambda m: m.revision)
+
+    revisions = [m.revision for m in migrations]
+    if len(set(revisions)) != len(revisions):
+        raise RuntimeError(f"Duplicate migration revisions: {revisions}")
+    return migrations
+
+def head_revision() -> int:
+    migrations = load_migrations()
+    return migrations[-1].revision if migrations else 0
+
+def applied_revisions(conn: Connection) -> List[int]:
+    if not inspect(conn).has_table(schema_migrations.name):
+        return []
+    rows = conn.execute(select(schema_migrations.c.revision).order_by(schema_migrations.c.revision))
+    return [row.revision for row in rows]
+
+def current_revision(engine: Engine) -> int:
+    with engine.connect() as conn:
+        applied = applied_revisions(conn)
+    return applied[-1] if applied else 0
+
+def _run(engine: Engine, migration: Migration, step: Callable[[Connection], None]) -> None:
+    """Run ``step`` (the migration plus its bookkeeping) in one transaction."""
+    with engine.connect() as conn:
+        relaxed = getattr(migration.module, "disable_foreign_keys", False) and conn.dialect.name == "sqlite"
+        if not relaxed:
+            with conn.begin():
+                step(conn)
+            return
+
+        # Only takes effect outside a transaction
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        conn.commit()
+        try:
+            with conn.begin():
+                # pysqlite opens no transaction before DDL; make the rebuild atomic
+                conn.exec_driver_sql("BEGIN")
+                step(conn)
+                violations = conn.exec_driver_sql("PRAGMA foreign_key_check").all()
+                if violations:
+                    raise RuntimeError(
+                        f"Migration {migration.revision} leaves foreign key violations: {violations[:10]}"
+                    )
+        finally:
+            conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+            conn.commit()
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[int]:
+    """Apply pending migrations up to ``target`` (default: head). Returns applied revisions."""
+    _metadata.create_all(engine, checkfirst=True)
+    with engine.connect() as conn:
+        applied = set(applied_revisions(conn))
+
+    done = []
+    for migration in load_migrations():
+        if target is not None and migration.revision > target:
+            break
+        if migration.revision in applied:
+            continue
+        def step(conn, migration=migration):
+            migration.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                revision=migration.revision, description=migration.description
+            ))
+        _run(engine, migration, step)
+        done.append(migration.revision)
+    return done
+
+def downgrade(engine: Engine, target: int) -> List[int]:
+    """Revert applied migrations newer than ``target``. Returns reverted revisions."""
+    with engine.connect() as conn:
+        applied = set(applied_revisions(conn))
+
+    done = []
+    for migration in reversed(load_migrations()):
+        if migration.revision <= target:
+            break
+        if migration.revision not in applied:
+            continue
+        def step(conn, migration=migration):
+            migration.downgrade(conn)
+            conn.execute(schema_migrations.delete().where(
+                schema_migrations.c.revision == migration.revision
+            ))
+        _run(engine, migration, step)
+        done.append(migration.revision)
+    return done
+
+def history(engine: Engine) -> List[dict]:
+    """Describe every known migration and whether it has been applied."""
+    with engine.connect() as conn:
+        applied = {}
+        if inspect(conn).has_table(schema_migrations.name):
+            for row in conn.execute(select(schema_migrations)):
+                applied[row.revision] = row.applied_at
+    return [
+        {
+            "revision": m.revision,
+            "description": m.description,
+            "applied": m.revision in applied,
+            "applied_at": applied.get(m.revision),
+        }
+        for m in load_migrations()
+    ]
@@ -0,0 +1,43 @@
+"""
+Command line entry point for schema migrations.
+
+Usage (from the backend directory):
+    python -m app.migrations upgrade [REVISION]
+    python -m app.migrations downgrade REVISION
+    python -m app.migrations current
+    python -m app.migrations history
+"""
+import argparse
+from app.database import engine
+from app import migrations
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    up = sub.add_parser("upgrade", help="Apply pending migrations")
+    up.add_argument("revision", type=int, nargs="?", default=None)
+
+    down = sub.add_parser("downgrade", help="Revert migrations newer than REVISION")
+    down.add_argument("revision", type=int)
+
+    sub.add_parser("current", help="Show the current schema revision")
+    sub.add_parser("history", help="List all migrations")
+
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        applied = migrations.upgrade(engine, args.revision)
+        print(f"Applied: {applied}" if applied else "Already up to date")
+    elif args.command == "downgrade":
+        reverted = migrations.downgrade(engine, args.revision)
+        print(f"Reverted: {reverted}" if reverted else "Nothing to revert")
+    elif args.command == "current":
+        print(migrations.current_revision(engine))
+    elif args.command == "history":
+        for entry in migrations.history(engine):
+            marker = "x" if entry["applied"] else " "
+            print(f"[{marker}] {entry['revision']:04d} {entry['description']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Baseline schema: the tables originally created by ``Base.metadata.create_all``.
+
+The tables are declared here rather than taken from ``app.models`` so this
+revision keeps producing the same schema as the models evolve. ``checkfirst``
+lets the revision adopt databases created before migrations existed.
+"""
+from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Integer, MetaData, String, Table, Text
+from sqlalchemy.sql import func
+
+revision = 1
+description = "baseline schema"
+
+metadata = MetaData()
+
+users = Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("email", String, unique=True, index=True, nullable=False),
+    Column("hashed_password", String, nullable=False),
+    Column("full_name", String),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+companies = Table(
+    "companies", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False, index=True),
+    Column("website", String),
+    Column("industry", String),
+    Column("size", String),
+    Column("location", String),
+    Column("description", Text),
+    Column("notes", Text),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True)),
+)
+
+contacts = Table(
+    "contacts", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False),
+    Column("email", String),
+    Column("phone", String),
+    Column("title", String),
+    Column("linkedin", String),
+    Column("notes", Text),
+    Column("company_id", Integer, ForeignKey("companies.id")),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True)),
+)
+
+applications = Table(
+    "applications", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("job_title", String, nullable=False, index=True),
+    Column("job_description", Text),
+    Column("job_url", String),
+    Column("status", Enum(
+        "SAVED", "APPLIED", "PHONE_SCREEN", "INTERVIEW", "FINAL_INTERVIEW",
+        "OFFER", "REJECTED", "WITHDRAWN", name="applicationstatus"
+    ), index=True),
+    Column("salary_min", Float),
+    Column("salary_max", Float),
+    Column("salary_currency", String),
+    Column("applied_date", DateTime(timezone=True)),
+    Column("notes", Text),
+    Column("resume_version", String),
+    Column("cover_letter_version", String),
+    Column("company_id", Integer, ForeignKey("companies.id"), nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True)),
+)
+
+interviews = Table(
+    "interviews", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("application_id", Integer, ForeignKey("applications.id"), nullable=False),
+    Column("interview_type", String),
+    Column("scheduled_at", DateTime(timezone=True), nullable=False),
+    Column("location", String),
+    Column("interviewer_name", String),
+    Column("interviewer_email", String),
+    Column("notes", Text),
+    Column("feedback", Text),
+    Column("result", String),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True)),
+)
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
+
+def downgrade(conn):
+    metadata.drop_all(conn, checkfirst=True)
@@ -0,0 +1,27 @@
+"""Composite ``(user_id, <sort/filter column>)`` indexes.
+
+Every router query filters on ``user_id`` and then filters or sorts on a
+second column; these indexes let SQLite answer them with an index range
+scan instead of scanning the whole table.
+"""
+revision = 2
+description = "composite per-user indexes"
+
+INDEXES = [
+    ("ix_applications_user_created", "applications", ("user_id", "created_at")),
+    ("ix_applications_user_status", "applications", ("user_id", "status")),
+    ("ix_applications_user_company", "applications", ("user_id", "company_id")),
+    ("ix_companies_user_name", "companies", ("user_id", "name")),
+    ("ix_contacts_user_name", "contacts", ("user_id", "name")),
+    ("ix_contacts_user_company", "contacts", ("user_id", "company_id")),
+    ("ix_interviews_user_scheduled", "interviews", ("user_id", "scheduled_at")),
+    ("ix_interviews_user_application", "interviews", ("user_id", "application_id")),
+]
+
+def upgrade(conn):
+    for name, table, columns in INDEXES:
+        conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+
+def downgrade(conn):
+    for name, _, _ in reversed(INDEXES):
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
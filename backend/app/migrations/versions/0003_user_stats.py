@@ -0,0 +1,59 @@
+"""Per-user counter table backing the dashboard, backfilled from existing rows."""
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, Table
+
+revision = 3
+description = "user_stats counter table"
+
+STATUSES = {
+    "saved": "SAVED",
+    "applied": "APPLIED",
+    "phone_screen": "PHONE_SCREEN",
+    "interview": "INTERVIEW",
+    "final_interview": "FINAL_INTERVIEW",
+    "offer": "OFFER",
+    "rejected": "REJECTED",
+    "withdrawn": "WITHDRAWN",
+}
+
+metadata = MetaData()
+
+# Referenced by the foreign key below; only user_stats is created here.
+Table("users", metadata, Column("id", Integer, primary_key=True))
+
+def _counter(name):
+    return Column(name, Integer, nullable=False, default=0, server_default="0")
+
+user_stats = Table(
+    "user_stats", metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    _counter("total_applications"),
+    _counter("total_companies"),
+    _counter("total_contacts"),
+    _counter("total_interviews"),
+    *[_counter(f"status_{value}") for value in STATUSES],
+)
+
+def upgrade(conn):
+    user_stats.create(conn, checkfirst=True)
+    status_columns = ", ".join(f"status_{value}" for value in STATUSES)
+    status_counts = ", ".join(
+        f"(SELECT count(*) FROM applications a WHERE a.user_id = u.id AND a.status = '{name}')"
+        for name in STATUSES.values()
+    )
+    conn.exec_driver_sql(f"""
+        INSERT INTO user_stats (
+            user_id, total_applications, total_companies, total_contacts, total_interviews,
+            {status_columns}
+        )
+        SELECT
+            u.id,
+            (SELECT count(*) FROM applications a WHERE a.user_id = u.id),
+            (SELECT count(*) FROM companies c WHERE c.user_id = u.id),
+            (SELECT count(*) FROM contacts c WHERE c.user_id = u.id),
+            (SELECT count(*) FROM interviews i WHERE i.user_id = u.id),
+            {status_counts}
+        FROM users u
+    """)
+
+def downgrade(conn):
+    user_stats.drop(conn, checkfirst=True)
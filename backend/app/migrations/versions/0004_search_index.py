@@ -0,0 +1,77 @@
+"""
+FTS5 full-text index over companies, contacts, applications and interviews,
+kept in sync by triggers and backfilled from existing rows.
+
+All entities share one ``search_index`` table. The rowid encodes the source
+row as ``id * 4 + entity code``, so triggers update the entry by rowid.
+``owner`` holds a ``u<user_id>`` token, so a MATCH can be scoped to one user
+through the index itself. SQLite only; other databases skip this revision.
+"""
+revision = 4
+description = "FTS5 search index and sync triggers"
+
+# table -> (entity code, title expression, body expressions)
+SOURCES = {
+    "companies": (0, "name", ["description", "notes"]),
+    "contacts": (1, "name", ["title", "notes"]),
+    "applications": (2, "job_title", ["job_description", "notes"]),
+    "interviews": (3, "NULL", ["notes", "feedback"]),
+}
+
+def _values(table, prefix):
+    code, title, body = SOURCES[table]
+    qualify = lambda expr: expr if expr == "NULL" else f"{prefix}{expr}"
+    body_sql = " || char(10) || ".join(f"coalesce({qualify(column)}, '')" for column in body)
+    return (
+        f"{prefix}id * 4 + {code}",
+        f"'u' || {prefix}user_id",
+        qualify(title),
+        f"trim({body_sql}, char(10))",
+    )
+
+def _watched_columns(table):
+    _, title, body = SOURCES[table]
+    return ", ".join([column for column in [title, *body] if column != "NULL"] + ["user_id"])
+
+def upgrade(conn):
+    if conn.dialect.name != "sqlite":
+        return
+    conn.exec_driver_sql("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            owner, title, body,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    for table in SOURCES:
+        rowid, owner, title, body = _values(table, "new.")
+        conn.exec_driver_sql(f"""
+            CREATE TRIGGER IF NOT EXISTS search_{table}_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO search_index (rowid, owner, title, body) VALUES ({rowid}, {owner}, {title}, {body});
+            END
+        """)
+        conn.exec_driver_sql(f"""
+            CREATE TRIGGER IF NOT EXISTS search_{table}_update
+            AFTER UPDATE OF {_watched_columns(table)} ON {table} BEGIN
+                UPDATE search_index SET owner = {owner}, title = {title}, body = {body} WHERE rowid = {rowid};
+            END
+        """)
+        old_rowid = _values(table, "old.")[0]
+        conn.exec_driver_sql(f"""
+            CREATE TRIGGER IF NOT EXISTS search_{table}_delete AFTER DELETE ON {table} BEGIN
+                DELETE FROM search_index WHERE rowid = {old_rowid};
+            END
+        """)
+        rowid, owner, title, body = _values(table, "")
+        conn.exec_driver_sql(f"""
+            INSERT INTO search_index (rowid, owner, title, body)
+            SELECT {rowid}, {owner}, {title}, {body} FROM {table}
+        """)
+
+def downgrade(conn):
+    if conn.dialect.name != "sqlite":
+        return
+    for table in SOURCES:
+        for event in ("insert", "update", "delete"):
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS search_{table}_{event}")
+    conn.exec_driver_sql("DROP TABLE IF EXISTS search_index")
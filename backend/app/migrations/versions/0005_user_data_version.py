@@ -0,0 +1,11 @@
+"""Per-user data version and last-modified time on user_stats, for ETags."""
+revision = 5
+description = "user_stats data_version and modified_at"
+
+def upgrade(conn):
+    conn.exec_driver_sql("ALTER TABLE user_stats ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0")
+    conn.exec_driver_sql("ALTER TABLE user_stats ADD COLUMN modified_at TIMESTAMP WITH TIME ZONE")
+
+def downgrade(conn):
+    conn.exec_driver_sql("ALTER TABLE user_stats DROP COLUMN modified_at")
+    conn.exec_driver_sql("ALTER TABLE user_stats DROP COLUMN data_version")
@@ -0,0 +1,46 @@
+"""Append-only application status history, backfilled with each application's current status."""
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, MetaData, Table
+from sqlalchemy.sql import func
+
+revision = 6
+description = "status_transitions history table"
+
+STATUSES = (
+    "SAVED", "APPLIED", "PHONE_SCREEN", "INTERVIEW", "FINAL_INTERVIEW",
+    "OFFER", "REJECTED", "WITHDRAWN",
+)
+
+metadata = MetaData()
+
+# Referenced by the foreign keys below; only status_transitions is created here.
+Table("users", metadata, Column("id", Integer, primary_key=True))
+Table("applications", metadata, Column("id", Integer, primary_key=True))
+
+status_transitions = Table(
+    "status_transitions", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("application_id", Integer, ForeignKey("applications.id", ondelete="CASCADE"), nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("from_status", Enum(*STATUSES, name="applicationstatus")),
+    Column("to_status", Enum(*STATUSES, name="applicationstatus"), nullable=False),
+    Column("changed_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    # Per-application history in order, which is what the window functions partition
+    # and sort by; with to_status included the stays query never reads the table
+    Index("ix_status_transitions_user_application", "user_id", "application_id", "changed_at", "to_status"),
+    # Transitions newer than the last one an analytics cache has seen
+    Index("ix_status_transitions_user_id", "user_id", "id"),
+)
+
+def upgrade(conn):
+    status_transitions.create(conn, checkfirst=True)
+    # Earlier changes were never recorded; start every application's history at its current status
+    conn.exec_driver_sql("""
+        INSERT INTO status_transitions (application_id, user_id, from_status, to_status, changed_at)
+        SELECT id, user_id, NULL, status, COALESCE(created_at, CURRENT_TIMESTAMP)
+        FROM applications
+        WHERE status IS NOT NULL
+        ORDER BY id
+    """)
+
+def downgrade(conn):
+    status_transitions.drop(conn, checkfirst=True)
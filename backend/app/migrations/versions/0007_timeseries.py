@@ -0,0 +1,23 @@
+"""Indexes for the activity time series, and the user_stats version of past-dated data.
+
+``history_version`` is bumped only by writes that touch a date before
+today (backdated applications and interviews, imports, deletes), so
+cached closed time buckets stay valid across ordinary writes.
+"""
+revision = 7
+description = "time series indexes and user_stats history_version"
+
+INDEXES = [
+    ("ix_applications_user_applied", "applications", ("user_id", "applied_date")),
+    ("ix_status_transitions_user_to_status", "status_transitions", ("user_id", "to_status", "changed_at")),
+]
+
+def upgrade(conn):
+    conn.exec_driver_sql("ALTER TABLE user_stats ADD COLUMN history_version INTEGER NOT NULL DEFAULT 0")
+    for name, table, columns in INDEXES:
+        conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+
+def downgrade(conn):
+    for name, _, _ in reversed(INDEXES):
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+    conn.exec_driver_sql("ALTER TABLE user_stats DROP COLUMN history_version")
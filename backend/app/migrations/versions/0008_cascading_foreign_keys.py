@@ -0,0 +1,96 @@
+"""ON DELETE actions on the foreign keys, so deletes clean up in the database.
+
+Deleting a user removes everything they own; deleting a company removes its
+applications (and through them their interviews and status history) and
+keeps its contacts with ``company_id`` set to NULL; deleting an application
+removes its interviews.
+
+SQLite cannot alter a constraint, so each table is rebuilt from its stored
+definition with the ``ON DELETE`` clauses changed, following SQLite's
+table-rebuild procedure, and its indexes and triggers (including the search
+index triggers from revision 4) are recreated from their stored SQL.
+Other databases swap the constraints in place.
+"""
+import re
+from sqlalchemy import inspect
+
+revision = 8
+description = "ON DELETE CASCADE / SET NULL foreign keys"
+disable_foreign_keys = True
+
+# (table, column) -> ON DELETE action
+ACTIONS = {
+    ("companies", "user_id"): "CASCADE",
+    ("contacts", "user_id"): "CASCADE",
+    ("contacts", "company_id"): "SET NULL",
+    ("applications", "user_id"): "CASCADE",
+    ("applications", "company_id"): "CASCADE",
+    ("interviews", "user_id"): "CASCADE",
+    ("interviews", "application_id"): "CASCADE",
+    ("user_stats", "user_id"): "CASCADE",
+}
+
+_foreign_key = re.compile(
+    r"FOREIGN KEY\s*\((\w+)\)\s*REFERENCES\s+(\w+)\s*\((\w+)\)(?:\s+ON DELETE (?:CASCADE|SET NULL|RESTRICT|NO ACTION))?",
+    re.IGNORECASE,
+)
+
+def _rewrite_foreign_keys(table: str, sql: str, with_actions: bool) -> str:
+    found = set()
+
+    def replace(match):
+        column, referenced, referenced_column = match.groups()
+        action = ACTIONS.get((table, column))
+        if action is None:
+            return match.group(0)
+        found.add(column)
+        clause = f"FOREIGN KEY({column}) REFERENCES {referenced} ({referenced_column})"
+        return f"{clause} ON DELETE {action}" if with_actions else clause
+
+    sql = _foreign_key.sub(replace, sql)
+    missing = {column for t, column in ACTIONS if t == table} - found
+    if missing:
+        raise RuntimeError(f"{table}: no foreign key constraint found for {sorted(missing)}")
+    return sql
+
+def _rebuild_sqlite(conn, table: str, with_actions: bool) -> None:
+    (sql,) = conn.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).one()
+    dependents = [row[0] for row in conn.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND tbl_name = ? AND sql IS NOT NULL",
+        (table,),
+    )]
+    temporary = f"{table}__rebuild"
+    create = re.sub(rf'^CREATE TABLE\s+"?{table}"?', f"CREATE TABLE {temporary}", sql, count=1)
+    conn.exec_driver_sql(_rewrite_foreign_keys(table, create, with_actions))
+    conn.exec_driver_sql(f"INSERT INTO {temporary} SELECT * FROM {table}")
+    conn.exec_driver_sql(f"DROP TABLE {table}")
+    conn.exec_driver_sql(f"ALTER TABLE {temporary} RENAME TO {table}")
+    for statement in dependents:
+        conn.exec_driver_sql(statement)
+
+def _swap_constraints(conn, table: str, with_actions: bool) -> None:
+    for foreign_key in inspect(conn).get_foreign_keys(table):
+        column = foreign_key["constrained_columns"][0]
+        action = ACTIONS.get((table, column))
+        if action is None:
+            continue
+        name = foreign_key["name"]
+        referenced = foreign_key["referred_table"]
+        on_delete = f" ON DELETE {action}" if with_actions else ""
+        conn.exec_driver_sql(
+            f"ALTER TABLE {table} DROP CONSTRAINT {name}, "
+            f"ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {referenced} (id){on_delete}"
+        )
+
+def _migrate(conn, with_actions: bool) -> None:
+    rebuild = _rebuild_sqlite if conn.dialect.name == "sqlite" else _swap_constraints
+    for table in dict.fromkeys(table for table, _ in ACTIONS):
+        rebuild(conn, table, with_actions)
+
+def upgrade(conn):
+    _migrate(conn, with_actions=True)
+
+def downgrade(conn):
+    _migrate(conn, with_actions=False)
@@ -0,0 +1,22 @@
+"""Indexes on the child keys the revision 8 cascades look up.
+
+The existing indexes on these columns lead with ``user_id``, so without an
+index of their own every parent row deleted would scan the child table.
+"""
+revision = 9
+description = "child key indexes for ON DELETE cascades"
+
+INDEXES = [
+    ("ix_contacts_company_id", "contacts", "company_id"),
+    ("ix_applications_company_id", "applications", "company_id"),
+    ("ix_interviews_application_id", "interviews", "application_id"),
+    ("ix_status_transitions_application_id", "status_transitions", "application_id"),
+]
+
+def upgrade(conn):
+    for name, table, column in INDEXES:
+        conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})")
+
+def downgrade(conn):
+    for name, _, _ in reversed(INDEXES):
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -23,13 +23,17 @@ class User(Base):
     full_name = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
-    applications = relationship("Application", back_populates="user")
-    companies = relationship("Company", back_populates="user")
-    contacts = relationship("Contact", back_populates="user")
-    interviews = relationship("Interview", back_populates="user")
+    # Dependent rows are removed by the database (ON DELETE CASCADE), never loaded to be deleted
+    applications = relationship("Application", back_populates="user", cascade="all", passive_deletes=True)
+    companies = relationship("Company", back_populates="user", cascade="all", passive_deletes=True)
+    contacts = relationship("Contact", back_populates="user", cascade="all", passive_deletes=True)
+    interviews = relationship("Interview", back_populates="user", cascade="all", passive_deletes=True)
 
 class Company(Base):
     __tablename__ = "companies"
+    __table_args__ = (
+        Index("ix_companies_user_name", "user_id", "name"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
@@ -39,16 +43,20 @@ class Company(Base):
     location = Column(String)
     description = Column(Text)
     notes = Column(Text)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     user = relationship("User", back_populates="companies")
-    applications = relationship("Application", back_populates="company")
-    contacts = relationship("Contact", back_populates="company")
+    applications = relationship("Application", back_populates="company", cascade="all", passive_deletes=True)
+    contacts = relationship("Contact", back_populates="company", passive_deletes=True)
 
 class Contact(Base):
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("ix_contacts_user_name", "user_id", "name"),
+        Index("ix_contacts_user_company", "user_id", "company_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -57,8 +65,8 @@ class Contact(Base):
     title = Column(String)
     linkedin = Column(String)
     notes = Column(Text)
-    company_id = Column(Integer, ForeignKey("companies.id"))
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="SET NULL"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -67,6 +75,12 @@ class Contact(Base):
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        Index("ix_applications_user_created", "user_id", "created_at"),
+        Index("ix_applications_user_applied", "user_id", "applied_date"),
+        Index("ix_applications_user_status", "user_id", "status"),
+        Index("ix_applications_user_company", "user_id", "company_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     job_title = Column(String, nullable=False, index=True)
@@ -80,20 +94,24 @@ class Application(Base):
     notes = Column(Text)
     resume_version = Column(String)
     cover_letter_version = Column(String)
-    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     user = relationship("User", back_populates="applications")
     company = relationship("Company", back_populates="applications")
-    interviews = relationship("Interview", back_populates="application")
+    interviews = relationship("Interview", back_populates="application", cascade="all", passive_deletes=True)
 
 class Interview(Base):
     __tablename__ = "interviews"
+    __table_args__ = (
+        Index("ix_interviews_user_scheduled", "user_id", "scheduled_at"),
+        Index("ix_interviews_user_application", "user_id", "application_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+    application_id = Column(Integer, ForeignKey("applications.id", ondelete="CASCADE"), nullable=False, index=True)
     interview_type = Column(String)  # phone, video, onsite, etc.
     scheduled_at = Column(DateTime(timezone=True), nullable=False)
     location = Column(String)
@@ -102,10 +120,57 @@ class Interview(Base):
     notes = Column(Text)
     feedback = Column(Text)
     result = Column(String)  # passed, failed, pending
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     user = relationship("User", back_populates="interviews")
     application = relationship("Application", back_populates="interviews")
 
+class StatusTransition(Base):
+    """
+    Append-only history of application status changes, written in the same
+    transaction as the change itself. Feeds the funnel and time-in-stage
+    analytics.
+    """
+    __tablename__ = "status_transitions"
+    __table_args__ = (
+        Index("ix_status_transitions_user_application", "user_id", "application_id", "changed_at", "to_status"),
+        Index("ix_status_transitions_user_id", "user_id", "id"),
+        Index("ix_status_transitions_user_to_status", "user_id", "to_status", "changed_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    application_id = Column(Integer, ForeignKey("applications.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    from_status = Column(Enum(ApplicationStatus))
+    to_status = Column(Enum(ApplicationStatus), nullable=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    application = relationship("Application")
+
+
+class UserStats(Base):
+    """
+    Per-user counters kept in step with every write so the dashboard reads
+    one row, plus a data version bumped by each write for conditional GETs.
+    """
+    __tablename__ = "user_stats"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_applications = Column(Integer, nullable=False, default=0, server_default="0")
+    total_companies = Column(Integer, nullable=False, default=0, server_default="0")
+    total_contacts = Column(Integer, nullable=False, default=0, server_default="0")
+    total_interviews = Column(Integer, nullable=False, default=0, server_default="0")
+    status_saved = Column(Integer, nullable=False, default=0, server_default="0")
+    status_applied = Column(Integer, nullable=False, default=0, server_default="0")
+    status_phone_screen = Column(Integer, nullable=False, default=0, server_default="0")
+    status_interview = Column(Integer, nullable=False, default=0, server_default="0")
+    status_final_interview = Column(Integer, nullable=False, default=0, server_default="0")
+    status_offer = Column(Integer, nullable=False, default=0, server_default="0")
+    status_rejected = Column(Integer, nullable=False, default=0, server_default="0")
+    status_withdrawn = Column(Integer, nullable=False, default=0, server_default="0")
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Bumped only by writes dated before today; see app.timeseries
+    history_version = Column(Integer, nullable=False, default=0, server_default="0")
+    modified_at = Column(DateTime(timezone=True))
@@ -0,0 +1,86 @@
+import base64
+import json
+from typing import Optional
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, String, tuple_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(sort_value, row_id: int) -> str:
+    """Encode the last row's sort key and id as an opaque, URL-safe cursor."""
+    raw = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str):
+    """Decode a cursor produced by encode_cursor into (sort_value, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(row_id, int) or isinstance(row_id, bool):
+            raise ValueError("cursor id must be an integer")
+        # Bound as a SQL parameter, so only scalars are acceptable
+        if sort_value is not None and not isinstance(sort_value, (str, int, float)):
+            raise ValueError("cursor sort value must be a string, number or null")
+        return sort_value, row_id
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    response: Response,
+    sort_column,
+    id_column,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    as_rows: bool = False,
+):
+    """
+    Page through ``query`` ordered by ``(sort_column, id_column)``.
+
+    With a cursor the page seeks past the last row of the previous page
+    instead of using OFFSET, so latency stays flat however deep the page is
+    and rows inserted between fetches are neither skipped nor repeated.
+    Without a cursor the legacy ``skip`` offset is honoured. Whenever more
+    rows exist, the cursor for the next page is returned in the
+    ``X-Next-Cursor`` response header.
+
+    ``query`` normally selects one entity and the page is a list of those
+    objects; with ``as_rows`` it selects plain columns and the page is a list
+    of row tuples.
+    """
+    # The key is compared as the raw stored value so the seek predicate sorts
+    # exactly like ORDER BY does (SQLite keeps DateTime columns as text).
+    sort_key = type_coerce(sort_column, String)
+
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        if descending:
+            query = query.where(tuple_(sort_key, id_column) < tuple_(sort_value, last_id))
+        else:
+            query = query.where(tuple_(sort_key, id_column) > tuple_(sort_value, last_id))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column, id_column)
+
+    if skip and not cursor:
+        query = query.offset(skip)
+
+    query = query.add_columns(sort_key.label("cursor_key"), id_column.label("cursor_id"))
+    rows = (await db.execute(query.limit(limit + 1))).all()
+
+    if limit > 0 and len(rows) > limit:
+        last_row = rows[limit - 1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last_row.cursor_key, last_row.cursor_id)
+
+    if as_rows:
+        return [row[:-2] for row in rows[:limit]]
+    return [row[0] for row in rows[:limit]]
@@ -0,0 +1,273 @@
+"""
+Interview reminders, fired REMINDER_LEAD_MINUTES before each interview by
+an in-process scheduler.
+
+At startup the upcoming interviews are read once into a min-heap of
+``(remind_at, interview_id)``. After that the table is never polled:
+creates, reschedules and deletes of interviews push to or cancel in the
+heap as their transaction commits, and one task sleeps until the earliest
+reminder is due (or at most MAX_SLEEP_SECONDS, to follow wall-clock
+changes). Idle cost is therefore one wake-up per reminder however many are
+pending, and a write costs O(log n).
+
+Cancelled and rescheduled entries are left in the heap and skipped when
+they surface; the heap is rebuilt once stale entries outnumber live ones.
+Interviews removed by a cascade (a deleted application or company) are not
+cancelled up front. Instead, due reminders are checked against the table
+in one query before they are sent, so a reminder never fires for an
+interview that no longer exists or has moved.
+
+Reminders go to a pluggable sink: the log by default, or a JSON POST to
+REMINDER_WEBHOOK_URL. Reminders that fell due while the server was down
+are not sent on the next start.
+"""
+import asyncio
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Protocol, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.database import AsyncSessionLocal
+from app.models import Application, Company, Interview
+
+ENABLED = os.getenv("REMINDERS", "1").lower() in ("1", "true", "yes", "on")
+REMINDER_LEAD_MINUTES = int(os.getenv("REMINDER_LEAD_MINUTES", "60"))
+REMINDER_WEBHOOK_URL = os.getenv("REMINDER_WEBHOOK_URL", "")
+# Longest single sleep, so a changed system clock is noticed
+MAX_SLEEP_SECONDS = 3600
+# Interviews read per round trip at startup, and due reminders checked per query
+CHUNK_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class Reminder:
+    interview_id: int
+    user_id: int
+    application_id: int
+    scheduled_at: datetime
+    interview_type: Optional[str]
+    location: Optional[str]
+    job_title: str
+    company_name: Optional[str]
+
+class ReminderSink(Protocol):
+    async def send(self, reminders: List[Reminder]) -> None: ...
+
+class LogSink:
+    """
+    Writes each reminder to the ``app.reminders`` log, at WARNING so it shows
+    without any logging configuration.
+    """
+
+    async def send(self, reminders: List[Reminder]) -> None:
+        for reminder in reminders:
+            logger.warning(
+                "Reminder for user %s: %s interview for %s%s at %s (interview %s)",
+                reminder.user_id, reminder.interview_type or "an", reminder.job_title,
+                f" at {reminder.company_name}" if reminder.company_name else "",
+                f"{reminder.scheduled_at:%Y-%m-%d %H:%M} UTC", reminder.interview_id,
+            )
+
+class WebhookSink:
+    """POSTs ``{"reminders": [...]}`` as JSON to ``url``, once per batch of due reminders."""
+
+    def __init__(self, url: str, timeout: float = 10):
+        self.url = url
+        self.timeout = timeout
+
+    def _post(self, body: bytes) -> None:
+        request = urllib.request.Request(
+            self.url, data=body, method="POST", headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+    async def send(self, reminders: List[Reminder]) -> None:
+        body = json.dumps({"reminders": [asdict(reminder) for reminder in reminders]}, default=str).encode()
+        await asyncio.to_thread(self._post, body)
+
+def _epoch(value: datetime) -> float:
+    """Seconds since the epoch; naive datetimes are UTC, as stored."""
+    return (value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)).timestamp()
+
+class ReminderScheduler:
+    def __init__(self, sink: ReminderSink, lead: timedelta):
+        self.sink = sink
+        self.lead = lead
+        self._heap: List[Tuple[float, int]] = []  # (remind_at, interview_id), may hold stale entries
+        self._pending: Dict[int, float] = {}  # interview_id -> live remind_at
+        self._lock = threading.Lock()  # writes may commit on another thread's loop
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def start(self) -> None:
+        """Load the upcoming interviews and start the timer task."""
+        if self.running:
+            return
+        await self._load()
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        with self._lock:
+            self._heap.clear()
+            self._pending.clear()
+
+    async def _load(self) -> None:
+        # Only reminders still ahead; those missed while the server was down are not sent
+        earliest = datetime.utcnow() + self.lead
+        pending: Dict[int, float] = {}
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(
+                select(Interview.id, Interview.scheduled_at)
+                .where(Interview.scheduled_at > earliest)
+                .execution_options(yield_per=CHUNK_SIZE)
+            )
+            async for rows in result.partitions():
+                for interview_id, scheduled_at in rows:
+                    pending[interview_id] = _epoch(scheduled_at - self.lead)
+        heap = [(remind_at, interview_id) for interview_id, remind_at in pending.items()]
+        heapq.heapify(heap)
+        with self._lock:
+            self._pending, self._heap = pending, heap
+
+    def schedule(self, interview_id: int, scheduled_at: Optional[datetime]) -> None:
+        """Remind about ``interview_id`` at its new time, replacing any earlier reminder."""
+        if not self.running:
+            return
+        if scheduled_at is None or _epoch(scheduled_at) <= time.time():
+            self.cancel([interview_id])
+            return
+        # An interview less than the lead time away is reminded about at once
+        remind_at = _epoch(scheduled_at - self.lead)
+        with self._lock:
+            self._pending[interview_id] = remind_at
+            heapq.heappush(self._heap, (remind_at, interview_id))
+            earliest = self._heap[0] == (remind_at, interview_id)
+            self._compact()
+        # The timer only needs to move if this is now the next reminder
+        if earliest:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def cancel(self, interview_ids: Iterable[int]) -> None:
+        if not self.running:
+            return
+        with self._lock:
+            for interview_id in interview_ids:
+                self._pending.pop(interview_id, None)
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rebuild the heap from the live entries once most of it is stale. Call with the lock held."""
+        if len(self._heap) > 2 * len(self._pending) + CHUNK_SIZE:
+            self._heap = [(remind_at, interview_id) for interview_id, remind_at in self._pending.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_due(self, now: float) -> Tuple[List[Tuple[int, float]], Optional[float]]:
+        """The live reminders due by ``now``, and when the next one is due."""
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                remind_at, interview_id = heapq.heappop(self._heap)
+                if self._pending.get(interview_id) == remind_at:
+                    del self._pending[interview_id]
+                    due.append((interview_id, remind_at))
+            return due, self._heap[0][0] if self._heap else None
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            due, next_at = self._pop_due(time.time())
+            if due:
+                try:
+                    await self._fire(due)
+                except Exception:
+                    logger.exception("Sending %d interview reminders failed", len(due))
+                continue
+            timeout = MAX_SLEEP_SECONDS if next_at is None else min(max(next_at - time.time(), 0), MAX_SLEEP_SECONDS)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire(self, due: List[Tuple[int, float]]) -> None:
+        expected = dict(due)
+        reminders = []
+        async with AsyncSessionLocal() as db:
+            for start in range(0, len(due), CHUNK_SIZE):
+                ids = [interview_id for interview_id, _ in due[start:start + CHUNK_SIZE]]
+                rows = await db.execute(
+                    select(
+                        Interview.id, Interview.user_id, Interview.application_id, Interview.scheduled_at,
+                        Interview.interview_type, Interview.location,
+                        Application.job_title, Company.name.label("company_name"),
+                    )
+                    .join(Application, Application.id == Interview.application_id)
+                    .outerjoin(Company, Company.id == Application.company_id)
+                    .where(Interview.id.in_(ids))
+                )
+                # Skip interviews deleted or moved since the reminder was queued
+                reminders += [
+                    Reminder(*row) for row in rows
+                    if _epoch(row.scheduled_at - self.lead) == expected[row.id]
+                ]
+        if reminders:
+            await self.sink.send(reminders)
+            self.sent += len(reminders)
+
+scheduler = ReminderScheduler(
+    WebhookSink(REMINDER_WEBHOOK_URL) if REMINDER_WEBHOOK_URL else LogSink(),
+    timedelta(minutes=REMINDER_LEAD_MINUTES),
+)
+
+# Write hooks: changes are staged on the session and reach the scheduler
+# only when the transaction commits, so rolled-back writes leave it alone.
+
+def _staged(db: AsyncSession) -> list:
+    return db.info.setdefault("reminder_changes", [])
+
+def scheduled(db: AsyncSession, interviews: Iterable[Tuple[int, Optional[datetime]]]) -> None:
+    """Queue ``(interview_id, scheduled_at)`` pairs created or rescheduled in this transaction."""
+    if scheduler.running:
+        _staged(db).extend(interviews)
+
+def deleted(db: AsyncSession, interview_ids: Iterable[int]) -> None:
+    """Queue the cancellation of interviews deleted in this transaction."""
+    if scheduler.running:
+        _staged(db).extend((interview_id, None) for interview_id in interview_ids)
+
+@event.listens_for(Session, "after_commit")
+def _apply_staged(session: Session) -> None:
+    for interview_id, scheduled_at in session.info.pop("reminder_changes", ()):
+        scheduler.schedule(interview_id, scheduled_at)
+
+@event.listens_for(Session, "after_rollback")
+def _drop_staged(session: Session) -> None:
+    session.info.pop("reminder_changes", None)
@@ -0,0 +1,55 @@
+from datetime import date, datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.schemas import FunnelResponse, StageDuration, TimeSeriesPoint, TimeSeriesResponse
+from app.auth import get_current_user_id
+from app import analytics, timeseries
+from app.conditional import conditional_daily_get, conditional_get
+
+router = APIRouter()
+
+@router.get("/funnel", response_model=FunnelResponse, dependencies=[Depends(conditional_get)])
+async def get_funnel(
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    return await analytics.funnel(db, current_user_id)
+
+@router.get("/stage-durations", response_model=List[StageDuration], dependencies=[Depends(conditional_get)])
+async def get_stage_durations(
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    return await analytics.stage_durations(db, current_user_id)
+
+@router.get("/timeseries", response_model=TimeSeriesResponse, dependencies=[Depends(conditional_daily_get)])
+async def get_timeseries(
+    metric: Literal["applications", "interviews", "offers"],
+    bucket: Literal["day", "week", "month"] = "week",
+    from_: Optional[date] = Query(None, alias="from"),
+    to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    """
+    Applications sent (by applied date), interviews (by scheduled time) or
+    offers received per bucket, with empty buckets as zeros. Weeks start on
+    Monday; dates are UTC. Defaults to the last 30 days, 12 weeks or 12
+    months up to today.
+    """
+    to = to or datetime.utcnow().date()
+    from_ = from_ or timeseries.default_from(to, bucket)
+    if from_ > to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="from must not be after to")
+    if timeseries.bucket_count(from_, to, bucket) > timeseries.MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range spans more than {timeseries.MAX_BUCKETS} buckets"
+        )
+    points = await timeseries.series(db, current_user_id, metric, bucket, from_, to)
+    return TimeSeriesResponse(
+        metric=metric, bucket=bucket,
+        points=[TimeSeriesPoint(start=start, count=count) for start, count in points],
+    )
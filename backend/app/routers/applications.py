@@ -1,92 +1,129 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from app.database import get_db
-from app.models import Application, User
-from app.schemas import ApplicationCreate, ApplicationUpdate, ApplicationResponse
-from app.auth import get_current_user
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
+from app.database import get_async_db
+from app.models import Application
+from app.schemas import ApplicationCreate, ApplicationUpdate, ApplicationResponse, ApplicationExpanded, BulkResult, BulkDeleteResult
+from app.auth import get_current_user_id
+from app import bulk, crud, deletes, fieldsets, serialization
+from app.pagination import paginate
+from app.expand import loader_options
+from app.conditional import conditional_get
 
 router = APIRouter()
 
-@router.get("/", response_model=List[ApplicationResponse])
+async def _get_user_application(db: AsyncSession, application_id: int, user_id: int, options=()) -> Application:
+    application = await db.scalar(select(Application).options(*options).where(
+        and_(Application.id == application_id, Application.user_id == user_id)
+    ))
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return application
+
+@router.get(
+    "/", response_model=List[ApplicationExpanded], response_model_exclude_unset=True,
+    dependencies=[Depends(conditional_get)]
+)
 async def get_applications(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
     status: Optional[str] = None,
     company_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    query = db.query(Application).filter(Application.user_id == current_user.id)
+    selected = fieldsets.parse_fields(ApplicationExpanded, fields)
+    if expand:
+        query = select(Application).options(
+            *loader_options("applications", expand), *fieldsets.loader_options(Application, selected)
+        )
+    else:
+        names = serialization.row_fields(ApplicationResponse, selected)
+        query = select(*serialization.columns(Application, names))
+    query = query.where(Application.user_id == current_user_id)
     
     if status:
-        query = query.filter(Application.status == status)
+        query = query.where(Application.status == status)
     if company_id:
-        query = query.filter(Application.company_id == company_id)
+        query = query.where(Application.company_id == company_id)
     
-    applications = query.order_by(Application.created_at.desc()).offset(skip).limit(limit).all()
+    applications = await paginate(
+        db, query, response, Application.created_at, Application.id,
+        limit=limit, skip=skip, cursor=cursor, descending=True, as_rows=not expand
+    )
+    if not expand:
+        return serialization.render_rows(applications, ApplicationResponse, names, response)
+    if selected:
+        return fieldsets.render(applications, ApplicationExpanded, selected, response)
     return applications
 
-@router.get("/{application_id}", response_model=ApplicationResponse)
+@router.get(
+    "/{application_id}", response_model=ApplicationExpanded, response_model_exclude_unset=True,
+    dependencies=[Depends(conditional_get)]
+)
 async def get_application(
     application_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    application = db.query(Application).filter(
-        and_(Application.id == application_id, Application.user_id == current_user.id)
-    ).first()
-    if not application:
-        raise HTTPException(status_code=404, detail="Application not found")
-    return application
+    return await _get_user_application(db, application_id, current_user_id, loader_options("applications", expand))
 
 @router.post("/", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
 async def create_application(
     application: ApplicationCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    row = await crud.create(db, "applications", current_user_id, application.dict())
+    await db.commit()
+    return row._mapping
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_applications(
+    rows: List[dict] = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    db_application = Application(**application.dict(), user_id=current_user.id)
-    db.add(db_application)
-    db.commit()
-    db.refresh(db_application)
-    return db_application
+    return await bulk.bulk_create(db, "applications", current_user_id, enumerate(rows, start=1))
 
 @router.put("/{application_id}", response_model=ApplicationResponse)
 async def update_application(
     application_id: int,
     application_update: ApplicationUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    application = db.query(Application).filter(
-        and_(Application.id == application_id, Application.user_id == current_user.id)
-    ).first()
-    if not application:
+    row = await crud.update(
+        db, "applications", current_user_id, application_id, application_update.dict(exclude_unset=True)
+    )
+    if row is None:
         raise HTTPException(status_code=404, detail="Application not found")
-    
-    update_data = application_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(application, field, value)
-    
-    db.commit()
-    db.refresh(application)
-    return application
+    await db.commit()
+    return row._mapping
 
 @router.delete("/{application_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_application(
     application_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    application = db.query(Application).filter(
-        and_(Application.id == application_id, Application.user_id == current_user.id)
-    ).first()
-    if not application:
+    if not await deletes.delete_rows(db, "applications", current_user_id, [application_id]):
         raise HTTPException(status_code=404, detail="Application not found")
-    
-    db.delete(application)
-    db.commit()
+    await db.commit()
     return None
 
+@router.delete("/", response_model=BulkDeleteResult)
+async def delete_applications(
+    ids: List[str] = Query(..., description="Ids to delete, comma-separated or repeated"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    deleted = await deletes.delete_rows(db, "applications", current_user_id, deletes.parse_ids(ids))
+    await db.commit()
+    return BulkDeleteResult(deleted=len(deleted), ids=deleted)
@@ -1,12 +1,13 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app import stats
 from app.models import User
 from app.schemas import UserCreate, UserResponse, Token
 from app.auth import (
-    get_password_hash,
+    get_password_hash_async,
     authenticate_user,
     create_access_token,
     get_user_by_email,
@@ -17,7 +18,7 @@ from app.auth import (
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     try:
         # Validate password length (bcrypt has 72-byte limit)
         password_bytes = user_data.password.encode('utf-8')
@@ -28,7 +29,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
             )
         
         # Check if user already exists
-        existing_user = get_user_by_email(db, user_data.email)
+        existing_user = await get_user_by_email(db, user_data.email)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -36,20 +37,22 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
             )
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         db_user = User(
             email=user_data.email,
             hashed_password=hashed_password,
             full_name=user_data.full_name
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.flush()
+        await stats.ensure(db, db_user.id)
+        await db.commit()
+        await db.refresh(db_user)
         return db_user
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Registration failed: {str(e)}"
@@ -58,9 +61,9 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 @router.post("/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -69,7 +72,7 @@ async def login(
         )
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "user_id": user.id}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.schemas import BatchRequest, BatchResponse
+from app.auth import get_current_user_id
+from app import batch
+
+router = APIRouter()
+
+@router.post("/", response_model=BatchResponse)
+async def run_batch(
+    request: BatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    """
+    Run creates, updates and deletes in order and commit them together, or
+    none of them. A failed operation is reported as
+    ``{"detail": {"operation": index, "detail": ...}}``.
+    """
+    results = await batch.run(db, current_user_id, request.operations)
+    await db.commit()
+    return BatchResponse(results=results)
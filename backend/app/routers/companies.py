@@ -1,89 +1,112 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from app.database import get_db
-from app.models import Company, User
-from app.schemas import CompanyCreate, CompanyUpdate, CompanyResponse
-from app.auth import get_current_user
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
+from app.database import get_async_db
+from app.models import Company
+from app.schemas import CompanyCreate, CompanyUpdate, CompanyResponse, BulkResult, BulkDeleteResult
+from app.auth import get_current_user_id
+from app import bulk, crud, deletes, fieldsets, serialization
+from app.pagination import paginate
+from app.conditional import conditional_get
 
 router = APIRouter()
 
-@router.get("/", response_model=List[CompanyResponse])
+async def _get_user_company(db: AsyncSession, company_id: int, user_id: int) -> Company:
+    company = await db.scalar(select(Company).where(
+        and_(Company.id == company_id, Company.user_id == user_id)
+    ))
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    return company
+
+@router.get(
+    "/", response_model=List[CompanyResponse],
+    dependencies=[Depends(conditional_get)]
+)
 async def get_companies(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    query = db.query(Company).filter(Company.user_id == current_user.id)
+    selected = fieldsets.parse_fields(CompanyResponse, fields)
+    names = serialization.row_fields(CompanyResponse, selected)
+    query = select(*serialization.columns(Company, names)).where(Company.user_id == current_user_id)
     
     if search:
-        query = query.filter(Company.name.ilike(f"%{search}%"))
+        # Case-insensitive substring of the name; /api/search is the ranked full-text search
+        query = query.where(Company.name.ilike(f"%{search}%"))
     
-    companies = query.order_by(Company.name).offset(skip).limit(limit).all()
-    return companies
+    companies = await paginate(
+        db, query, response, Company.name, Company.id,
+        limit=limit, skip=skip, cursor=cursor, as_rows=True
+    )
+    return serialization.render_rows(companies, CompanyResponse, names, response)
 
-@router.get("/{company_id}", response_model=CompanyResponse)
+@router.get(
+    "/{company_id}", response_model=CompanyResponse,
+    dependencies=[Depends(conditional_get)]
+)
 async def get_company(
     company_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    company = db.query(Company).filter(
-        and_(Company.id == company_id, Company.user_id == current_user.id)
-    ).first()
-    if not company:
-        raise HTTPException(status_code=404, detail="Company not found")
-    return company
+    return await _get_user_company(db, company_id, current_user_id)
 
 @router.post("/", response_model=CompanyResponse, status_code=status.HTTP_201_CREATED)
 async def create_company(
     company: CompanyCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    row = await crud.create(db, "companies", current_user_id, company.dict())
+    await db.commit()
+    return row._mapping
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_companies(
+    rows: List[dict] = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    db_company = Company(**company.dict(), user_id=current_user.id)
-    db.add(db_company)
-    db.commit()
-    db.refresh(db_company)
-    return db_company
+    return await bulk.bulk_create(db, "companies", current_user_id, enumerate(rows, start=1))
 
 @router.put("/{company_id}", response_model=CompanyResponse)
 async def update_company(
     company_id: int,
     company_update: CompanyUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    company = db.query(Company).filter(
-        and_(Company.id == company_id, Company.user_id == current_user.id)
-    ).first()
-    if not company:
+    row = await crud.update(db, "companies", current_user_id, company_id, company_update.dict(exclude_unset=True))
+    if row is None:
         raise HTTPException(status_code=404, detail="Company not found")
-    
-    update_data = company_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(company, field, value)
-    
-    db.commit()
-    db.refresh(company)
-    return company
+    await db.commit()
+    return row._mapping
 
 @router.delete("/{company_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_company(
     company_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    company = db.query(Company).filter(
-        and_(Company.id == company_id, Company.user_id == current_user.id)
-    ).first()
-    if not company:
+    if not await deletes.delete_rows(db, "companies", current_user_id, [company_id]):
         raise HTTPException(status_code=404, detail="Company not found")
-    
-    db.delete(company)
-    db.commit()
+    await db.commit()
     return None
 
+@router.delete("/", response_model=BulkDeleteResult)
+async def delete_companies(
+    ids: List[str] = Query(..., description="Ids to delete, comma-separated or repeated"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    deleted = await deletes.delete_rows(db, "companies", current_user_id, deletes.parse_ids(ids))
+    await db.commit()
+    return BulkDeleteResult(deleted=len(deleted), ids=deleted)
@@ -1,89 +1,124 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from app.database import get_db
-from app.models import Contact, User
-from app.schemas import ContactCreate, ContactUpdate, ContactResponse
-from app.auth import get_current_user
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
+from app.database import get_async_db
+from app.models import Contact
+from app.schemas import ContactCreate, ContactUpdate, ContactResponse, ContactExpanded, BulkResult, BulkDeleteResult
+from app.auth import get_current_user_id
+from app import bulk, crud, deletes, fieldsets, serialization
+from app.pagination import paginate
+from app.expand import loader_options
+from app.conditional import conditional_get
 
 router = APIRouter()
 
-@router.get("/", response_model=List[ContactResponse])
+async def _get_user_contact(db: AsyncSession, contact_id: int, user_id: int, options=()) -> Contact:
+    contact = await db.scalar(select(Contact).options(*options).where(
+        and_(Contact.id == contact_id, Contact.user_id == user_id)
+    ))
+    if not contact:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return contact
+
+@router.get(
+    "/", response_model=List[ContactExpanded], response_model_exclude_unset=True,
+    dependencies=[Depends(conditional_get)]
+)
 async def get_contacts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
     company_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    query = db.query(Contact).filter(Contact.user_id == current_user.id)
+    selected = fieldsets.parse_fields(ContactExpanded, fields)
+    if expand:
+        query = select(Contact).options(
+            *loader_options("contacts", expand), *fieldsets.loader_options(Contact, selected)
+        )
+    else:
+        names = serialization.row_fields(ContactResponse, selected)
+        query = select(*serialization.columns(Contact, names))
+    query = query.where(Contact.user_id == current_user_id)
     
     if company_id:
-        query = query.filter(Contact.company_id == company_id)
+        query = query.where(Contact.company_id == company_id)
     
-    contacts = query.order_by(Contact.name).offset(skip).limit(limit).all()
+    contacts = await paginate(
+        db, query, response, Contact.name, Contact.id,
+        limit=limit, skip=skip, cursor=cursor, as_rows=not expand
+    )
+    if not expand:
+        return serialization.render_rows(contacts, ContactResponse, names, response)
+    if selected:
+        return fieldsets.render(contacts, ContactExpanded, selected, response)
     return contacts
 
-@router.get("/{contact_id}", response_model=ContactResponse)
+@router.get(
+    "/{contact_id}", response_model=ContactExpanded, response_model_exclude_unset=True,
+    dependencies=[Depends(conditional_get)]
+)
 async def get_contact(
     contact_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    contact = db.query(Contact).filter(
-        and_(Contact.id == contact_id, Contact.user_id == current_user.id)
-    ).first()
-    if not contact:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    return contact
+    return await _get_user_contact(db, contact_id, current_user_id, loader_options("contacts", expand))
 
 @router.post("/", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
 async def create_contact(
     contact: ContactCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    row = await crud.create(db, "contacts", current_user_id, contact.dict())
+    await db.commit()
+    return row._mapping
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_contacts(
+    rows: List[dict] = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    db_contact = Contact(**contact.dict(), user_id=current_user.id)
-    db.add(db_contact)
-    db.commit()
-    db.refresh(db_contact)
-    return db_contact
+    return await bulk.bulk_create(db, "contacts", current_user_id, enumerate(rows, start=1))
 
 @router.put("/{contact_id}", response_model=ContactResponse)
 async def update_contact(
     contact_id: int,
     contact_update: ContactUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    contact = db.query(Contact).filter(
-        and_(Contact.id == contact_id, Contact.user_id == current_user.id)
-    ).first()
-    if not contact:
+    row = await crud.update(db, "contacts", current_user_id, contact_id, contact_update.dict(exclude_unset=True))
+    if row is None:
         raise HTTPException(status_code=404, detail="Contact not found")
-    
-    update_data = contact_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(contact, field, value)
-    
-    db.commit()
-    db.refresh(contact)
-    return contact
+    await db.commit()
+    return row._mapping
 
 @router.delete("/{contact_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_contact(
     contact_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    contact = db.query(Contact).filter(
-        and_(Contact.id == contact_id, Contact.user_id == current_user.id)
-    ).first()
-    if not contact:
+    if not await deletes.delete_rows(db, "contacts", current_user_id, [contact_id]):
         raise HTTPException(status_code=404, detail="Contact not found")
-    
-    db.delete(contact)
-    db.commit()
+    await db.commit()
     return None
 
+@router.delete("/", response_model=BulkDeleteResult)
+async def delete_contacts(
+    ids: List[str] = Query(..., description="Ids to delete, comma-separated or repeated"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    deleted = await deletes.delete_rows(db, "contacts", current_user_id, deletes.parse_ids(ids))
+    await db.commit()
+    return BulkDeleteResult(deleted=len(deleted), ids=deleted)
@@ -1,79 +1,79 @@
 from datetime import datetime, timedelta
 from typing import List
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from app.database import get_db
-from app.models import Application, Interview, Company, Contact, User, ApplicationStatus
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, and_, select
+from app.database import get_async_db
+from app.models import Application, Interview, UserStats, ApplicationStatus
 from app.schemas import DashboardStats, ApplicationResponse, InterviewResponse
-from app.auth import get_current_user
+from app.auth import get_current_user_id
+from app import stats
+from app.conditional import conditional_dashboard_get
 
 router = APIRouter()
 
-@router.get("/stats", response_model=DashboardStats)
-async def get_dashboard_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    user_id = current_user.id
-    
-    # Total applications
-    total_applications = db.query(Application).filter(
-        Application.user_id == user_id
-    ).count()
-    
-    # Applications by status
-    status_counts = db.query(
-        Application.status,
-        func.count(Application.id).label('count')
-    ).filter(
-        Application.user_id == user_id
-    ).group_by(Application.status).all()
-    
-    applications_by_status = {status.value: 0 for status in ApplicationStatus}
-    for status, count in status_counts:
-        applications_by_status[status.value] = count
-    
-    # Upcoming interviews (next 7 days)
-    upcoming_cutoff = datetime.utcnow() + timedelta(days=7)
-    upcoming_interviews = db.query(Interview).filter(
+async def build_dashboard_stats(db: AsyncSession, user_id: int) -> DashboardStats:
+    """
+    Collect the dashboard numbers for one user.
+
+    The totals and per-status counts come from the user's ``user_stats``
+    row, which the routers keep current on every write, so they cost a
+    primary-key lookup at any data size. The upcoming-interview count is
+    time dependent and rides along in the same statement as an index range
+    count. The two "recent" lists are bounded index scans and are fetched
+    separately.
+    """
+    now = datetime.utcnow()
+    upcoming_cutoff = now + timedelta(days=7)
+
+    upcoming_interviews = select(func.count(Interview.id)).where(
         and_(
             Interview.user_id == user_id,
-            Interview.scheduled_at >= datetime.utcnow(),
+            Interview.scheduled_at >= now,
             Interview.scheduled_at <= upcoming_cutoff
         )
-    ).count()
-    
-    # Total companies
-    total_companies = db.query(Company).filter(
-        Company.user_id == user_id
-    ).count()
-    
-    # Total contacts
-    total_contacts = db.query(Contact).filter(
-        Contact.user_id == user_id
-    ).count()
-    
+    ).scalar_subquery()
+
+    row = (await db.execute(
+        select(UserStats, upcoming_interviews.label("upcoming_interviews"))
+        .where(UserStats.user_id == user_id)
+    )).first()
+    if row is not None:
+        counts = {column: getattr(row.UserStats, column) for column in stats.COUNTER_COLUMNS}
+        upcoming = row.upcoming_interviews
+    else:
+        # No counter row yet (e.g. data loaded outside the API): count directly
+        counts = await db.run_sync(stats.compute, user_id)
+        upcoming = await db.scalar(select(upcoming_interviews))
+
     # Recent applications (last 5)
-    recent_applications = db.query(Application).filter(
+    recent_applications = (await db.scalars(select(Application).where(
         Application.user_id == user_id
-    ).order_by(Application.created_at.desc()).limit(5).all()
-    
+    ).order_by(Application.created_at.desc()).limit(5))).all()
+
     # Recent interviews (next 5)
-    recent_interviews = db.query(Interview).filter(
+    recent_interviews = (await db.scalars(select(Interview).where(
         and_(
             Interview.user_id == user_id,
-            Interview.scheduled_at >= datetime.utcnow()
+            Interview.scheduled_at >= now
         )
-    ).order_by(Interview.scheduled_at).limit(5).all()
-    
+    ).order_by(Interview.scheduled_at).limit(5))).all()
+
     return DashboardStats(
-        total_applications=total_applications,
-        applications_by_status=applications_by_status,
-        upcoming_interviews=upcoming_interviews,
-        total_companies=total_companies,
-        total_contacts=total_contacts,
+        total_applications=counts["total_applications"],
+        applications_by_status={
+            status.value: counts[stats.status_column(status)] for status in ApplicationStatus
+        },
+        upcoming_interviews=upcoming,
+        total_companies=counts["total_companies"],
+        total_contacts=counts["total_contacts"],
         recent_applications=[ApplicationResponse.model_validate(app) for app in recent_applications],
         recent_interviews=[InterviewResponse.model_validate(intv) for intv in recent_interviews]
     )
 
+@router.get("/stats", response_model=DashboardStats, dependencies=[Depends(conditional_dashboard_get)])
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    return await build_dashboard_stats(db, current_user_id)
@@ -0,0 +1,103 @@
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, List, Literal
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json, to_jsonable_python
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from app.models import Application, Company, Contact, Interview
+from app.schemas import ApplicationResponse, CompanyResponse, ContactResponse, InterviewResponse
+from app.auth import get_current_user_id
+
+router = APIRouter()
+
+# Rows fetched from the database per round trip while streaming
+EXPORT_CHUNK_SIZE = 1000
+
+ExportEntity = Literal["companies", "applications", "contacts", "interviews"]
+
+# Exported in this order so parents come before the rows that reference them
+EXPORTS = {
+    "companies": (Company, CompanyResponse),
+    "applications": (Application, ApplicationResponse),
+    "contacts": (Contact, ContactResponse),
+    "interviews": (Interview, InterviewResponse),
+}
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _columns(entity: str) -> List[str]:
+    return list(EXPORTS[entity][1].model_fields)
+
+async def _partitions(user_id: int, entities: List[str]) -> AsyncIterator[tuple]:
+    """
+    Yield ``(entity, rows)`` chunks of at most EXPORT_CHUNK_SIZE plain rows.
+
+    The response body is produced after the request's dependencies have
+    been torn down, so the export opens a session of its own.
+    """
+    async with AsyncSessionLocal() as db:
+        for entity in entities:
+            model = EXPORTS[entity][0]
+            table = model.__table__
+            query = (
+                select(*(table.c[name] for name in _columns(entity)))
+                .where(table.c.user_id == user_id)
+                .order_by(table.c.id)
+                .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+            )
+            result = await db.stream(query)
+            async for rows in result.partitions():
+                yield entity, rows
+
+async def stream_ndjson(user_id: int, entities: List[str]) -> AsyncIterator[bytes]:
+    """One JSON object per line, tagged with its entity in ``type``."""
+    async for entity, rows in _partitions(user_id, entities):
+        columns = _columns(entity)
+        yield b"".join(to_json({"type": entity, **dict(zip(columns, row))}) + b"\n" for row in rows)
+
+async def stream_csv(user_id: int, entities: List[str]) -> AsyncIterator[str]:
+    """
+    One CSV table: a ``type`` column followed by the union of every exported
+    entity's columns, left empty where they do not apply.
+    """
+    header = ["type"]
+    for entity in entities:
+        header.extend(name for name in _columns(entity) if name not in header)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=header)
+    writer.writeheader()
+    async for entity, rows in _partitions(user_id, entities):
+        columns = _columns(entity)
+        for row in rows:
+            writer.writerow({"type": entity, **to_jsonable_python(dict(zip(columns, row)))})
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Nothing was exported: still send the header
+    if buffer.tell():
+        yield buffer.getvalue()
+
+@router.get("")
+async def export_data(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    entity: List[ExportEntity] = Query(default=list(EXPORTS)),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    """
+    Stream every row of the selected entities (all of them by default).
+    Rows are read in chunks, so memory use does not grow with the data set.
+    """
+    entities = [name for name in EXPORTS if name in entity]
+    stream = stream_ndjson if format == "ndjson" else stream_csv
+    filename = f"job-hunt-export-{datetime.utcnow():%Y%m%d}.{format}"
+    return StreamingResponse(
+        stream(current_user_id, entities),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,48 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.schemas import BulkResult
+from app.auth import get_current_user_id
+from app import bulk
+
+router = APIRouter()
+
+PARSERS = {
+    "csv": bulk.parse_csv,
+    "ndjson": bulk.parse_ndjson,
+}
+
+# File extensions recognised when no explicit format is given
+EXTENSION_FORMATS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+
+def _detect_format(filename: Optional[str]) -> str:
+    filename = (filename or "").lower()
+    for extension, fmt in EXTENSION_FORMATS.items():
+        if filename.endswith(extension):
+            return fmt
+    raise HTTPException(
+        status_code=400,
+        detail="Could not detect the file format; pass format=csv or format=ndjson",
+    )
+
+@router.post("/{entity}", response_model=BulkResult)
+async def import_rows(
+    entity: Literal["applications", "companies", "contacts", "interviews"],
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ndjson"]] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    """
+    Import a CSV (with a header row) or NDJSON file. The file is read row by
+    row and inserted in batches, so large files are never held in memory.
+    Rows before an undecodable part of the file are still imported; the
+    response counts them and reports the encoding error as a row error.
+    """
+    parse = PARSERS[format or _detect_format(file.filename)]
+    return await bulk.bulk_create(db, entity, current_user_id, parse(file.file))
@@ -1,94 +1,217 @@
 from typing import List, Optional
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from app.database import get_db
-from app.models import Interview, User
-from app.schemas import InterviewCreate, InterviewUpdate, InterviewResponse
-from app.auth import get_current_user
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
+from app.database import get_async_db
+from app.models import Interview
+from app.schemas import (
+    InterviewCreate, InterviewUpdate, InterviewResponse, InterviewExpanded, BulkResult, BulkDeleteResult,
+    CalendarConflict, CalendarEntry, CalendarResponse,
+)
+from app.auth import get_current_user_id
+from app import bulk, crud, deletes, fieldsets, interview_calendar, serialization
+from app.pagination import paginate
+from app.expand import loader_options
+from app.conditional import conditional_daily_get, conditional_dashboard_get, conditional_get
 
 router = APIRouter()
 
-@router.get("/", response_model=List[InterviewResponse])
+async def _get_user_interview(db: AsyncSession, interview_id: int, user_id: int, options=()) -> Interview:
+    interview = await db.scalar(select(Interview).options(*options).where(
+        and_(Interview.id == interview_id, Interview.user_id == user_id)
+    ))
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    return interview
+
+async def _conditional_list_get(
+    request: Request,
+    response: Response,
+    upcoming_only: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+) -> None:
+    # Interviews drop out of upcoming_only as time passes, so that view's ETag
+    # also rolls over every minute, like the dashboard's
+    guard = conditional_dashboard_get if upcoming_only else conditional_get
+    await guard(request, response, db, current_user_id)
+
+@router.get(
+    "/", response_model=List[InterviewExpanded], response_model_exclude_unset=True,
+    dependencies=[Depends(_conditional_list_get)]
+)
 async def get_interviews(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
     application_id: Optional[int] = None,
     upcoming_only: bool = False,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    query = db.query(Interview).filter(Interview.user_id == current_user.id)
+    selected = fieldsets.parse_fields(InterviewExpanded, fields)
+    if expand:
+        query = select(Interview).options(
+            *loader_options("interviews", expand), *fieldsets.loader_options(Interview, selected)
+        )
+    else:
+        names = serialization.row_fields(InterviewResponse, selected)
+        query = select(*serialization.columns(Interview, names))
+    query = query.where(Interview.user_id == current_user_id)
     
     if application_id:
-        query = query.filter(Interview.application_id == application_id)
+        query = query.where(Interview.application_id == application_id)
     
     if upcoming_only:
-        query = query.filter(Interview.scheduled_at >= datetime.utcnow())
+        query = query.where(Interview.scheduled_at >= datetime.utcnow())
     
-    interviews = query.order_by(Interview.scheduled_at).offset(skip).limit(limit).all()
+    interviews = await paginate(
+        db, query, response, Interview.scheduled_at, Interview.id,
+        limit=limit, skip=skip, cursor=cursor, as_rows=not expand
+    )
+    if not expand:
+        return serialization.render_rows(interviews, InterviewResponse, names, response)
+    if selected:
+        return fieldsets.render(interviews, InterviewExpanded, selected, response)
     return interviews
 
-@router.get("/{interview_id}", response_model=InterviewResponse)
+def _calendar_range(from_: Optional[date], to: Optional[date], default_from: date, default_to: date):
+    from_, to = from_ or default_from, to or default_to
+    if from_ > to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="from must not be after to")
+    if (to - from_).days >= interview_calendar.MAX_CALENDAR_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range spans more than {interview_calendar.MAX_CALENDAR_DAYS} days"
+        )
+    return from_, to
+
+# Declared before /{interview_id}, which would otherwise capture these paths
+@router.get(
+    "/calendar", response_model=CalendarResponse,
+    dependencies=[Depends(conditional_daily_get)]
+)
+async def get_calendar(
+    from_: Optional[date] = Query(None, alias="from"),
+    to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    """
+    Interviews scheduled from ``from`` through ``to`` (UTC days; default
+    today and the next 30 days), with overlapping and back-to-back pairs.
+    """
+    today = datetime.utcnow().date()
+    from_, to = _calendar_range(from_, to, today, today + timedelta(days=interview_calendar.DEFAULT_DAYS))
+    rows = await interview_calendar.interviews_between(db, current_user_id, *interview_calendar.day_range(from_, to))
+    length = interview_calendar.duration()
+    conflicts = interview_calendar.find_conflicts(
+        (row.id, row.scheduled_at, row.scheduled_at + length) for row in rows
+    )
+    return CalendarResponse(
+        start=from_, end=to,
+        interviews=[
+            CalendarEntry(
+                id=row.id, application_id=row.application_id, interview_type=row.interview_type,
+                scheduled_at=row.scheduled_at, ends_at=row.scheduled_at + length, location=row.location,
+                interviewer_name=row.interviewer_name, job_title=row.job_title, company_name=row.company_name,
+            )
+            for row in rows
+        ],
+        conflicts=[CalendarConflict(**vars(conflict)) for conflict in conflicts],
+    )
+
+@router.get("/calendar.ics", dependencies=[Depends(conditional_daily_get)])
+async def get_calendar_feed(
+    request: Request,
+    response: Response,
+    from_: Optional[date] = Query(None, alias="from"),
+    to: Optional[date] = None,
+    current_user_id: int = Depends(get_current_user_id)
+):
+    """
+    The interviews as an iCalendar feed, streamed; by default from 30 days
+    ago to a year ahead. Carries the same ETag as the other calendar views.
+    """
+    today = datetime.utcnow().date()
+    from_, to = _calendar_range(
+        from_, to,
+        today - timedelta(days=interview_calendar.FEED_PAST_DAYS),
+        today + timedelta(days=interview_calendar.FEED_FUTURE_DAYS),
+    )
+    return StreamingResponse(
+        interview_calendar.ics_feed(
+            current_user_id, *interview_calendar.day_range(from_, to), request.url.hostname or "job-hunt-erp"
+        ),
+        media_type="text/calendar; charset=utf-8",
+        headers={**response.headers, "Content-Disposition": 'inline; filename="interviews.ics"'},
+    )
+
+@router.get(
+    "/{interview_id}", response_model=InterviewExpanded, response_model_exclude_unset=True,
+    dependencies=[Depends(conditional_get)]
+)
 async def get_interview(
     interview_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    interview = db.query(Interview).filter(
-        and_(Interview.id == interview_id, Interview.user_id == current_user.id)
-    ).first()
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
-    return interview
+    return await _get_user_interview(db, interview_id, current_user_id, loader_options("interviews", expand))
 
 @router.post("/", response_model=InterviewResponse, status_code=status.HTTP_201_CREATED)
 async def create_interview(
     interview: InterviewCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    row = await crud.create(db, "interviews", current_user_id, interview.dict())
+    await db.commit()
+    return row._mapping
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_interviews(
+    rows: List[dict] = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    db_interview = Interview(**interview.dict(), user_id=current_user.id)
-    db.add(db_interview)
-    db.commit()
-    db.refresh(db_interview)
-    return db_interview
+    return await bulk.bulk_create(db, "interviews", current_user_id, enumerate(rows, start=1))
 
 @router.put("/{interview_id}", response_model=InterviewResponse)
 async def update_interview(
     interview_id: int,
     interview_update: InterviewUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    interview = db.query(Interview).filter(
-        and_(Interview.id == interview_id, Interview.user_id == current_user.id)
-    ).first()
-    if not interview:
+    row = await crud.update(db, "interviews", current_user_id, interview_id, interview_update.dict(exclude_unset=True))
+    if row is None:
         raise HTTPException(status_code=404, detail="Interview not found")
-    
-    update_data = interview_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(interview, field, value)
-    
-    db.commit()
-    db.refresh(interview)
-    return interview
+    await db.commit()
+    return row._mapping
 
 @router.delete("/{interview_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_interview(
     interview_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    interview = db.query(Interview).filter(
-        and_(Interview.id == interview_id, Interview.user_id == current_user.id)
-    ).first()
-    if not interview:
+    if not await deletes.delete_rows(db, "interviews", current_user_id, [interview_id]):
         raise HTTPException(status_code=404, detail="Interview not found")
-    
-    db.delete(interview)
-    db.commit()
+    await db.commit()
     return None
 
+@router.delete("/", response_model=BulkDeleteResult)
+async def delete_interviews(
+    ids: List[str] = Query(..., description="Ids to delete, comma-separated or repeated"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    deleted = await deletes.delete_rows(db, "interviews", current_user_id, deletes.parse_ids(ids))
+    await db.commit()
+    return BulkDeleteResult(deleted=len(deleted), ids=deleted)
@@ -0,0 +1,21 @@
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.schemas import SearchResult
+from app.auth import get_current_user_id
+from app import search as search_index
+
+router = APIRouter()
+
+@router.get("", response_model=List[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1),
+    entity: Optional[List[Literal["companies", "contacts", "applications", "interviews"]]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    if not search_index.available(db):
+        raise HTTPException(status_code=501, detail="Full-text search requires SQLite FTS5")
+    return await search_index.search(db, current_user_id, q, entities=entity, limit=limit)
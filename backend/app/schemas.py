@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr
-from datetime import datetime
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, model_validator
+from datetime import date, datetime
+from typing import Any, Dict, Literal, Optional, List, Union
+from sqlalchemy import inspect as sa_inspect
 from app.models import ApplicationStatus
 
 # User schemas
@@ -24,6 +25,7 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    user_id: Optional[int] = None
 
 # Company schemas
 class CompanyBase(BaseModel):
@@ -163,6 +165,108 @@ class InterviewResponse(InterviewBase):
     class Config:
         from_attributes = True
 
+class CalendarEntry(BaseModel):
+    id: int
+    application_id: int
+    interview_type: Optional[str] = None
+    scheduled_at: datetime
+    ends_at: datetime
+    location: Optional[str] = None
+    interviewer_name: Optional[str] = None
+    job_title: str
+    company_name: str
+
+class CalendarConflict(BaseModel):
+    first_id: int
+    second_id: int
+    kind: Literal["overlap", "back_to_back"]
+    # From the end of the first interview to the start of the second; negative for an overlap
+    gap_minutes: float
+
+class CalendarResponse(BaseModel):
+    start: date
+    end: date
+    interviews: List[CalendarEntry]
+    conflicts: List[CalendarConflict]
+
+# Expanded schemas (``?expand=``): related records nested in the response
+class LoadedRelationships(BaseModel):
+    """
+    Read ORM relationships only if the query already loaded them.
+
+    An unloaded relationship is left unset instead of being lazy-loaded
+    (which an AsyncSession cannot do), so it is simply omitted when the
+    endpoint serialises with ``response_model_exclude_unset``.
+    """
+
+    @model_validator(mode="before")
+    @classmethod
+    def _skip_unloaded_relationships(cls, data: Any) -> Any:
+        state = sa_inspect(data, raiseerr=False)
+        if state is None or not hasattr(state, "unloaded"):
+            return data
+        relationships = state.mapper.relationships
+        loaded = state.dict
+        return {
+            name: getattr(data, name) for name in cls.model_fields
+            if name in loaded or name not in relationships
+        }
+
+class ApplicationExpanded(ApplicationResponse, LoadedRelationships):
+    company: Optional[CompanyResponse] = None
+
+class ContactExpanded(ContactResponse, LoadedRelationships):
+    company: Optional[CompanyResponse] = None
+
+class InterviewExpanded(InterviewResponse, LoadedRelationships):
+    application: Optional[ApplicationExpanded] = None
+
+# Bulk create / import schemas
+class RowError(BaseModel):
+    row: int
+    detail: str
+
+class BulkResult(BaseModel):
+    created: int
+    ids: List[int]
+    errors: List[RowError]
+
+class BulkDeleteResult(BaseModel):
+    deleted: int
+    ids: List[int]
+
+# Batch schemas
+class BatchOperation(BaseModel):
+    method: Literal["create", "update", "delete"]
+    entity: Literal["applications", "companies", "contacts", "interviews"]
+    # Record to update or delete: an id, or "$<ref>" naming an earlier operation
+    id: Optional[Union[int, str]] = None
+    # Lets later operations use this record's id as "$<ref>"
+    ref: Optional[str] = None
+    data: Dict[str, Any] = {}
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation]
+
+class BatchResult(BaseModel):
+    method: str
+    entity: str
+    id: int
+    ref: Optional[str] = None
+    # The record as its entity's endpoints return it; None after a delete
+    data: Optional[Dict[str, Any]] = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchResult]
+
+# Search schemas
+class SearchResult(BaseModel):
+    entity: str
+    id: int
+    title: Optional[str] = None
+    snippet: str
+    rank: float
+
 # Dashboard schemas
 class DashboardStats(BaseModel):
     total_applications: int
@@ -173,3 +277,34 @@ class DashboardStats(BaseModel):
     recent_applications: List[ApplicationResponse]
     recent_interviews: List[InterviewResponse]
 
+
+# Analytics schemas
+class FunnelStage(BaseModel):
+    status: ApplicationStatus
+    reached: int
+    conversion_from_previous: Optional[float] = None
+    conversion_from_applied: Optional[float] = None
+
+class FunnelResponse(BaseModel):
+    total_applications: int
+    stages: List[FunnelStage]
+    rejected: int
+    withdrawn: int
+
+class StageDuration(BaseModel):
+    status: ApplicationStatus
+    completed: int
+    current: int
+    avg_days: Optional[float] = None
+    median_days: Optional[float] = None
+    p90_days: Optional[float] = None
+    max_days: Optional[float] = None
+
+class TimeSeriesPoint(BaseModel):
+    start: date
+    count: int
+
+class TimeSeriesResponse(BaseModel):
+    metric: str
+    bucket: str
+    points: List[TimeSeriesPoint]
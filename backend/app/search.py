@@ -0,0 +1,89 @@
+"""
+Queries against the ``search_index`` FTS5 table (see migration 4).
+
+Each index row covers one company, contact, application or interview. Its
+rowid is ``id * 4 + entity code``, ``owner`` is a ``u<user_id>`` token, and
+``title`` / ``body`` hold the searchable text.
+"""
+import html
+import re
+from typing import List, Optional
+from sqlalchemy import column, func, literal_column, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas import SearchResult
+
+ENTITY_CODES = {
+    "companies": 0,
+    "contacts": 1,
+    "applications": 2,
+    "interviews": 3,
+}
+ENTITIES = {code: name for name, code in ENTITY_CODES.items()}
+
+# bm25 weights for (owner, title, body): a hit in the title counts ten times a body hit
+RANK_WEIGHTS = (0.0, 10.0, 1.0)
+SNIPPET_TOKENS = 16
+
+search_index = table("search_index", column("rowid"), column("owner"), column("title"), column("body"))
+_fts = literal_column("search_index")
+
+# Control characters mark highlights inside SQLite; they become <mark> once
+# the rest of the text has been HTML-escaped.
+_START, _END = "\x02", "\x03"
+
+def available(db: AsyncSession) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+def match_expression(user_id: int, terms: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query scoped to ``user_id``.
+
+    Every word must match; the last one also matches as a prefix so
+    results keep up while the user is typing. Returns None when ``terms``
+    contains no searchable words.
+    """
+    words = re.findall(r"\w+", terms)
+    if not words:
+        return None
+    phrases = [f'"{word}"' for word in words]
+    phrases[-1] += "*"
+    return f"owner:u{user_id} AND {{title body}}:({' '.join(phrases)})"
+
+def _marked(text: Optional[str]) -> Optional[str]:
+    if text is None:
+        return None
+    return html.escape(text).replace(_START, "<mark>").replace(_END, "</mark>")
+
+async def search(
+    db: AsyncSession, user_id: int, terms: str, entities: Optional[List[str]] = None, limit: int = 20
+) -> List[SearchResult]:
+    """Best-ranked matches for ``terms`` across the user's records."""
+    match = match_expression(user_id, terms)
+    if match is None:
+        return []
+    rank = func.bm25(_fts, *RANK_WEIGHTS).label("rank")
+    query = (
+        select(
+            search_index.c.rowid,
+            func.highlight(_fts, 1, _START, _END).label("title"),
+            func.snippet(_fts, 2, _START, _END, "…", SNIPPET_TOKENS).label("snippet"),
+            rank,
+        )
+        .select_from(search_index)
+        .where(_fts.op("MATCH")(match))
+        .order_by(rank)
+        .limit(limit)
+    )
+    if entities:
+        query = query.where(search_index.c.rowid.op("%")(4).in_([ENTITY_CODES[e] for e in entities]))
+    rows = await db.execute(query)
+    return [
+        SearchResult(
+            entity=ENTITIES[row.rowid % 4],
+            id=row.rowid >> 2,
+            title=_marked(row.title),
+            snippet=_marked(row.snippet) or "",
+            rank=row.rank,
+        )
+        for row in rows
+    ]
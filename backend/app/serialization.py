@@ -0,0 +1,47 @@
+"""
+Fast serialisation path for list endpoints.
+
+A plain list page (no ``?expand=``) selects the response's columns as row
+tuples instead of ORM instances, skipping identity-map bookkeeping and
+attribute instrumentation. Rows are checked against a ``TypedDict`` mirror
+of the response schema, through a ``TypeAdapter`` built once per
+(schema, fields) pair, and encoded with orjson.
+"""
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple, Type
+from typing_extensions import TypedDict
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+class ORJSONResponse(Response):
+    """JSON response encoded with orjson."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+def row_fields(schema: Type[BaseModel], names: Optional[Tuple[str, ...]] = None) -> Tuple[str, ...]:
+    """The columns to select: ``names`` from ``?fields=``, or every field of ``schema``."""
+    return names or tuple(schema.model_fields)
+
+def columns(model, names: Sequence[str]) -> List:
+    return [getattr(model, name) for name in names]
+
+@lru_cache(maxsize=256)
+def _row_adapter(schema: Type[BaseModel], names: Tuple[str, ...]) -> TypeAdapter:
+    row_type = TypedDict(
+        f"{schema.__name__}Row",
+        {name: schema.model_fields[name].rebuild_annotation() for name in names},
+    )
+    return TypeAdapter(List[row_type])
+
+def render_rows(rows: Sequence[tuple], schema: Type[BaseModel], names: Tuple[str, ...], response: Response) -> Response:
+    """
+    Serialise row tuples holding ``names`` as a JSON list of ``schema`` objects,
+    carrying over headers already set on ``response`` (cursor, ETag).
+    """
+    adapter = _row_adapter(schema, names)
+    items = adapter.validate_python([dict(zip(names, row)) for row in rows])
+    return ORJSONResponse(items, headers=dict(response.headers))
@@ -0,0 +1,184 @@
+"""
+Per-user counters and data version (the ``user_stats`` table).
+
+Routers await :func:`adjust` inside the same transaction as every write, so
+the counters commit or roll back together with the data. Each call also
+bumps the user's ``data_version`` and ``modified_at``, which back the ETag
+and Last-Modified headers (see ``app.conditional``), and ``history_version``
+when the write touched a date before today (see ``app.timeseries``).
+:func:`rebuild` and :func:`verify` recompute everything from the source
+tables; run them with ``python -m app.stats rebuild|verify``.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models import Application, ApplicationStatus, Company, Contact, Interview, User, UserStats
+
+TOTAL_COLUMNS = {
+    "total_applications": Application,
+    "total_companies": Company,
+    "total_contacts": Contact,
+    "total_interviews": Interview,
+}
+
+def status_column(status: ApplicationStatus) -> str:
+    return f"status_{status.value}"
+
+COUNTER_COLUMNS = list(TOTAL_COLUMNS) + [status_column(s) for s in ApplicationStatus]
+
+def application_delta(status: Optional[ApplicationStatus], sign: int) -> Dict[str, int]:
+    """Counter changes for adding (``sign=1``) or removing (``sign=-1``) one application."""
+    delta = {"total_applications": sign}
+    if status is not None:
+        delta[status_column(ApplicationStatus(status))] = sign
+    return delta
+
+def status_change_delta(old: Optional[ApplicationStatus], new: Optional[ApplicationStatus]) -> Dict[str, int]:
+    """Counter changes for moving one application from ``old`` to ``new`` status."""
+    delta: Dict[str, int] = {}
+    if old == new:
+        return delta
+    if old is not None:
+        delta[status_column(ApplicationStatus(old))] = -1
+    if new is not None:
+        column = status_column(ApplicationStatus(new))
+        delta[column] = delta.get(column, 0) + 1
+    return delta
+
+def backdated(dates: Iterable[Optional[datetime]]) -> bool:
+    """Whether any of ``dates`` falls before the start of today (UTC)."""
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    for value in dates:
+        if value is None:
+            continue
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        if value < today:
+            return True
+    return False
+
+def adjustment(dialect_name: str, user_id: int, deltas: Optional[Dict[str, int]], history: bool = False):
+    """
+    Build a single upsert that records a write for ``user_id``: add
+    ``deltas`` to the counters and bump the data version (and the history
+    version, with ``history=True``), creating the row on first use.
+    ``deltas=None`` only creates the row if it is missing.
+    """
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    values = {column: (deltas or {}).get(column, 0) for column in COUNTER_COLUMNS}
+    if deltas is None:
+        stmt = insert(UserStats).values(user_id=user_id, **values)
+        return stmt.on_conflict_do_nothing(index_elements=[UserStats.user_id])
+    stmt = insert(UserStats).values(
+        user_id=user_id, data_version=1, history_version=int(history), modified_at=func.now(), **values
+    )
+    table = UserStats.__table__
+    changes = {column: table.c[column] + stmt.excluded[column] for column in deltas}
+    changes["data_version"] = table.c.data_version + 1
+    if history:
+        changes["history_version"] = table.c.history_version + 1
+    changes["modified_at"] = stmt.excluded.modified_at
+    return stmt.on_conflict_do_update(index_elements=[UserStats.user_id], set_=changes)
+
+async def adjust(
+    db: AsyncSession, user_id: int, *, dated: Iterable[Optional[datetime]] = (), **deltas: int
+) -> None:
+    """
+    Record a write by ``user_id`` in the session's current transaction:
+    apply counter ``deltas`` (if any) and bump the user's data version.
+    ``dated`` lists the time-series dates the write added, moved or
+    removed; any of them before today also bumps the history version.
+    """
+    await db.execute(adjustment(db.get_bind().dialect.name, user_id, deltas, backdated(dated)))
+
+async def ensure(db: AsyncSession, user_id: int) -> None:
+    """Create an all-zero counter row for ``user_id`` if it does not exist yet."""
+    await db.execute(adjustment(db.get_bind().dialect.name, user_id, None))
+
+def compute(db: Session, user_id: int) -> Dict[str, int]:
+    """
+    Recompute one user's counters from the source tables.
+
+    Takes a sync session; from async code call it through
+    ``await db.run_sync(compute, user_id)``.
+    """
+    counts = {column: 0 for column in COUNTER_COLUMNS}
+    for column, model in TOTAL_COLUMNS.items():
+        counts[column] = db.scalar(select(func.count(model.id)).where(model.user_id == user_id))
+    rows = db.execute(
+        select(Application.status, func.count(Application.id))
+        .where(Application.user_id == user_id, Application.status.is_not(None))
+        .group_by(Application.status)
+    )
+    for status, count in rows:
+        counts[status_column(status)] = count
+    return counts
+
+def _user_ids(db: Session, user_id: Optional[int]) -> List[int]:
+    if user_id is not None:
+        return [user_id]
+    return list(db.scalars(select(User.id).order_by(User.id)))
+
+def rebuild(db: Session, user_id: Optional[int] = None) -> int:
+    """Overwrite stored counters with freshly computed ones. Returns the number of users rebuilt."""
+    user_ids = _user_ids(db, user_id)
+    for uid in user_ids:
+        counts = compute(db, uid)
+        row = db.get(UserStats, uid)
+        if row is None:
+            db.add(UserStats(user_id=uid, data_version=1, history_version=1, modified_at=func.now(), **counts))
+        else:
+            for column, value in counts.items():
+                setattr(row, column, value)
+            # Rebuilds follow writes made outside the API; drop cached responses
+            row.data_version = UserStats.data_version + 1
+            row.history_version = UserStats.history_version + 1
+            row.modified_at = func.now()
+    db.commit()
+    return len(user_ids)
+
+def verify(db: Session, user_id: Optional[int] = None) -> Dict[int, Dict[str, tuple]]:
+    """
+    Compare stored counters with freshly computed ones.
+
+    Returns ``{user_id: {column: (stored, actual)}}`` for every mismatch.
+    """
+    mismatches = {}
+    for uid in _user_ids(db, user_id):
+        actual = compute(db, uid)
+        row = db.get(UserStats, uid)
+        stored = {column: getattr(row, column) if row else None for column in COUNTER_COLUMNS}
+        diff = {c: (stored[c], actual[c]) for c in COUNTER_COLUMNS if stored[c] != actual[c]}
+        if diff:
+            mismatches[uid] = diff
+    return mismatches
+
+def main():
+    import argparse
+    import sys
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(prog="python -m app.stats")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            print(f"Rebuilt counters for {rebuild(db, args.user_id)} user(s)")
+        else:
+            mismatches = verify(db, args.user_id)
+            for uid, diff in mismatches.items():
+                details = ", ".join(f"{c}: stored={s} actual={a}" for c, (s, a) in diff.items())
+                print(f"user {uid}: {details}")
+            print("Counters OK" if not mismatches else f"{len(mismatches)} user(s) out of sync")
+            sys.exit(1 if mismatches else 0)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Activity over time: applications sent, interviews held and offers received
+per day, week or month.
+
+Counts are grouped in SQL (``date()`` / ``strftime()`` on SQLite,
+``date_trunc`` elsewhere) over a ``(user_id, <date column>)`` index range,
+and the buckets without activity are filled in with zeros while walking
+the range once.
+
+A bucket that ended before today is closed: new activity lands in the open
+bucket, so a closed bucket only changes when a write touches a past date.
+Those writes bump ``user_stats.history_version`` (see ``stats.adjust``).
+Closed buckets are cached per user, metric and bucket size for as long as
+that version holds, and a request only counts the buckets the cache does
+not cover yet: the open ones, and any that closed since.
+"""
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache import TTLCache
+from app.models import Application, ApplicationStatus, Interview, StatusTransition, UserStats
+
+TIMESERIES_CACHE_SIZE = int(os.getenv("TIMESERIES_CACHE_SIZE", "1000"))
+TIMESERIES_CACHE_SECONDS = float(os.getenv("TIMESERIES_CACHE_SECONDS", "86400"))
+MAX_BUCKETS = 1000
+
+BUCKETS = ("day", "week", "month")
+# Range covered when ``from`` is not given, counting back from ``to``
+DEFAULT_BUCKETS = {"day": 30, "week": 12, "month": 12}
+
+@dataclass(frozen=True)
+class Metric:
+    model: type
+    column: str
+    # Extra conditions on the rows counted
+    where: Tuple = ()
+
+METRICS: Dict[str, Metric] = {
+    "applications": Metric(Application, "applied_date"),
+    "interviews": Metric(Interview, "scheduled_at"),
+    # When each offer arrived, from the status history
+    "offers": Metric(StatusTransition, "changed_at", (StatusTransition.to_status == ApplicationStatus.OFFER,)),
+}
+
+@dataclass
+class _Closed:
+    history_version: int
+    # Every closed bucket in [start, stop) has been counted; zeros are not stored
+    start: date
+    stop: date
+    counts: Dict[date, int] = field(default_factory=dict)
+
+_closed = TTLCache(maxsize=TIMESERIES_CACHE_SIZE, ttl=TIMESERIES_CACHE_SECONDS)
+
+def bucket_start(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())  # Mondays
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+def next_bucket(start: date, bucket: str) -> date:
+    if bucket == "week":
+        return start + timedelta(days=7)
+    if bucket == "month":
+        return (start + timedelta(days=31)).replace(day=1)
+    return start + timedelta(days=1)
+
+def bucket_count(start: date, end: date, bucket: str) -> int:
+    """Number of buckets from the one containing ``start`` to the one containing ``end``."""
+    if bucket == "month":
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    days = (bucket_start(end, bucket) - bucket_start(start, bucket)).days
+    return days // (7 if bucket == "week" else 1) + 1
+
+def default_from(to: date, bucket: str) -> date:
+    start = bucket_start(to, bucket)
+    for _ in range(DEFAULT_BUCKETS[bucket] - 1):
+        start = bucket_start(start - timedelta(days=1), bucket)
+    return start
+
+def _bucket_expression(dialect_name: str, column, bucket: str):
+    """The start of ``column``'s bucket as ``YYYY-MM-DD`` text."""
+    if dialect_name == "sqlite":
+        if bucket == "week":
+            return func.date(column, "weekday 0", "-6 days")
+        if bucket == "month":
+            return func.strftime("%Y-%m-01", column)
+        return func.date(column)
+    return func.to_char(func.date_trunc(bucket, column), "YYYY-MM-DD")
+
+async def _count(
+    db: AsyncSession, user_id: int, metric: Metric, bucket: str, start: date, stop: date
+) -> Dict[date, int]:
+    """Non-zero counts of the buckets in [start, stop)."""
+    column = getattr(metric.model, metric.column)
+    bucket_column = _bucket_expression(db.bind.dialect.name, column, bucket).label("bucket")
+    rows = await db.execute(
+        select(bucket_column, func.count())
+        .where(
+            metric.model.user_id == user_id, *metric.where,
+            column >= datetime.combine(start, datetime.min.time()),
+            column < datetime.combine(stop, datetime.min.time()),
+        )
+        .group_by(bucket_column)
+    )
+    return {date.fromisoformat(key): count for key, count in rows}
+
+async def series(
+    db: AsyncSession, user_id: int, metric_name: str, bucket: str, start: date, end: date
+) -> List[Tuple[date, int]]:
+    """
+    ``(bucket start, count)`` for every bucket from the one containing
+    ``start`` to the one containing ``end``, zeros included.
+    """
+    metric = METRICS[metric_name]
+    first, stop = bucket_start(start, bucket), next_bucket(bucket_start(end, bucket), bucket)
+    open_from = bucket_start(datetime.utcnow().date(), bucket)
+
+    history_version = await db.scalar(
+        select(UserStats.history_version).where(UserStats.user_id == user_id)
+    ) or 0
+    key = (user_id, metric_name, bucket)
+    cached: Optional[_Closed] = _closed.get(key)
+    if cached is not None and cached.history_version != history_version:
+        cached = None
+
+    # Count what the cache lacks: before it, and from its end on (buckets
+    # closed since plus the open ones). Both ranges adjoin the cached one,
+    # so the closed buckets covered stay one contiguous range.
+    if cached is None:
+        ranges = [(first, stop)]
+    else:
+        ranges = [(first, cached.start)] if first < cached.start else []
+        if cached.stop < stop:
+            ranges.append((cached.stop, stop))
+    fresh: Dict[date, int] = {}
+    for range_start, range_stop in ranges:
+        fresh.update(await _count(db, user_id, metric, bucket, range_start, range_stop))
+
+    covered = (first, min(stop, open_from)) if cached is None else (
+        min(first, cached.start), max(cached.stop, min(stop, open_from))
+    )
+    if covered[0] < covered[1] and (cached is None or covered != (cached.start, cached.stop)):
+        closed_counts = {day: n for day, n in fresh.items() if day < open_from}
+        if cached is not None:
+            closed_counts.update(cached.counts)
+        _closed.set(key, _Closed(history_version, *covered, closed_counts))
+
+    past = cached.counts if cached is not None else {}
+    points = []
+    day = first
+    while day < stop:
+        points.append((day, fresh[day] if day in fresh else past.get(day, 0)))
+        day = next_bucket(day, bucket)
+    return points
@@ -0,0 +1,90 @@
+"""
+Rows per second when loading applications one POST at a time versus the
+``/bulk`` endpoint and a streamed CSV upload to ``/api/import``.
+
+Usage (from the backend directory):
+    python -m benchmarks.bulk_import [--rows 50000] [--single-rows 2000]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='jobhunt-bench-'), 'bench.db')}"
+)
+
+import httpx
+from app.main import app
+
+STATUSES = ["saved", "applied", "phone_screen", "interview", "rejected"]
+
+def application_row(i: int) -> dict:
+    return {
+        "job_title": f"Engineer {i}",
+        "company_name": f"Company {i % 50}",
+        "status": STATUSES[i % len(STATUSES)],
+        "location": "Remote",
+    }
+
+def csv_payload(rows: int) -> bytes:
+    header = "job_title,company_name,status,location\n"
+    body = "".join(
+        "{job_title},{company_name},{status},{location}\n".format(**application_row(i)) for i in range(rows)
+    )
+    return (header + body).encode()
+
+async def login(client: httpx.AsyncClient):
+    credentials = {"email": "bulk@example.com", "password": "benchmark-password"}
+    await client.post("/api/auth/register", json={**credentials, "full_name": "Bulk"})
+    response = await client.post(
+        "/api/auth/login", data={"username": credentials["email"], "password": credentials["password"]}
+    )
+    response.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+async def run(rows: int, single_rows: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        await login(client)
+        response = await client.post("/api/companies/bulk", json=[{"name": f"Company {i}"} for i in range(50)])
+        response.raise_for_status()
+        company_ids = dict(zip((f"Company {i}" for i in range(50)), response.json()["ids"]))
+
+        results = {}
+
+        start = time.perf_counter()
+        for i in range(single_rows):
+            row = application_row(i)
+            row["company_id"] = company_ids[row.pop("company_name")]
+            (await client.post("/api/applications/", json=row)).raise_for_status()
+        results["POST per row"] = (single_rows, time.perf_counter() - start)
+
+        payload = [application_row(i) for i in range(rows)]
+        start = time.perf_counter()
+        response = await client.post("/api/applications/bulk", json=payload)
+        response.raise_for_status()
+        assert response.json()["created"] == rows, response.json()["errors"][:5]
+        results["POST /bulk (JSON)"] = (rows, time.perf_counter() - start)
+
+        data = csv_payload(rows)
+        start = time.perf_counter()
+        response = await client.post("/api/import/applications", files={"file": ("apps.csv", data)})
+        response.raise_for_status()
+        assert response.json()["created"] == rows, response.json()["errors"][:5]
+        results["POST /api/import (CSV)"] = (rows, time.perf_counter() - start)
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000, help="rows for the bulk and import runs")
+    parser.add_argument("--single-rows", type=int, default=2000, help="rows for the one-POST-per-row run")
+    args = parser.parse_args()
+
+    for name, (count, seconds) in asyncio.run(run(args.rows, args.single_rows)).items():
+        print(f"{name:<24} {count:>7} rows  {seconds:7.2f}s  {count / seconds:9.0f} rows/s")
+
+if __name__ == "__main__":
+    main()
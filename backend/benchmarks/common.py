@@ -0,0 +1,122 @@
+"""Shared helpers for the benchmark scripts: throwaway databases and bulk fixture data."""
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+import uvicorn
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.database import to_async_url
+from app.models import Application, ApplicationStatus, Company, Contact, Interview, User
+
+STATUSES = [s.name for s in ApplicationStatus]
+
+def temp_engine(name: str = "bench.db"):
+    """Create an engine on a fresh SQLite file in a temporary directory."""
+    path = os.path.join(tempfile.mkdtemp(prefix="jobhunt-bench-"), name)
+    return create_engine(f"sqlite:///{path}")
+
+def async_sessionmaker_for(engine):
+    """Build an AsyncSession factory on the same database as a sync ``engine``."""
+    async_engine = create_async_engine(to_async_url(engine.url.render_as_string(hide_password=False)))
+    return async_sessionmaker(async_engine, expire_on_commit=False)
+
+def populate(engine, users: int, applications_per_user: int, seed: int = 42):
+    """
+    Bulk insert ``users`` users, each with ``applications_per_user``
+    applications plus proportional companies, contacts and interviews.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    companies_per_user = max(1, applications_per_user // 10)
+
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": u, "email": f"user{u}@example.com", "hashed_password": "x", "full_name": f"User {u}"}
+            for u in range(1, users + 1)
+        ])
+        company_id = application_id = 0
+        for u in range(1, users + 1):
+            first_company = company_id + 1
+            company_rows = []
+            for _ in range(companies_per_user):
+                company_id += 1
+                company_rows.append({
+                    "id": company_id, "user_id": u, "name": f"Company {rng.randrange(10**6):06d}",
+                    "created_at": now - timedelta(days=rng.randrange(730)),
+                })
+            conn.execute(Company.__table__.insert(), company_rows)
+
+            application_rows, interview_rows, contact_rows = [], [], []
+            for _ in range(applications_per_user):
+                application_id += 1
+                created = now - timedelta(minutes=rng.randrange(730 * 24 * 60))
+                application_rows.append({
+                    "id": application_id, "user_id": u,
+                    "company_id": rng.randint(first_company, company_id),
+                    "job_title": f"Engineer {rng.randrange(1000)}",
+                    "status": rng.choice(STATUSES),
+                    "created_at": created,
+                })
+                if rng.random() < 0.3:
+                    interview_rows.append({
+                        "application_id": application_id, "user_id": u,
+                        "scheduled_at": created + timedelta(days=rng.randrange(-30, 60)),
+                        "created_at": created,
+                    })
+                if rng.random() < 0.2:
+                    contact_rows.append({
+                        "user_id": u, "company_id": rng.randint(first_company, company_id),
+                        "name": f"Contact {rng.randrange(10**6):06d}", "created_at": created,
+                    })
+            conn.execute(Application.__table__.insert(), application_rows)
+            if interview_rows:
+                conn.execute(Interview.__table__.insert(), interview_rows)
+            if contact_rows:
+                conn.execute(Contact.__table__.insert(), contact_rows)
+
+def time_async_call(fn, repeat: int = 20):
+    """Like time_call, for a coroutine function; runs on a fresh event loop."""
+    async def run():
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+    return asyncio.run(run())
+
+def time_call(fn, repeat: int = 20):
+    """Run ``fn`` ``repeat`` times and return the median wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+class BackgroundServer:
+    """Run a uvicorn server on an ephemeral port in a background thread."""
+
+    def __init__(self, app):
+        self.server = uvicorn.Server(uvicorn.Config(app, port=0, log_level="warning", lifespan="off"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        port = self.server.servers[0].sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
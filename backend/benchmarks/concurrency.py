@@ -0,0 +1,141 @@
+"""
+Throughput and event-loop responsiveness under many parallel clients,
+comparing the original handler pattern (sync Session inside ``async def``)
+with the AsyncSession routers.
+
+Both variants serve ``GET /api/applications/`` from the same database under
+a real uvicorn server. While the clients hammer that route, a probe polls
+``/api/health``; its latency shows how long the event loop is blocked.
+Client and server share one process, so compare the two rows rather than
+reading the absolute numbers as capacity. Results move a lot with the
+number of cores and between runs; run it a few times before drawing
+conclusions. Requests that fail at the transport level are counted rather
+than ending the run.
+
+Usage (from the backend directory):
+    python -m benchmarks.concurrency [--clients 50] [--seconds 10]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='jobhunt-bench-'), 'bench.db')}"
+)
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from app import migrations, stats
+from app.auth import create_access_token, get_current_user_id
+from app.database import SQLALCHEMY_DATABASE_URL, SessionLocal, engine
+from app.main import app as current_app
+from app.models import Application
+from benchmarks.common import BackgroundServer, percentile, populate
+
+def build_legacy_app(clients: int) -> FastAPI:
+    # With the default pool (5 + 10 overflow) this pattern deadlocks under
+    # 50 clients: handlers block the loop waiting for a connection that is
+    # only returned by teardown code which needs the loop. Size the pool so
+    # the comparison measures throughput rather than that failure mode.
+    legacy_engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=clients + 5,
+    )
+    LegacySession = sessionmaker(autocommit=False, autoflush=False, bind=legacy_engine)
+
+    def get_db():
+        db = LegacySession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    legacy = FastAPI()
+
+    @legacy.get("/api/applications/")
+    async def get_applications(
+        skip: int = 0,
+        limit: int = 100,
+        db: Session = Depends(get_db),
+        current_user_id: int = Depends(get_current_user_id)
+    ):
+        return db.query(Application).filter(Application.user_id == current_user_id).order_by(
+            Application.created_at.desc()
+        ).offset(skip).limit(limit).all()
+
+    @legacy.get("/api/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return legacy
+
+async def drive(base_url: str, token: str, clients: int, seconds: float):
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=clients + 1)
+    latencies, probe_latencies = [], []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        async def worker(n: int):
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get("/api/applications/", params={"skip": (n * 100) % 5000})
+                except httpx.TransportError:
+                    errors += 1
+                    continue
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        async def probe():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    await client.get("/api/health")
+                except httpx.TransportError:
+                    errors += 1
+                    continue
+                probe_latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(probe(), *(worker(n) for n in range(clients)))
+
+    return {
+        "requests/s": len(latencies) / seconds,
+        "p50 ms": statistics.median(latencies),
+        "p99 ms": percentile(latencies, 99),
+        "health p99 ms": percentile(probe_latencies, 99),
+        "errors": errors,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--applications", type=int, default=20_000)
+    args = parser.parse_args()
+
+    migrations.upgrade(engine)
+    if not SessionLocal().query(Application).first():
+        populate(engine, users=1, applications_per_user=args.applications)
+        with SessionLocal() as db:
+            stats.rebuild(db)
+    token = create_access_token({"sub": "user1@example.com", "user_id": 1})
+
+    print(f"{args.clients} clients for {args.seconds:.0f}s against {args.applications} applications\n")
+    for name, target in [("sync Session (before)", build_legacy_app(args.clients)), ("AsyncSession (after)", current_app)]:
+        with BackgroundServer(target) as base_url:
+            result = asyncio.run(drive(base_url, token, args.clients, args.seconds))
+        print(f"{name:<24} " + "  ".join(f"{k} {v:8.1f}" for k, v in result.items()))
+
+if __name__ == "__main__":
+    main()
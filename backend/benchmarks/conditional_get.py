@@ -0,0 +1,66 @@
+"""
+Latency and payload of a full response versus a 304 revalidation with
+``If-None-Match`` for the application list and the dashboard.
+
+Usage (from the backend directory):
+    python -m benchmarks.conditional_get [--applications 10000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='jobhunt-bench-'), 'bench.db')}"
+)
+
+import httpx
+from app import stats
+from app.auth import create_access_token
+from app.database import SessionLocal, engine
+from app.main import app
+from benchmarks.common import populate
+
+ENDPOINTS = {
+    "applications page": ("/api/applications/", {"limit": 100}),
+    "dashboard": ("/api/dashboard/stats", {}),
+}
+
+async def measure(path: str, params: dict, repeat: int):
+    token = create_access_token({"sub": "user1@example.com", "user_id": 1})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}
+    ) as client:
+        etag = (await client.get(path, params=params)).headers["etag"]
+        results = {}
+        for name, headers in [("200", {}), ("304", {"If-None-Match": etag})]:
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                response = await client.get(path, params=params, headers=headers)
+                samples.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == int(name), response.status_code
+            results[name] = (statistics.median(samples), len(response.content))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--applications", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    populate(engine, users=1, applications_per_user=args.applications)
+    with SessionLocal() as db:
+        stats.rebuild(db)
+
+    print(f"{'endpoint':<18} {'200 ms':>8} {'200 bytes':>10} {'304 ms':>8} {'304 bytes':>10}")
+    for name, (path, params) in ENDPOINTS.items():
+        results = asyncio.run(measure(path, params, args.repeat))
+        (full_ms, full_size), (cond_ms, cond_size) = results["200"], results["304"]
+        print(f"{name:<18} {full_ms:>8.2f} {full_size:>10} {cond_ms:>8.2f} {cond_size:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compare the dashboard stats query strategy against the original
+seven-query implementation at 10k and 100k applications per user.
+
+Usage (from the backend directory):
+    python -m benchmarks.dashboard [--sizes 10000 100000]
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func
+from sqlalchemy.orm import sessionmaker
+from app import migrations, stats
+from app.models import Application, ApplicationStatus, Company, Contact, Interview
+from app.routers.dashboard import build_dashboard_stats
+from app.schemas import ApplicationResponse, DashboardStats, InterviewResponse
+from benchmarks.common import async_sessionmaker_for, populate, temp_engine, time_async_call, time_call
+
+def legacy_dashboard_stats(db, user_id: int) -> DashboardStats:
+    """The dashboard as originally written: one query per number."""
+    total_applications = db.query(Application).filter(Application.user_id == user_id).count()
+    status_counts = db.query(Application.status, func.count(Application.id)).filter(
+        Application.user_id == user_id
+    ).group_by(Application.status).all()
+    applications_by_status = {status.value: 0 for status in ApplicationStatus}
+    for status, count in status_counts:
+        applications_by_status[status.value] = count
+    upcoming_cutoff = datetime.utcnow() + timedelta(days=7)
+    upcoming_interviews = db.query(Interview).filter(and_(
+        Interview.user_id == user_id,
+        Interview.scheduled_at >= datetime.utcnow(),
+        Interview.scheduled_at <= upcoming_cutoff
+    )).count()
+    total_companies = db.query(Company).filter(Company.user_id == user_id).count()
+    total_contacts = db.query(Contact).filter(Contact.user_id == user_id).count()
+    recent_applications = db.query(Application).filter(
+        Application.user_id == user_id
+    ).order_by(Application.created_at.desc()).limit(5).all()
+    recent_interviews = db.query(Interview).filter(and_(
+        Interview.user_id == user_id, Interview.scheduled_at >= datetime.utcnow()
+    )).order_by(Interview.scheduled_at).limit(5).all()
+    return DashboardStats(
+        total_applications=total_applications,
+        applications_by_status=applications_by_status,
+        upcoming_interviews=upcoming_interviews,
+        total_companies=total_companies,
+        total_contacts=total_contacts,
+        recent_applications=[ApplicationResponse.model_validate(a) for a in recent_applications],
+        recent_interviews=[InterviewResponse.model_validate(i) for i in recent_interviews],
+    )
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000],
+                        help="applications per user")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'applications':>12}  {'legacy ms':>10}  {'current ms':>10}  speedup")
+    for size in args.sizes:
+        engine = temp_engine()
+        migrations.upgrade(engine)
+        populate(engine, users=2, applications_per_user=size)
+        Session = sessionmaker(bind=engine)
+        AsyncSession = async_sessionmaker_for(engine)
+
+        async def current_stats():
+            async with AsyncSession() as db:
+                return await build_dashboard_stats(db, 1)
+
+        with Session() as db:
+            stats.rebuild(db)
+            assert legacy_dashboard_stats(db, 1) == asyncio.run(current_stats()), "outputs differ"
+            legacy = time_call(lambda: legacy_dashboard_stats(db, 1), args.repeat)
+        current = time_async_call(current_stats, args.repeat)
+        print(f"{size:>12}  {legacy:>10.2f}  {current:>10.2f}  {legacy / current:6.2f}x")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
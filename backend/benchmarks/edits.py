@@ -0,0 +1,106 @@
+"""
+Edit throughput: a single ``UPDATE ... RETURNING`` (``app.crud``) versus
+loading the row, setting attributes, committing and refreshing it, and the
+edits and creates per second the API sustains through the ASGI app.
+
+Usage (from the backend directory):
+    python -m benchmarks.edits [--applications 10000] [--edits 2000]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='jobhunt-bench-'), 'bench.db')}"
+)
+
+import httpx
+from sqlalchemy import select
+from app import crud, stats
+from app.auth import create_access_token
+from app.database import AsyncSessionLocal, SessionLocal, engine
+from app.main import app
+from app.models import Application, ApplicationStatus, Company
+from benchmarks.common import populate
+
+USER_ID = 1
+
+async def orm_edit(db, application_id: int, values: dict):
+    application = await db.scalar(
+        select(Application).where(Application.id == application_id, Application.user_id == USER_ID)
+    )
+    for field, value in values.items():
+        setattr(application, field, value)
+    await db.commit()
+    await db.refresh(application)
+    return application
+
+async def returning_edit(db, application_id: int, values: dict):
+    row = await crud.update_row(db, Application, application_id, USER_ID, values)
+    await db.commit()
+    return row
+
+async def data_layer(edit, ids, edits: int) -> float:
+    """Edits per second for ``edit`` cycling over ``ids``."""
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        for n in range(edits):
+            await edit(db, ids[n % len(ids)], {"notes": f"edit {n}"})
+        return edits / (time.perf_counter() - start)
+
+async def _first_company() -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(Company.id).where(Company.user_id == USER_ID).order_by(Company.id).limit(1))
+
+async def api(ids, edits: int):
+    """Requests per second for each write route."""
+    statuses = list(ApplicationStatus)
+    company_id = await _first_company()
+    requests = {
+        "PUT application (notes)": lambda n: ("PUT", f"/api/applications/{ids[n % len(ids)]}", {"notes": f"edit {n}"}),
+        "PUT application (status)": lambda n: (
+            "PUT", f"/api/applications/{ids[n % len(ids)]}", {"status": statuses[n % len(statuses)].value}
+        ),
+        "PUT company": lambda n: ("PUT", f"/api/companies/{company_id}", {"notes": f"edit {n}"}),
+        "POST application": lambda n: (
+            "POST", "/api/applications/", {"job_title": f"Bench {n}", "company_id": company_id}
+        ),
+    }
+    token = create_access_token({"sub": f"user{USER_ID}@example.com", "user_id": USER_ID})
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}
+    ) as client:
+        for name, build in requests.items():
+            start = time.perf_counter()
+            for n in range(edits):
+                method, path, body = build(n)
+                response = await client.request(method, path, json=body)
+                assert response.status_code in (200, 201), response.text
+            results[name] = edits / (time.perf_counter() - start)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--applications", type=int, default=10_000)
+    parser.add_argument("--edits", type=int, default=2000)
+    args = parser.parse_args()
+
+    populate(engine, users=1, applications_per_user=args.applications)
+    with SessionLocal() as db:
+        stats.rebuild(db)
+        ids = list(db.scalars(select(Application.id).where(Application.user_id == USER_ID).limit(500)))
+
+    print(f"{'data layer':<28} {'edits/s':>10}")
+    for name, edit in [("select + setattr + refresh", orm_edit), ("UPDATE ... RETURNING", returning_edit)]:
+        print(f"{name:<28} {asyncio.run(data_layer(edit, ids, args.edits)):>10.0f}")
+
+    print(f"\n{'API route':<28} {'req/s':>10}")
+    for name, rate in asyncio.run(api(ids, args.edits)).items():
+        print(f"{name:<28} {rate:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Drive every API route in-process through the ASGI app and report latency
+percentiles and rows/sec per endpoint.
+
+The database is filled by ``generate_data.generate`` (or an existing
+DATABASE_URL is reused with ``--no-generate``). Results are saved as JSON;
+pass an earlier file to ``--compare`` to print the change per endpoint.
+With ``QUERY_DIAGNOSTICS=1`` the slow-query and N+1 findings of the run are
+printed and saved alongside the timings (see ``app.diagnostics``).
+
+Usage (from the backend directory):
+    python -m benchmarks.endpoints [--users 5] [--applications 2000] [--repeat 50]
+    python -m benchmarks.endpoints --compare benchmarks/results/endpoints-<time>.json
+    QUERY_DIAGNOSTICS=1 python -m benchmarks.endpoints --fail-on-n-plus-one
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='jobhunt-bench-'), 'bench.db')}"
+)
+
+import httpx
+from sqlalchemy import select
+import generate_data
+from app import diagnostics
+from app.auth import create_access_token
+from app.database import SQLALCHEMY_DATABASE_URL, SessionLocal, engine
+from app.main import app
+from app.models import Application, Company, Contact, Interview, User
+from benchmarks.common import percentile
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+# entity -> name of the id parameter in its detail routes
+ENTITIES = {
+    "applications": "application_id",
+    "companies": "company_id",
+    "contacts": "contact_id",
+    "interviews": "interview_id",
+}
+
+@dataclass
+class Fixture:
+    """Ids owned by the benchmark user, and rows created during the run for the DELETE routes."""
+    user_id: int
+    email: str
+    ids: Dict[str, int]
+    created: Dict[str, List[int]] = field(default_factory=lambda: {entity: [] for entity in ENTITIES})
+    # One list of ids per /bulk request, removed again by the bulk DELETE routes
+    bulk_created: Dict[str, List[List[int]]] = field(default_factory=lambda: {entity: [] for entity in ENTITIES})
+    run: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+
+@dataclass
+class Endpoint:
+    method: str
+    route: str                              # path template, as listed in the OpenAPI schema
+    request: Callable[[int], dict]          # iteration -> httpx request keyword arguments
+    repeat: Optional[int] = None            # cap for slow endpoints (bcrypt, full export)
+    label: str = ""
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}{self.label}"
+
+def load_fixture(email: str) -> Fixture:
+    with SessionLocal() as db:
+        user_id = db.scalar(select(User.id).where(User.email == email))
+        if user_id is None:
+            sys.exit(f"No user {email} in {SQLALCHEMY_DATABASE_URL}")
+        ids = {
+            model.__tablename__: db.scalar(select(model.id).where(model.user_id == user_id).order_by(model.id))
+            for model in (Application, Company, Contact, Interview)
+        }
+    missing = [entity for entity, row_id in ids.items() if row_id is None]
+    if missing:
+        sys.exit(f"{email} has no {', '.join(missing)}; generate more data")
+    return Fixture(user_id=user_id, email=email, ids=ids)
+
+def build_endpoints(fx: Fixture, page_size: int) -> List[Endpoint]:
+    ids = fx.ids
+    tomorrow = (datetime.utcnow() + timedelta(days=1)).isoformat()
+    payloads = {
+        "applications": lambda i: {"job_title": f"Bench Engineer {i}", "company_id": ids["companies"], "status": "applied"},
+        "companies": lambda i: {"name": f"Bench Company {i}", "industry": "Technology"},
+        "contacts": lambda i: {"name": f"Bench Contact {i}", "company_id": ids["companies"]},
+        "interviews": lambda i: {"application_id": ids["applications"], "scheduled_at": tomorrow},
+    }
+    csv_rows = "name,industry\n" + "".join(f"Imported {n},Technology\n" for n in range(100))
+
+    endpoints = [
+        Endpoint("GET", "/", lambda i: {"url": "/"}),
+        Endpoint("GET", "/api/health", lambda i: {"url": "/api/health"}),
+        Endpoint("GET", "/api/metrics", lambda i: {"url": "/api/metrics"}),
+        Endpoint("GET", "/api/auth/me", lambda i: {"url": "/api/auth/me"}),
+        Endpoint("GET", "/api/dashboard/stats", lambda i: {"url": "/api/dashboard/stats"}),
+        Endpoint("GET", "/api/analytics/funnel", lambda i: {"url": "/api/analytics/funnel"}),
+        Endpoint("GET", "/api/analytics/stage-durations", lambda i: {"url": "/api/analytics/stage-durations"}),
+        Endpoint("GET", "/api/analytics/timeseries", lambda i: {
+            "url": "/api/analytics/timeseries", "params": {"metric": "applications", "bucket": "month", "from": "2000-01-01"}
+        }),
+        Endpoint("GET", "/api/search", lambda i: {"url": "/api/search", "params": {"q": "platform"}}),
+        Endpoint("GET", "/api/interviews/calendar", lambda i: {
+            "url": "/api/interviews/calendar", "params": {"from": (date.today() - timedelta(days=365)).isoformat()},
+        }),
+        Endpoint("GET", "/api/interviews/calendar.ics", lambda i: {"url": "/api/interviews/calendar.ics"}),
+    ]
+    for entity, id_param in ENTITIES.items():
+        base, key = f"/api/{entity}/", f"{{{id_param}}}"
+        endpoints += [
+            Endpoint("GET", base, lambda i, base=base: {"url": base, "params": {"limit": page_size}}),
+            Endpoint("GET", base + key, lambda i, base=base, entity=entity: {"url": f"{base}{ids[entity]}"}),
+            Endpoint("POST", base, lambda i, base=base, entity=entity: {"url": base, "json": payloads[entity](i)}),
+            Endpoint("PUT", base + key, lambda i, base=base, entity=entity: {
+                "url": f"{base}{ids[entity]}", "json": {"notes": f"updated {i}"},
+            }),
+            Endpoint("POST", base + "bulk", lambda i, base=base, entity=entity: {
+                "url": base + "bulk", "json": [payloads[entity](n) for n in range(100)],
+            }),
+        ]
+    endpoints += [
+        Endpoint("GET", "/api/applications/", lambda i: {
+            "url": "/api/applications/", "params": {"limit": page_size, "expand": "company"},
+        }, label=" ?expand=company"),
+        Endpoint("GET", "/api/applications/", lambda i: {
+            "url": "/api/applications/", "params": {"limit": page_size, "fields": "job_title,status,created_at"},
+        }, label=" ?fields="),
+        Endpoint("POST", "/api/import/{entity}", lambda i: {
+            "url": "/api/import/companies", "files": {"file": ("companies.csv", csv_rows, "text/csv")},
+        }),
+        Endpoint("GET", "/api/export", lambda i: {"url": "/api/export"}, repeat=3),
+        # A company, an application at it and an interview, in one transaction
+        Endpoint("POST", "/api/batch/", lambda i: {"url": "/api/batch/", "json": {"operations": [
+            {"method": "create", "entity": "companies", "ref": "company", "data": payloads["companies"](i)},
+            {"method": "create", "entity": "applications", "ref": "application", "data": {
+                **payloads["applications"](i), "company_id": "$company",
+            }},
+            {"method": "create", "entity": "interviews", "data": {
+                **payloads["interviews"](i), "application_id": "$application",
+            }},
+        ]}}),
+    ]
+    # Deletes remove the rows the POST endpoints above created
+    for entity, id_param in ENTITIES.items():
+        base = f"/api/{entity}/"
+        endpoints.append(Endpoint("DELETE", f"{base}{{{id_param}}}", lambda i, base=base, entity=entity: {
+            "url": f"{base}{fx.created[entity].pop()}",
+        }))
+        endpoints.append(Endpoint("DELETE", base, lambda i, base=base, entity=entity: {
+            "url": base, "params": {"ids": ",".join(map(str, fx.bulk_created[entity].pop()))},
+        }))
+    endpoints += [
+        Endpoint("POST", "/api/auth/register", lambda i: {"url": "/api/auth/register", "json": {
+            "email": f"bench-{fx.run}-{i}@example.com", "password": generate_data.DEFAULT_PASSWORD,
+        }}, repeat=5),
+        Endpoint("POST", "/api/auth/login", lambda i: {"url": "/api/auth/login", "data": {
+            "username": fx.email, "password": generate_data.DEFAULT_PASSWORD,
+        }}, repeat=5),
+    ]
+    return endpoints
+
+def count_rows(response: httpx.Response) -> int:
+    """Records returned or written by one response."""
+    content_type = response.headers.get("content-type", "")
+    if response.status_code == 204 or not response.content:
+        return 1
+    if content_type.startswith("application/json"):
+        body = response.json()
+        if isinstance(body, list):
+            return len(body)
+        if isinstance(body, dict) and "results" in body:
+            return len(body["results"])
+        if isinstance(body, dict) and "interviews" in body:
+            return len(body["interviews"])
+        return body.get("created", body.get("deleted", 1)) if isinstance(body, dict) else 1
+    if content_type.startswith("text/calendar"):
+        return response.content.count(b"BEGIN:VEVENT")
+    lines = response.content.count(b"\n")
+    return lines - 1 if content_type.startswith("text/csv") else lines
+
+async def run_endpoint(client: httpx.AsyncClient, fx: Fixture, endpoint: Endpoint, repeat: int) -> dict:
+    repeat = min(repeat, endpoint.repeat or repeat)
+    if endpoint.method == "GET":
+        (await client.request("GET", **endpoint.request(-1))).raise_for_status()  # warm caches
+    samples, rows = [], 0
+    for i in range(repeat):
+        kwargs = endpoint.request(i)
+        start = time.perf_counter()
+        response = await client.request(endpoint.method, **kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        rows += count_rows(response)
+        if endpoint.method == "POST" and response.status_code == 201:
+            entity = endpoint.route.strip("/").split("/")[1]
+            if entity in fx.created:
+                fx.created[entity].append(response.json()["id"])
+        elif endpoint.method == "POST" and endpoint.route.endswith("/bulk"):
+            fx.bulk_created[endpoint.route.strip("/").split("/")[1]].append(response.json()["ids"])
+    elapsed = sum(samples) / 1000
+    return {
+        "method": endpoint.method,
+        "route": endpoint.route,
+        "requests": repeat,
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "mean_ms": round(sum(samples) / len(samples), 3),
+        "rows": rows,
+        "rows_per_sec": round(rows / elapsed, 1) if elapsed else None,
+    }
+
+async def run(fx: Fixture, endpoints: List[Endpoint], repeat: int) -> Dict[str, dict]:
+    token = create_access_token({"sub": fx.email, "user_id": fx.user_id})
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}
+    ) as client:
+        for endpoint in endpoints:
+            results[endpoint.name] = await run_endpoint(client, fx, endpoint, repeat)
+    return results
+
+def uncovered_routes(endpoints: List[Endpoint]) -> List[str]:
+    covered = {(e.method, e.route) for e in endpoints}
+    return [
+        f"{method.upper()} {path}"
+        for path, operations in app.openapi()["paths"].items()
+        for method in operations
+        if (method.upper(), path) not in covered
+    ]
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results: Dict[str, dict], baseline: Optional[Dict[str, dict]]):
+    header = f"{'endpoint':<48} {'n':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rows/s':>10}"
+    if baseline:
+        header += f" {'p50 vs base':>12}"
+    print(header)
+    for name, r in results.items():
+        line = (
+            f"{name:<48} {r['requests']:>4} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+            f"{r['p99_ms']:>9.2f} {r['rows_per_sec'] or 0:>10,.0f}"
+        )
+        before = (baseline or {}).get(name)
+        if before and before["p50_ms"]:
+            line += f" {(r['p50_ms'] / before['p50_ms'] - 1) * 100:>+11.1f}%"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--companies", type=int, default=100, help="per user")
+    parser.add_argument("--applications", type=int, default=2000, help="per user")
+    parser.add_argument("--contacts", type=int, default=300, help="per user")
+    parser.add_argument("--interviews", type=int, default=500, help="per user")
+    parser.add_argument("--no-generate", action="store_true", help="benchmark the data already in DATABASE_URL")
+    parser.add_argument("--email", default="user1@example.com", help="user to run the requests as")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/endpoints-<time>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument(
+        "--fail-on-n-plus-one", action="store_true",
+        help="exit with status 1 if QUERY_DIAGNOSTICS found an N+1 pattern",
+    )
+    args = parser.parse_args()
+
+    dataset = None
+    if not args.no_generate:
+        dataset = generate_data.generate(
+            engine, users=args.users, companies=args.companies, applications=args.applications,
+            contacts=args.contacts, interviews=args.interviews,
+        )
+        print(", ".join(f"{count} {table}" for table, count in dataset.items()), "\n")
+
+    fx = load_fixture(args.email)
+    endpoints = build_endpoints(fx, args.page_size)
+    results = asyncio.run(run(fx, endpoints, args.repeat))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+    missing = uncovered_routes(endpoints)
+    if missing:
+        print(f"\nnot benchmarked: {', '.join(missing)}")
+
+    findings = diagnostics.report.to_dict() if diagnostics.ENABLED else None
+    if findings:
+        print(f"\n{len(findings['slow_queries'])} slow statement shapes (>= {diagnostics.SLOW_QUERY_MS:g} ms)")
+        for entry in findings["n_plus_one"]:
+            print(f"N+1 in {entry['route']}: {entry['max_repeats']}x {entry['statement'][:100]}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"endpoints-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "database": engine.url.get_backend_name(),
+                "dataset": dataset,
+                "page_size": args.page_size,
+                "repeat": args.repeat,
+            },
+            "results": results,
+            "diagnostics": findings,
+        }, f, indent=2, default=str)
+    print(f"\nsaved {output}")
+    if args.fail_on_n_plus_one and findings and findings["n_plus_one"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
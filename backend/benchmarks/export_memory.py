@@ -0,0 +1,67 @@
+"""
+Peak Python memory while exporting a user's data: loading every row with
+``.all()`` (what paging through the list endpoints amounts to) versus the
+chunked ``/api/export`` stream.
+
+Usage (from the backend directory):
+    python -m benchmarks.export_memory [--sizes 10000 100000]
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from sqlalchemy import select
+from app import migrations
+from app.routers import export
+from app.schemas import ApplicationResponse, CompanyResponse, ContactResponse, InterviewResponse
+from app.models import Application, Company, Contact, Interview
+from benchmarks.common import async_sessionmaker_for, populate, temp_engine
+
+LEGACY_EXPORTS = [
+    (Company, CompanyResponse),
+    (Application, ApplicationResponse),
+    (Contact, ContactResponse),
+    (Interview, InterviewResponse),
+]
+
+async def legacy_export(session_factory, user_id: int) -> int:
+    written = 0
+    async with session_factory() as db:
+        for model, schema in LEGACY_EXPORTS:
+            rows = (await db.scalars(select(model).where(model.user_id == user_id))).all()
+            written += sum(len(schema.model_validate(row).model_dump_json()) + 1 for row in rows)
+    return written
+
+async def streamed_export(user_id: int) -> int:
+    return sum([len(chunk) async for chunk in export.stream_ndjson(user_id, list(export.EXPORTS))])
+
+def measure(coro_fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    written = asyncio.run(coro_fn())
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return written, elapsed, peak / 2**20
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000],
+                        help="applications per user")
+    args = parser.parse_args()
+
+    print(f"{'applications':>12}  {'legacy MiB':>10}  {'stream MiB':>10}  {'legacy s':>8}  {'stream s':>8}")
+    for size in args.sizes:
+        engine = temp_engine()
+        migrations.upgrade(engine)
+        populate(engine, users=1, applications_per_user=size)
+        session_factory = async_sessionmaker_for(engine)
+        export.AsyncSessionLocal = session_factory
+
+        _, legacy_s, legacy_mib = measure(lambda: legacy_export(session_factory, 1))
+        _, stream_s, stream_mib = measure(lambda: streamed_export(1))
+        print(f"{size:>12}  {legacy_mib:>10.1f}  {stream_mib:>10.1f}  {legacy_s:>8.2f}  {stream_s:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Login throughput versus latency of other endpoints during a login burst,
+comparing bcrypt on the event loop (the original login handler) with the
+bounded password worker pool.
+
+Usage (from the backend directory):
+    python -m benchmarks.login_burst [--logins 20] [--seconds 10]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='jobhunt-bench-'), 'bench.db')}"
+)
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from app import migrations
+from app.auth import PASSWORD_HASH_CONCURRENCY, create_access_token, get_password_hash, verify_password
+from app.database import SessionLocal, engine
+from app.main import app as current_app
+from app.models import User
+from benchmarks.common import BackgroundServer, percentile
+
+PASSWORD = "benchmark-password"
+
+def build_legacy_app() -> FastAPI:
+    legacy = FastAPI()
+
+    @legacy.post("/api/auth/login")
+    async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+        with SessionLocal() as db:
+            user = db.query(User).filter(User.email == form_data.username).first()
+        if not user or not verify_password(form_data.password, user.hashed_password):
+            raise HTTPException(status_code=401, detail="Incorrect email or password")
+        return {"access_token": create_access_token({"sub": user.email}), "token_type": "bearer"}
+
+    @legacy.get("/api/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return legacy
+
+async def drive(base_url: str, logins: int, seconds: float):
+    login_latencies, probe_latencies = [], []
+    deadline = time.perf_counter() + seconds
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        async def login_worker():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/api/auth/login", data={"username": "burst@example.com", "password": PASSWORD}
+                )
+                response.raise_for_status()
+                login_latencies.append((time.perf_counter() - start) * 1000)
+
+        async def probe():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/api/health")
+                probe_latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(probe(), *(login_worker() for _ in range(logins)))
+
+    return {
+        "logins/s": len(login_latencies) / seconds,
+        "login p50 ms": statistics.median(login_latencies),
+        "health p50 ms": statistics.median(probe_latencies),
+        "health p99 ms": percentile(probe_latencies, 99),
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=20, help="concurrent login clients")
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    migrations.upgrade(engine)
+    with SessionLocal() as db:
+        if not db.query(User).filter(User.email == "burst@example.com").first():
+            db.add(User(email="burst@example.com", hashed_password=get_password_hash(PASSWORD)))
+            db.commit()
+
+    print(f"{args.logins} concurrent logins for {args.seconds:.0f}s, "
+          f"password pool size {PASSWORD_HASH_CONCURRENCY}\n")
+    for name, target in [("bcrypt on event loop", build_legacy_app()), ("bcrypt worker pool", current_app)]:
+        with BackgroundServer(target) as base_url:
+            result = asyncio.run(drive(base_url, args.logins, args.seconds))
+        print(f"{name:<22} " + "  ".join(f"{k} {v:8.1f}" for k, v in result.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compare query plans and latency of the router queries before and after the
+composite per-user indexes (migration 0002).
+
+Usage (from the backend directory):
+    python -m benchmarks.query_plans [--users 20] [--applications 5000]
+"""
+import argparse
+from datetime import datetime
+from sqlalchemy import func, select
+from app import migrations
+from app.models import Application, ApplicationStatus, Company, Contact, Interview
+from benchmarks.common import populate, temp_engine, time_call
+
+def router_queries(user_id: int):
+    now = datetime.utcnow()
+    return {
+        "applications list": select(Application).where(Application.user_id == user_id)
+            .order_by(Application.created_at.desc(), Application.id.desc()).limit(100),
+        "applications by status": select(Application)
+            .where(Application.user_id == user_id, Application.status == ApplicationStatus.APPLIED)
+            .order_by(Application.created_at.desc()).limit(100),
+        "status counts": select(Application.status, func.count(Application.id))
+            .where(Application.user_id == user_id).group_by(Application.status),
+        "companies list": select(Company).where(Company.user_id == user_id)
+            .order_by(Company.name, Company.id).limit(100),
+        "contacts list": select(Contact).where(Contact.user_id == user_id)
+            .order_by(Contact.name, Contact.id).limit(100),
+        "upcoming interviews": select(Interview)
+            .where(Interview.user_id == user_id, Interview.scheduled_at >= now)
+            .order_by(Interview.scheduled_at, Interview.id).limit(100),
+    }
+
+def explain(conn, stmt):
+    compiled = stmt.compile(dialect=conn.dialect)
+    params = compiled.construct_params()
+    values = []
+    for name in compiled.positiontup:
+        processor = compiled.binds[name].type.bind_processor(conn.dialect)
+        values.append(processor(params[name]) if processor else params[name])
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", tuple(values)).fetchall()
+    return "; ".join(row[-1] for row in rows)
+
+def measure(engine, user_id: int):
+    results = {}
+    with engine.connect() as conn:
+        for name, stmt in router_queries(user_id).items():
+            plan = explain(conn, stmt)
+            ms = time_call(lambda: conn.execute(stmt).fetchall())
+            results[name] = (plan, ms)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--applications", type=int, default=5000, help="applications per user")
+    args = parser.parse_args()
+
+    engine = temp_engine()
+    migrations.upgrade(engine, target=1)
+    populate(engine, args.users, args.applications)
+    user_id = args.users // 2 or 1
+
+    before = measure(engine, user_id)
+    migrations.upgrade(engine)
+    after = measure(engine, user_id)
+
+    print(f"{args.users} users x {args.applications} applications, measuring user {user_id}\n")
+    for name in before:
+        plan_before, ms_before = before[name]
+        plan_after, ms_after = after[name]
+        print(f"{name}")
+        print(f"  before {ms_before:8.2f} ms  {plan_before}")
+        print(f"  after  {ms_after:8.2f} ms  {plan_after}")
+
+if __name__ == "__main__":
+    main()
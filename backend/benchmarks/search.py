@@ -0,0 +1,86 @@
+"""
+Search latency: ``ILIKE '%term%'`` scans over every searchable column
+(the only option before the FTS5 index) versus ``/api/search``. The ILIKE
+search is timed twice: stopping at the first 20 hits, unranked, and
+collecting every hit, which ranking would need. The FTS search ranks all
+matches and returns the best 20.
+
+Usage (from the backend directory):
+    python -m benchmarks.search [--users 10] [--applications 10000]
+"""
+import argparse
+import random
+from sqlalchemy import or_, select
+from app import migrations, search
+from app.models import Application, Company, Contact, Interview
+from benchmarks.common import async_sessionmaker_for, populate, temp_engine, time_async_call
+
+WORDS = (
+    "python rust kubernetes postgres react typescript distributed payments search "
+    "latency platform mobile security compliance analytics streaming embedded robotics "
+    "infrastructure observability billing onboarding marketplace logistics"
+).split()
+
+LEGACY_COLUMNS = {
+    Company: ["name", "description", "notes"],
+    Contact: ["name", "title", "notes"],
+    Application: ["job_title", "job_description", "notes"],
+    Interview: ["notes", "feedback"],
+}
+
+def describe(engine, seed: int = 7):
+    """Give every application a short random description to search through."""
+    rng = random.Random(seed)
+    with engine.begin() as conn:
+        ids = [row.id for row in conn.execute(select(Application.id))]
+        for start in range(0, len(ids), 5000):
+            conn.exec_driver_sql(
+                "UPDATE applications SET job_description = ? WHERE id = ?",
+                [(" ".join(rng.choices(WORDS, k=12)), i) for i in ids[start:start + 5000]],
+            )
+
+async def legacy_search(db, user_id: int, term: str, limit=None):
+    results = []
+    for model, columns in LEGACY_COLUMNS.items():
+        query = select(model.id).where(
+            model.user_id == user_id,
+            or_(*(getattr(model, c).ilike(f"%{term}%") for c in columns)),
+        )
+        results.extend((await db.scalars(query.limit(limit))).all())
+    return results[:limit]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--applications", type=int, default=10_000, help="applications per user")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = temp_engine()
+    migrations.upgrade(engine)
+    populate(engine, users=args.users, applications_per_user=args.applications)
+    describe(engine)
+    session_factory = async_sessionmaker_for(engine)
+    print(f"{args.users * args.applications} applications across {args.users} users\n")
+
+    print(f"{'query':<20} {'ilike first 20 ms':>17} {'ilike all ms':>12} {'fts ms':>9}")
+    for term in ["kubernetes", "observ", "payments latency", "nomatchatall"]:
+        async def run_legacy_first():
+            async with session_factory() as db:
+                await legacy_search(db, 1, term, limit=20)
+
+        async def run_legacy_all():
+            async with session_factory() as db:
+                await legacy_search(db, 1, term)
+
+        async def run_fts():
+            async with session_factory() as db:
+                await search.search(db, 1, term)
+
+        first_ms = time_async_call(run_legacy_first, args.repeat)
+        all_ms = time_async_call(run_legacy_all, args.repeat)
+        fts_ms = time_async_call(run_fts, args.repeat)
+        print(f"{term:<20} {first_ms:>17.2f} {all_ms:>12.2f} {fts_ms:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Cost of turning a 10k-row application list into JSON: ORM instances
+validated through the route's response model (the ``?expand=`` path)
+versus row tuples through the pre-built row adapter and orjson (the plain
+list path), plus the whole request for each.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization [--applications 10000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='jobhunt-bench-'), 'bench.db')}"
+)
+
+import httpx
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from app import serialization
+from app.auth import create_access_token
+from app.database import AsyncSessionLocal, engine
+from app.main import app
+from app.models import Application
+from app.schemas import ApplicationExpanded, ApplicationResponse
+from benchmarks.common import populate
+
+# What FastAPI builds for response_model=List[ApplicationExpanded]
+EXPANDED_LIST = TypeAdapter(List[ApplicationExpanded])
+NAMES = serialization.row_fields(ApplicationResponse)
+
+async def orm_objects() -> bytes:
+    async with AsyncSessionLocal() as db:
+        items = (await db.scalars(select(Application).where(Application.user_id == 1))).all()
+        return EXPANDED_LIST.dump_json(EXPANDED_LIST.validate_python(items), exclude_unset=True)
+
+async def row_tuples() -> bytes:
+    async with AsyncSessionLocal() as db:
+        query = select(*serialization.columns(Application, NAMES)).where(Application.user_id == 1)
+        rows = (await db.execute(query)).all()
+        return serialization.render_rows(rows, ApplicationResponse, NAMES, Response()).body
+
+async def timed(func, repeat: int):
+    samples, body = [], b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = await func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), body
+
+async def measure_request(params: dict, limit: int, repeat: int):
+    token = create_access_token({"sub": "user1@example.com", "user_id": 1})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}
+    ) as client:
+        async def request():
+            response = await client.get("/api/applications/", params={"limit": limit, **params})
+            response.raise_for_status()
+            return response.content
+        return await timed(request, repeat)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--applications", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    populate(engine, users=1, applications_per_user=args.applications)
+    print(f"{args.applications} applications\n")
+
+    (orm_ms, orm_body), (rows_ms, rows_body) = (
+        asyncio.run(timed(orm_objects, args.repeat)), asyncio.run(timed(row_tuples, args.repeat))
+    )
+    assert json.loads(orm_body) == json.loads(rows_body), "row path output differs"
+
+    print(f"{'fetch + serialise':<34} {'median ms':>10} {'payload KB':>11}")
+    print(f"{'ORM objects + response model':<34} {orm_ms:>10.1f} {len(orm_body) / 1024:>11.1f}")
+    print(f"{'row tuples + row adapter':<34} {rows_ms:>10.1f} {len(rows_body) / 1024:>11.1f}")
+
+    print(f"\n{'GET /api/applications/':<34} {'median ms':>10}")
+    for name, params in [("?expand=company (ORM path)", {"expand": "company"}), ("plain list (row path)", {})]:
+        ms, _ = asyncio.run(measure_request(params, args.applications, args.repeat))
+        print(f"{name:<34} {ms:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Payload size and latency of a page of applications with multi-KB
+descriptions and notes, in full versus with ``?fields=`` trimmed to what a
+table view shows.
+
+Usage (from the backend directory):
+    python -m benchmarks.sparse_fields [--applications 10000] [--text-kb 4]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='jobhunt-bench-'), 'bench.db')}"
+)
+
+import httpx
+from app.auth import create_access_token
+from app.database import engine
+from app.main import app
+from benchmarks.common import populate
+
+TABLE_FIELDS = "job_title,status,created_at"
+
+def add_long_text(size_kb: int, seed: int = 3):
+    rng = random.Random(seed)
+    words = "experience team product build scale customers ownership design ship".split()
+    with engine.begin() as conn:
+        ids = [row[0] for row in conn.exec_driver_sql("SELECT id FROM applications")]
+        for start in range(0, len(ids), 2000):
+            conn.exec_driver_sql(
+                "UPDATE applications SET job_description = ?, notes = ? WHERE id = ?",
+                [
+                    (
+                        " ".join(rng.choices(words, k=size_kb * 140)),
+                        " ".join(rng.choices(words, k=size_kb * 35)),
+                        row_id,
+                    )
+                    for row_id in ids[start:start + 2000]
+                ],
+            )
+
+async def measure(params: dict, repeat: int):
+    token = create_access_token({"sub": "user1@example.com", "user_id": 1})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}
+    ) as client:
+        samples, size = [], 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = await client.get("/api/applications/", params=params)
+            samples.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+            size = len(response.content)
+    return statistics.median(samples), size
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--applications", type=int, default=10_000)
+    parser.add_argument("--text-kb", type=int, default=4, help="approximate job_description size")
+    parser.add_argument("--limit", type=int, default=100, help="page size")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    populate(engine, users=1, applications_per_user=args.applications)
+    add_long_text(args.text_kb)
+
+    print(f"page of {args.limit} applications, ~{args.text_kb} KB description each\n")
+    print(f"{'request':<32} {'median ms':>10} {'payload KB':>11}")
+    for name, params in [
+        ("full rows", {"limit": args.limit}),
+        (f"fields={TABLE_FIELDS}", {"limit": args.limit, "fields": TABLE_FIELDS}),
+    ]:
+        ms, size = asyncio.run(measure(params, args.repeat))
+        print(f"{name:<32} {ms:>10.2f} {size / 1024:>11.1f}")
+
+if __name__ == "__main__":
+    main()
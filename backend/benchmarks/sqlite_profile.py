@@ -0,0 +1,94 @@
+"""
+Mixed read/write load on a SQLite file with SQLite's default settings versus
+the connection profile in app.database (WAL, synchronous=NORMAL, mmap, page
+cache, busy_timeout, ...).
+
+Worker threads each run a loop of list reads and single-row insert commits
+(20% writes by default), the pattern of several users working at once.
+
+Usage (from the backend directory):
+    python -m benchmarks.sqlite_profile [--threads 8] [--seconds 10] [--write-ratio 0.2]
+"""
+import argparse
+import random
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+from app import migrations
+from app.database import SQLITE_PRAGMAS, configure_sqlite, engine_options
+from app.models import Application
+from benchmarks.common import percentile, populate, temp_engine
+
+def run_load(engine, threads: int, seconds: float, write_ratio: float):
+    reads, writes, errors = [], [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(n: int):
+        rng = random.Random(n)
+        user_id = n % 4 + 1
+        list_query = select(Application).where(Application.user_id == user_id).order_by(
+            Application.created_at.desc(), Application.id.desc()
+        ).limit(100)
+        while time.perf_counter() < deadline:
+            is_write = rng.random() < write_ratio
+            start = time.perf_counter()
+            try:
+                with engine.begin() as conn:
+                    if is_write:
+                        conn.execute(Application.__table__.insert().values(
+                            user_id=user_id, company_id=1, job_title="load", status="SAVED",
+                            created_at=datetime.utcnow(),
+                        ))
+                    else:
+                        conn.execute(list_query).fetchall()
+            except OperationalError:
+                with lock:
+                    errors[0] += 1
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                (writes if is_write else reads).append(elapsed)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    return {
+        "ops/s": (len(reads) + len(writes)) / seconds,
+        "read p99 ms": percentile(reads, 99),
+        "write p99 ms": percentile(writes, 99),
+        "errors": errors[0],
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{args.threads} threads for {args.seconds:.0f}s, {args.write_ratio:.0%} writes")
+    print(f"profile: {SQLITE_PRAGMAS}\n")
+    for name, use_profile in [("SQLite defaults", False), ("connection profile", True)]:
+        seed_engine = temp_engine()
+        migrations.upgrade(seed_engine)
+        populate(seed_engine, users=4, applications_per_user=5000)
+        url = seed_engine.url.render_as_string(hide_password=False)
+        seed_engine.dispose()
+
+        if use_profile:
+            engine = create_engine(url, **engine_options(url))
+            configure_sqlite(engine)
+        else:
+            engine = create_engine(url, connect_args={"check_same_thread": False})
+        result = run_load(engine, args.threads, args.seconds, args.write_ratio)
+        engine.dispose()
+        print(f"{name:<20} " + "  ".join(f"{k} {v:8.1f}" for k, v in result.items()))
+
+if __name__ == "__main__":
+    main()
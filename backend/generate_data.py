@@ -0,0 +1,304 @@
+"""
+Generate a large synthetic dataset for capacity planning and benchmarks.
+
+Creates N users, each with M companies, applications, contacts and
+interviews, with realistic spreads: most applications stall early in the
+pipeline (each with the status history that got it there), activity is
+weighted towards recent months, interviews cluster on the applications
+that progressed, and free text varies from empty to several KB. Rows are
+written with bulk executemany inserts and explicit ids, so children
+reference their parents without reading anything back.
+
+Usage (from the backend directory; writes to DATABASE_URL):
+    python generate_data.py --users 10 --applications 2000
+"""
+import argparse
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.auth import get_password_hash
+from app.models import Application, ApplicationStatus, Company, Contact, Interview, StatusTransition, User
+from app import analytics, migrations, stats
+
+DEFAULT_PASSWORD = "password123"
+INSERT_CHUNK = 5000
+CORPUS_WORDS = 100_000
+
+# Where applications end up. Most never get past the first steps.
+STATUS_WEIGHTS = {
+    ApplicationStatus.SAVED: 18,
+    ApplicationStatus.APPLIED: 34,
+    ApplicationStatus.PHONE_SCREEN: 12,
+    ApplicationStatus.INTERVIEW: 8,
+    ApplicationStatus.FINAL_INTERVIEW: 3,
+    ApplicationStatus.OFFER: 2,
+    ApplicationStatus.REJECTED: 20,
+    ApplicationStatus.WITHDRAWN: 3,
+}
+# Relative number of interviews an application in each status attracts
+INTERVIEW_WEIGHTS = {
+    ApplicationStatus.SAVED: 0,
+    ApplicationStatus.APPLIED: 0.1,
+    ApplicationStatus.PHONE_SCREEN: 1,
+    ApplicationStatus.INTERVIEW: 2,
+    ApplicationStatus.FINAL_INTERVIEW: 3.5,
+    ApplicationStatus.OFFER: 4,
+    ApplicationStatus.REJECTED: 1,
+    ApplicationStatus.WITHDRAWN: 0.5,
+}
+# Median days an application spends in a pipeline stage before moving on
+STAGE_DAYS = 8
+
+SENIORITY = ["Junior", "", "", "Senior", "Senior", "Staff", "Lead", "Principal"]
+ROLES = [
+    "Software Engineer", "Backend Engineer", "Frontend Developer", "Data Scientist",
+    "Data Engineer", "Product Manager", "DevOps Engineer", "Site Reliability Engineer",
+    "Machine Learning Engineer", "QA Engineer", "Security Engineer", "Engineering Manager",
+]
+NAME_PARTS = ["Tech", "Data", "Cloud", "Bright", "Blue", "Quantum", "Nova", "Apex", "Green", "Pixel",
+              "Stack", "Wave", "Core", "Vector", "Summit", "Atlas", "Orbit", "Lumen", "Forge", "Signal"]
+NAME_SUFFIXES = ["Inc.", "Labs", "Systems", "Ltd", "Group", "Technologies", "AI", "Software", "Health", "Works"]
+INDUSTRIES = ["Technology", "FinTech", "Healthcare", "E-commerce", "Education", "Media",
+              "Logistics", "Gaming", "Cybersecurity", "Energy"]
+SIZES = ["1-10 employees", "11-50 employees", "50-100 employees", "100-500 employees",
+         "500-1000 employees", "1000+ employees"]
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Austin, TX", "Seattle, WA", "Boston, MA",
+             "Chicago, IL", "Denver, CO", "Remote", "Remote", "London, UK", "Berlin, Germany"]
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery",
+               "Quinn", "Priya", "Wei", "Fatima", "Mateo", "Olga", "Kenji", "Amara", "Luca"]
+LAST_NAMES = ["Smith", "Johnson", "Lee", "Garcia", "Chen", "Patel", "Kim", "Nguyen", "Müller",
+              "Rossi", "Okafor", "Silva", "Cohen", "Novak", "Tanaka", "Ivanova"]
+CONTACT_TITLES = ["Recruiter", "Technical Recruiter", "Hiring Manager", "Engineering Manager",
+                  "Talent Partner", "Senior Engineer", "Head of People", "CTO"]
+INTERVIEW_TYPES = ["Phone Screen", "Technical", "System Design", "Behavioral", "Take-home Review",
+                   "Onsite", "Final Round"]
+WORDS = (
+    "experience team product build scale customers ownership design ship reliable services "
+    "collaborate mentor roadmap distributed systems python typescript react cloud kubernetes "
+    "data pipelines analytics metrics growth impact fast-paced startup mission platform api "
+    "security performance testing automation infrastructure stakeholders communication agile "
+    "remote hybrid benefits equity salary learning culture inclusive innovative users quality"
+).split()
+
+def _words(rng: random.Random, corpus: List[str], median: int, sigma: float = 0.7) -> str:
+    """
+    A run of words from ``corpus``, with a log-normally distributed count
+    around ``median``. Slicing a pre-shuffled corpus is much cheaper than
+    sampling every word.
+    """
+    count = min(len(corpus), max(1, int(rng.lognormvariate(math.log(median), sigma))))
+    start = rng.randrange(len(corpus) - count + 1)
+    return " ".join(corpus[start:start + count])
+
+def _maybe(rng: random.Random, probability: float, value):
+    return value if rng.random() < probability else None
+
+def _recent(rng: random.Random, now: datetime, days: int) -> datetime:
+    """A time in the last ``days`` days, weighted towards the present."""
+    return now - timedelta(minutes=int(days * 24 * 60 * rng.random() ** 1.6))
+
+def _person(rng: random.Random):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return f"{first} {last}", f"{first}.{last}@example.org".lower()
+
+def _chunks(rows: List[dict]) -> Iterator[List[dict]]:
+    for start in range(0, len(rows), INSERT_CHUNK):
+        yield rows[start:start + INSERT_CHUNK]
+
+def _status_path(
+    rng: random.Random, status: ApplicationStatus, created: datetime, applied: Optional[datetime], now: datetime
+) -> List[tuple]:
+    """
+    ``(from, to, changed_at)`` transitions taking a new application to
+    ``status``: forward through the pipeline, and for rejected or withdrawn
+    ones out of a random stage they had reached.
+    """
+    if status in analytics.STAGE_RANK:
+        path, end = analytics.PIPELINE[:analytics.STAGE_RANK[status] + 1], None
+    else:
+        furthest = rng.choices(range(1, len(analytics.PIPELINE) - 1), [12, 6, 3, 1])[0]
+        path, end = analytics.PIPELINE[:furthest + 1], status
+    changes, at = [(None, path[0], created)], created
+    for previous, current in zip(path, path[1:] + ([end] if end else [])):
+        if current == ApplicationStatus.APPLIED and applied:
+            at = applied
+        else:
+            at += timedelta(minutes=int(rng.lognormvariate(math.log(STAGE_DAYS * 24 * 60), 0.8)))
+        changes.append((previous, current, min(at, now)))
+    return changes
+
+def _next_ids(conn) -> Dict[str, int]:
+    return {
+        model.__tablename__: (conn.scalar(select(func.max(model.id))) or 0) + 1
+        for model in (User, Company, Contact, Application, Interview)
+    }
+
+def generate(
+    engine: Engine,
+    users: int = 1,
+    companies: int = 50,
+    applications: int = 500,
+    contacts: int = 100,
+    interviews: int = 200,
+    days: int = 365,
+    seed: int = 42,
+    password: str = DEFAULT_PASSWORD,
+    email_domain: str = "example.com",
+) -> Dict[str, int]:
+    """
+    Insert ``users`` users, each owning the given number of companies,
+    applications, contacts and interviews. Users are named
+    ``user{id}@{email_domain}`` and share ``password``.
+
+    Returns the number of rows inserted per table.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    hashed_password = get_password_hash(password)  # bcrypt is slow; hash once for everyone
+    statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    corpus = rng.choices(WORDS, k=CORPUS_WORDS)
+    totals = dict.fromkeys(["users", "companies", "contacts", "applications", "interviews", "status_transitions"], 0)
+
+    with engine.begin() as conn:
+        next_id = _next_ids(conn)
+        generated = []
+        for _ in range(users):
+            user_id = next_id["users"]
+            next_id["users"] += 1
+            generated.append(user_id)
+            conn.execute(User.__table__.insert(), [{
+                "id": user_id, "email": f"user{user_id}@{email_domain}", "hashed_password": hashed_password,
+                "full_name": _person(rng)[0], "created_at": now - timedelta(days=days),
+            }])
+
+            company_rows = []
+            for _ in range(companies):
+                company_rows.append({
+                    "id": next_id["companies"], "user_id": user_id,
+                    "name": f"{rng.choice(NAME_PARTS)}{rng.choice(NAME_PARTS).lower()} {rng.choice(NAME_SUFFIXES)}",
+                    "website": _maybe(rng, 0.8, f"https://company{next_id['companies']}.example.com"),
+                    "industry": rng.choice(INDUSTRIES),
+                    "size": _maybe(rng, 0.7, rng.choice(SIZES)),
+                    "location": rng.choice(LOCATIONS),
+                    "description": _maybe(rng, 0.8, _words(rng, corpus, 40)),
+                    "notes": _maybe(rng, 0.3, _words(rng, corpus, 25)),
+                    "created_at": _recent(rng, now, days),
+                })
+                next_id["companies"] += 1
+            company_ids = [row["id"] for row in company_rows]
+
+            contact_rows = []
+            for _ in range(contacts if company_ids else 0):
+                name, email = _person(rng)
+                contact_rows.append({
+                    "id": next_id["contacts"], "user_id": user_id, "company_id": rng.choice(company_ids),
+                    "name": name, "email": _maybe(rng, 0.8, email),
+                    "phone": _maybe(rng, 0.4, f"+1-555-{rng.randrange(10000):04d}"),
+                    "title": rng.choice(CONTACT_TITLES),
+                    "linkedin": _maybe(rng, 0.5, f"https://linkedin.com/in/{email.split('@')[0].replace('.', '-')}"),
+                    "notes": _maybe(rng, 0.3, _words(rng, corpus, 20)),
+                    "created_at": _recent(rng, now, days),
+                })
+                next_id["contacts"] += 1
+
+            application_rows, interview_weights, transition_rows = [], [], []
+            for _ in range(applications if company_ids else 0):
+                status = rng.choices(statuses, status_weights)[0]
+                created = _recent(rng, now, days)
+                applied = None if status == ApplicationStatus.SAVED else created + timedelta(hours=rng.randrange(0, 24 * 7))
+                salary_min = _maybe(rng, 0.6, rng.randrange(60, 200) * 1000)
+                application_rows.append({
+                    "id": next_id["applications"], "user_id": user_id, "company_id": rng.choice(company_ids),
+                    "job_title": " ".join(filter(None, [rng.choice(SENIORITY), rng.choice(ROLES)])),
+                    "job_description": _maybe(rng, 0.85, _words(rng, corpus, 250)),
+                    "job_url": _maybe(rng, 0.7, f"https://jobs.example.com/{next_id['applications']}"),
+                    "status": status,
+                    "salary_min": salary_min,
+                    "salary_max": salary_min and salary_min + rng.randrange(10, 60) * 1000,
+                    "salary_currency": "USD",
+                    "applied_date": applied and min(applied, now),
+                    "notes": _maybe(rng, 0.4, _words(rng, corpus, 30)),
+                    "resume_version": _maybe(rng, 0.5, f"v{rng.randint(1, 6)}"),
+                    "cover_letter_version": _maybe(rng, 0.3, f"v{rng.randint(1, 4)}"),
+                    "created_at": created,
+                    "updated_at": _maybe(rng, 0.6, min(now, created + timedelta(days=rng.randrange(1, 60)))),
+                })
+                interview_weights.append(INTERVIEW_WEIGHTS[status])
+                transition_rows.extend(
+                    {"application_id": next_id["applications"], "user_id": user_id,
+                     "from_status": previous, "to_status": current, "changed_at": at}
+                    for previous, current, at in _status_path(rng, status, created, applied, now)
+                )
+                next_id["applications"] += 1
+
+            interview_rows = []
+            if application_rows and interviews and sum(interview_weights):
+                for application in rng.choices(application_rows, interview_weights, k=interviews):
+                    start = application["applied_date"] or application["created_at"]
+                    scheduled = start + timedelta(days=rng.randrange(3, 45), hours=rng.randrange(9, 17))
+                    name, email = _person(rng)
+                    past = scheduled < now
+                    interview_rows.append({
+                        "id": next_id["interviews"], "user_id": user_id, "application_id": application["id"],
+                        "interview_type": rng.choice(INTERVIEW_TYPES),
+                        "scheduled_at": scheduled,
+                        "location": rng.choice(["Zoom", "Google Meet", "Phone", "Onsite"]),
+                        "interviewer_name": _maybe(rng, 0.7, name),
+                        "interviewer_email": _maybe(rng, 0.5, email),
+                        "notes": _maybe(rng, 0.5, _words(rng, corpus, 30)),
+                        "feedback": _maybe(rng, 0.6, _words(rng, corpus, 50)) if past else None,
+                        "result": rng.choice(["Passed", "Rejected", "Pending"]) if past else None,
+                        "created_at": min(now, start),
+                    })
+                    next_id["interviews"] += 1
+
+            for model, rows in [
+                (Company, company_rows), (Contact, contact_rows),
+                (Application, application_rows), (Interview, interview_rows),
+                (StatusTransition, transition_rows),
+            ]:
+                for chunk in _chunks(rows):
+                    conn.execute(model.__table__.insert(), chunk)
+                totals[model.__tablename__] += len(rows)
+            totals["users"] += 1
+
+    # Counters for the new users only; existing users' rows were not touched
+    with Session(engine) as db:
+        for user_id in generated:
+            stats.rebuild(db, user_id)
+    return totals
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--companies", type=int, default=50, help="per user")
+    parser.add_argument("--applications", type=int, default=500, help="per user")
+    parser.add_argument("--contacts", type=int, default=100, help="per user")
+    parser.add_argument("--interviews", type=int, default=200, help="per user")
+    parser.add_argument("--days", type=int, default=365, help="how far back activity goes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--email-domain", default="example.com")
+    args = parser.parse_args(argv)
+
+    from app.database import engine
+    migrations.upgrade(engine)
+
+    start = time.perf_counter()
+    totals = generate(
+        engine, users=args.users, companies=args.companies, applications=args.applications,
+        contacts=args.contacts, interviews=args.interviews, days=args.days, seed=args.seed,
+        password=args.password, email_domain=args.email_domain,
+    )
+    elapsed = time.perf_counter() - start
+    rows = sum(totals.values())
+    print(", ".join(f"{count} {table}" for table, count in totals.items()))
+    print(f"✓ {rows} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
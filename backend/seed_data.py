@@ -3,13 +3,14 @@ Script to seed the database with mock data for testing.
 Run this script to create a test user account and sample data.
 """
 from datetime import datetime, timedelta
-from app.database import SessionLocal, engine, Base
+from app.database import SessionLocal, engine
 from app.models import User, Company, Application, Contact, Interview, ApplicationStatus
 from app.auth import get_password_hash
 from app import models  # Import models to register them
+from app import analytics, migrations, stats
 
-# Create tables if they don't exist
-Base.metadata.create_all(bind=engine)
+# Bring the schema up to date before seeding
+migrations.upgrade(engine)
 
 def get_or_create_user(db):
     """Get existing user or create a new one."""
@@ -330,6 +331,11 @@ def seed_all_data():
         # Create interviews
         interviews = create_interviews(db, user, applications)
         
+        # Rows above are inserted directly, so start their status history
+        # and recount the dashboard counters
+        analytics.backfill(db, user.id)
+        stats.rebuild(db, user.id)
+        
         print("=" * 50)
         print("✓ Database seeding completed successfully!")
         print("=" * 50)
@@ -0,0 +1,29 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database before anything imports it
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='jobhunt-test-'), 'test.db')}"
+
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from app.database import SessionLocal
+from app.main import app
+
+@pytest.fixture
+def client():
+    """A client logged in as a fresh user, with the app's lifespan running."""
+    with TestClient(app) as client:
+        email = f"{uuid.uuid4().hex}@example.com"
+        response = client.post("/api/auth/register", json={"email": email, "password": "pw12345", "full_name": "Test"})
+        assert response.status_code == 201, response.text
+        response = client.post("/api/auth/login", data={"username": email, "password": "pw12345"})
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        client.user_id = client.get("/api/auth/me").json()["id"]
+        yield client
+
+@pytest.fixture
+def db():
+    """A sync session on the test database, for checking what the API wrote."""
+    with SessionLocal() as session:
+        yield session
@@ -0,0 +1,44 @@
+from app import analytics
+
+def _applications(client, count, status):
+    company = client.post("/api/companies/", json={"name": "Acme"}).json()
+    return [
+        client.post("/api/applications/", json={"job_title": f"Role {n}", "company_id": company["id"], "status": status}).json()["id"]
+        for n in range(count)
+    ]
+
+def _reports(client):
+    return client.get("/api/analytics/funnel").json(), client.get("/api/analytics/stage-durations").json()
+
+def _rebuilt(client):
+    analytics._histories.clear()
+    return _reports(client)
+
+def test_incremental_history_matches_a_fresh_rebuild(client):
+    ids = _applications(client, 3, "applied")
+    _reports(client)
+    cached = analytics._histories.get(client.user_id)
+
+    for status in ("phone_screen", "interview", "offer"):
+        client.put(f"/api/applications/{ids[0]}", json={"status": status})
+    client.put(f"/api/applications/{ids[1]}", json={"status": "rejected"})
+    _applications(client, 1, "saved")
+
+    incremental = _reports(client)
+    assert analytics._histories.get(client.user_id) is cached
+    assert incremental[0]["total_applications"] == 4
+    assert incremental == _rebuilt(client)
+
+def test_deleted_application_triggers_a_full_rebuild(client):
+    ids = _applications(client, 3, "interview")
+    client.put(f"/api/applications/{ids[0]}", json={"status": "offer"})
+    _reports(client)
+    cached = analytics._histories.get(client.user_id)
+
+    assert client.delete(f"/api/applications/{ids[0]}").status_code == 204
+    client.put(f"/api/applications/{ids[1]}", json={"status": "withdrawn"})
+
+    after_delete = _reports(client)
+    assert analytics._histories.get(client.user_id) is not cached
+    assert after_delete[0]["total_applications"] == 2
+    assert after_delete == _rebuilt(client)
@@ -0,0 +1,45 @@
+from app import stats
+
+def test_refs_link_records_created_in_the_same_batch(client, db):
+    response = client.post("/api/batch/", json={"operations": [
+        {"method": "create", "entity": "companies", "ref": "acme", "data": {"name": "Acme"}},
+        {"method": "create", "entity": "applications", "ref": "job", "data": {"job_title": "Engineer", "company_id": "$acme"}},
+        {"method": "create", "entity": "interviews", "data": {"application_id": "$job", "scheduled_at": "2030-01-15T10:00:00"}},
+        {"method": "update", "entity": "applications", "id": "$job", "data": {"status": "interview"}},
+    ]})
+    assert response.status_code == 200, response.text
+    company, application, interview, updated = response.json()["results"]
+    assert application["data"]["company_id"] == company["id"]
+    assert interview["data"]["application_id"] == application["id"]
+    assert updated["id"] == application["id"] and updated["data"]["status"] == "interview"
+    assert stats.verify(db, client.user_id) == {}
+
+def test_failing_operation_rolls_back_the_whole_batch(client, db):
+    existing = client.post("/api/companies/", json={"name": "Existing"}).json()
+    etag = client.get("/api/companies/").headers["etag"]
+
+    response = client.post("/api/batch/", json={"operations": [
+        {"method": "create", "entity": "companies", "ref": "acme", "data": {"name": "Acme"}},
+        {"method": "update", "entity": "companies", "id": existing["id"], "data": {"notes": "changed"}},
+        {"method": "create", "entity": "applications", "data": {"job_title": "Engineer", "company_id": "$acme"}},
+        {"method": "delete", "entity": "companies", "id": 999999},
+        {"method": "create", "entity": "companies", "data": {"name": "Never reached"}},
+    ]})
+    assert response.status_code == 404
+    assert response.json()["detail"] == {"operation": 3, "detail": "Company 999999 not found"}
+
+    assert [company["name"] for company in client.get("/api/companies/").json()] == ["Existing"]
+    assert client.get(f"/api/companies/{existing['id']}").json()["notes"] is None
+    assert client.get("/api/applications/").json() == []
+    # Nothing was committed, so cached pages are still current
+    assert client.get("/api/companies/", headers={"If-None-Match": etag}).status_code == 304
+    assert stats.verify(db, client.user_id) == {}
+
+def test_unknown_ref_names_the_operation(client):
+    response = client.post("/api/batch/", json={"operations": [
+        {"method": "create", "entity": "companies", "data": {"name": "Acme"}},
+        {"method": "create", "entity": "applications", "data": {"job_title": "Engineer", "company_id": "$missing"}},
+    ]})
+    assert response.status_code == 400
+    assert response.json()["detail"] == {"operation": 1, "detail": "Unknown reference '$missing'"}
+    assert client.get("/api/companies/").json() == []
@@ -0,0 +1,11 @@
+def test_search_matches_a_case_insensitive_substring_of_the_name(client):
+    for name in ("Rocketship", "Acme Rockets", "Globex"):
+        client.post("/api/companies/", json={"name": name})
+
+    response = client.get("/api/companies/", params={"search": "OCKET"})
+    assert [company["name"] for company in response.json()] == ["Acme Rockets", "Rocketship"]
+    assert "etag" in response.headers
+
+    response = client.get("/api/companies/", params={"search": "zzz"})
+    assert response.json() == []
+    assert "etag" in response.headers
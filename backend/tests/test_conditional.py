@@ -0,0 +1,28 @@
+def test_unchanged_list_revalidates_with_304(client):
+    client.post("/api/companies/", json={"name": "Acme"})
+    first = client.get("/api/companies/")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    cached = client.get("/api/companies/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+def test_write_changes_the_etag(client):
+    company = client.post("/api/companies/", json={"name": "Acme"}).json()
+    etag = client.get("/api/companies/").headers["etag"]
+
+    client.put(f"/api/companies/{company['id']}", json={"name": "Acme Corp"})
+    response = client.get("/api/companies/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [row["name"] for row in response.json()] == ["Acme Corp"]
+    # The detail route shares the user's version
+    assert client.get(f"/api/companies/{company['id']}", headers={"If-None-Match": etag}).status_code == 200
+
+def test_upcoming_interviews_etag_follows_the_clock(client):
+    plain = client.get("/api/interviews/").headers["etag"]
+    upcoming = client.get("/api/interviews/", params={"upcoming_only": True}).headers["etag"]
+    assert upcoming != plain
+    assert client.get("/api/interviews/", params={"upcoming_only": True}, headers={"If-None-Match": plain}).status_code == 200
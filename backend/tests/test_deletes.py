@@ -0,0 +1,32 @@
+from sqlalchemy import func, select
+from app import stats
+from app.models import Application, Contact, Interview, StatusTransition, UserStats
+
+def test_deleting_a_company_cascades_and_keeps_counters_exact(client, db):
+    company = client.post("/api/companies/", json={"name": "Acme"}).json()
+    other = client.post("/api/companies/", json={"name": "Globex"}).json()
+    applications = [
+        client.post("/api/applications/", json={"job_title": title, "company_id": company["id"], "status": status}).json()
+        for title, status in [("Engineer", "interview"), ("Manager", "applied")]
+    ]
+    kept = client.post("/api/applications/", json={"job_title": "Analyst", "company_id": other["id"]}).json()
+    for application in applications + [kept]:
+        client.post("/api/interviews/", json={"application_id": application["id"], "scheduled_at": "2030-01-01T10:00:00"})
+    contact = client.post("/api/contacts/", json={"name": "Dana", "company_id": company["id"]}).json()
+
+    assert client.delete(f"/api/companies/{company['id']}").status_code == 204
+
+    ids = [application["id"] for application in applications]
+    count = lambda model, *where: db.scalar(select(func.count()).select_from(model).where(*where))
+    assert count(Application, Application.id.in_(ids)) == 0
+    assert count(Interview, Interview.application_id.in_(ids)) == 0
+    assert count(StatusTransition, StatusTransition.application_id.in_(ids)) == 0
+    assert db.get(Contact, contact["id"]).company_id is None
+    assert client.get(f"/api/applications/{kept['id']}").status_code == 200
+
+    dashboard = client.get("/api/dashboard/stats").json()
+    assert dashboard["total_companies"] == 1
+    assert dashboard["total_applications"] == 1
+    assert dashboard["total_contacts"] == 1
+    assert db.get(UserStats, client.user_id).total_interviews == 1
+    assert stats.verify(db, client.user_id) == {}
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+from app.interview_calendar import Conflict, find_conflicts
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2030, 1, 15, hour, minute)
+
+def test_overlaps_and_back_to_back_pairs_are_found():
+    conflicts = find_conflicts([
+        (1, _at(9), _at(10)),
+        (2, _at(9, 30), _at(10, 30)),
+        (3, _at(10, 40), _at(11)),  # 10 minutes after 2 ends
+        (4, _at(12), _at(13)),  # an hour clear of everything
+    ])
+    assert conflicts == [
+        Conflict(1, 2, "overlap", -30),
+        Conflict(2, 3, "back_to_back", 10),
+    ]
+
+def test_a_long_interview_conflicts_with_everything_inside_it():
+    conflicts = find_conflicts([
+        (3, _at(11), _at(11, 30)),
+        (1, _at(9), _at(12)),
+        (2, _at(10), _at(10, 30)),
+        (4, _at(12, 10), _at(13)),
+    ])
+    assert {(conflict.first_id, conflict.second_id, conflict.kind) for conflict in conflicts} == {
+        (1, 2, "overlap"), (1, 3, "overlap"), (1, 4, "back_to_back"),
+    }
+
+def test_gap_decides_back_to_back():
+    interviews = [(1, _at(9), _at(10)), (2, _at(10, 20), _at(11))]
+    assert find_conflicts(interviews) == []
+    assert find_conflicts(interviews, gap=timedelta(minutes=30)) == [Conflict(1, 2, "back_to_back", 20)]
+    assert find_conflicts(interviews, gap=timedelta(minutes=20)) == []
+
+def test_calendar_endpoint_reports_conflicts(client):
+    company = client.post("/api/companies/", json={"name": "Acme"}).json()
+    application = client.post("/api/applications/", json={"job_title": "Engineer", "company_id": company["id"]}).json()
+    day = datetime.utcnow().date() + timedelta(days=2)
+    ids = [
+        client.post("/api/interviews/", json={"application_id": application["id"], "scheduled_at": f"{day}T{time}"}).json()["id"]
+        for time in ("10:00:00", "10:30:00", "11:40:00", "15:00:00")
+    ]
+
+    response = client.get("/api/interviews/calendar", params={"from": day.isoformat(), "to": day.isoformat()})
+    assert response.status_code == 200
+    body = response.json()
+    assert [interview["id"] for interview in body["interviews"]] == ids
+    assert body["conflicts"] == [
+        {"first_id": ids[0], "second_id": ids[1], "kind": "overlap", "gap_minutes": -30.0},
+        {"first_id": ids[1], "second_id": ids[2], "kind": "back_to_back", "gap_minutes": 10.0},
+    ]
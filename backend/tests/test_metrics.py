@@ -0,0 +1,14 @@
+from app import metrics
+from app.main import app
+
+def test_metrics_middleware_is_outermost():
+    assert app.user_middleware[0].cls is metrics.MetricsMiddleware
+
+def test_metrics_need_a_signed_in_user(client):
+    client.get("/api/companies/")
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert 'route="/api/companies/"' in response.text
+
+    del client.headers["Authorization"]
+    assert client.get("/api/metrics").status_code == 401
@@ -0,0 +1,33 @@
+import base64
+import json
+from app.pagination import NEXT_CURSOR_HEADER
+
+def test_following_the_cursor_visits_every_row_once(client):
+    created = client.post("/api/companies/bulk", json=[{"name": f"Company {n % 7}"} for n in range(25)]).json()["ids"]
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/companies/", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 10
+        seen += [company["id"] for company in page]
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+
+    # Names repeat, so the id tiebreaker is what keeps pages from overlapping
+    assert pages == 3
+    assert len(seen) == len(set(seen))
+    assert sorted(seen) == sorted(created)
+
+def _cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+def test_malformed_cursor_is_a_400(client):
+    for cursor in ("not-a-cursor!", _cursor([[1], 1]), _cursor(["Acme", "1"]), _cursor({"a": 1})):
+        response = client.get("/api/companies/", params={"cursor": cursor})
+        assert response.status_code == 400, cursor
+        assert response.json()["detail"] == "Invalid pagination cursor"
@@ -0,0 +1,27 @@
+import time
+from datetime import datetime, timedelta, timezone
+from app import reminders
+
+class CaptureSink:
+    def __init__(self):
+        self.reminders = []
+
+    async def send(self, due):
+        self.reminders.extend(due)
+
+def test_reminder_fires_for_bulk_created_interview(client, monkeypatch):
+    sink = CaptureSink()
+    monkeypatch.setattr(reminders.scheduler, "sink", sink)
+    company = client.post("/api/companies/", json={"name": "Acme"}).json()
+    application = client.post("/api/applications/", json={"job_title": "Engineer", "company_id": company["id"]}).json()
+
+    # Stored naive, so the reminder must be keyed on the stored wall time, not the offset-aware input
+    due = datetime.utcnow() + reminders.scheduler.lead + timedelta(seconds=1)
+    scheduled_at = due.replace(tzinfo=timezone(timedelta(hours=5))).isoformat()
+    response = client.post("/api/interviews/bulk", json=[{"application_id": application["id"], "scheduled_at": scheduled_at}])
+    [interview_id] = response.json()["ids"]
+
+    deadline = time.monotonic() + 5
+    while not sink.reminders and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert [reminder.interview_id for reminder in sink.reminders] == [interview_id]
@@ -0,0 +1,39 @@
+from app import stats
+from app.models import UserStats
+
+def _counters(db, user_id):
+    db.expire_all()
+    return stats.compute(db, user_id), db.get(UserStats, user_id)
+
+def test_counters_follow_every_kind_of_write(client, db):
+    company = client.post("/api/companies/", json={"name": "Acme"}).json()
+    application = client.post(
+        "/api/applications/", json={"job_title": "Engineer", "company_id": company["id"], "status": "applied"}
+    ).json()
+    client.post("/api/interviews/", json={"application_id": application["id"], "scheduled_at": "2030-01-01T10:00:00"})
+    client.post("/api/contacts/", json={"name": "Dana", "company_id": company["id"]})
+    client.put(f"/api/applications/{application['id']}", json={"status": "offer"})
+
+    csv = "job_title,company_name,status\nBackend,Acme,applied\nFrontend,Acme,rejected\nData,Nowhere,saved\n"
+    imported = client.post("/api/import/applications", files={"file": ("jobs.csv", csv, "text/csv")}).json()
+    assert imported["created"] == 2 and len(imported["errors"]) == 1
+    client.delete(f"/api/applications/{imported['ids'][0]}")
+
+    actual, _ = _counters(db, client.user_id)
+    assert stats.verify(db, client.user_id) == {}
+    assert actual["total_applications"] == 2
+    assert actual["total_interviews"] == 1
+    assert actual["total_contacts"] == 1
+
+def test_every_write_bumps_the_data_version(client, db):
+    company = client.post("/api/companies/", json={"name": "Acme"}).json()
+    versions = [_counters(db, client.user_id)[1].data_version]
+    for write in (
+        lambda: client.put(f"/api/companies/{company['id']}", json={"notes": "updated"}),
+        lambda: client.post("/api/companies/bulk", json=[{"name": "Globex"}]),
+        lambda: client.delete(f"/api/companies/{company['id']}"),
+    ):
+        assert write().status_code in (200, 204)
+        versions.append(_counters(db, client.user_id)[1].data_version)
+    assert versions == sorted(set(versions))
+    assert stats.verify(db, client.user_id) == {}
@@ -0,0 +1,54 @@
+from datetime import date, datetime, timedelta
+from app import timeseries
+
+TODAY = datetime.utcnow().date()
+
+def _day(days_ago: int) -> date:
+    return TODAY - timedelta(days=days_ago)
+
+def _counts(client, days_back: int = 20):
+    response = client.get("/api/analytics/timeseries", params={
+        "metric": "applications", "bucket": "day", "from": _day(days_back).isoformat(), "to": TODAY.isoformat(),
+    })
+    assert response.status_code == 200, response.text
+    return {date.fromisoformat(point["start"]): point["count"] for point in response.json()["points"]}
+
+def _uncached(client, days_back: int = 20):
+    timeseries._closed.clear()
+    return _counts(client, days_back)
+
+def test_backdated_writes_invalidate_closed_buckets(client):
+    company = client.post("/api/companies/", json={"name": "Acme"}).json()
+    apply = lambda days_ago: client.post("/api/applications/", json={
+        "job_title": "Engineer", "company_id": company["id"], "applied_date": f"{_day(days_ago)}T09:00:00",
+    }).json()
+    first = apply(10)
+    apply(10)
+
+    counts = _counts(client)
+    assert counts[_day(10)] == 2 and sum(counts.values()) == 2
+    cached = timeseries._closed.get((client.user_id, "applications", "day"))
+    assert cached is not None and cached.stop == TODAY
+
+    # Activity today only touches the open bucket; the closed ones stay cached
+    apply(0)
+    assert _counts(client)[TODAY] == 1
+    assert timeseries._closed.get((client.user_id, "applications", "day")) is cached
+
+    apply(5)
+    client.put(f"/api/applications/{first['id']}", json={"applied_date": f"{_day(15)}T09:00:00"})
+    counts = _counts(client)
+    assert (counts[_day(15)], counts[_day(10)], counts[_day(5)], counts[TODAY]) == (1, 1, 1, 1)
+    assert counts == _uncached(client)
+
+def test_widening_the_range_extends_the_cache(client):
+    company = client.post("/api/companies/", json={"name": "Acme"}).json()
+    for days_ago in (3, 12, 25):
+        client.post("/api/applications/", json={
+            "job_title": "Engineer", "company_id": company["id"], "applied_date": f"{_day(days_ago)}T09:00:00",
+        })
+
+    assert sum(_counts(client, 7).values()) == 1
+    counts = _counts(client, 30)
+    assert sum(counts.values()) == 3
+    assert counts == _uncached(client, 30)
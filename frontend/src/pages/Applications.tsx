@@ -20,11 +20,6 @@ export default function Applications() {
   const [applications, setApplications] = useState<Application[]>([])
   const [companies, setCompanies] = useState<any[]>([])
   const [loading, setLoading] = useState(true)
-  
-  const getCompanyName = (companyId: number) => {
-    const company = companies.find(c => c.id === companyId)
-    return company?.name || 'Unknown Company'
-  }
   const [showModal, setShowModal] = useState(false)
   const [editing, setEditing] = useState<Application | null>(null)
   const [formData, setFormData] = useState({
@@ -41,12 +36,16 @@ export default function Applications() {
 
   useEffect(() => {
     fetchApplications()
-    fetchCompanies()
   }, [])
 
+  // The company list is only needed for the form's dropdown
+  useEffect(() => {
+    if (showModal && companies.length === 0) fetchCompanies()
+  }, [showModal])
+
   const fetchApplications = async () => {
     try {
-      const response = await axios.get('/api/applications/')
+      const response = await axios.get('/api/applications/', { params: { expand: 'company' } })
       setApplications(response.data)
     } catch (error) {
       console.error('Failed to fetch applications:', error)
@@ -179,7 +178,7 @@ export default function Applications() {
                         )}
                       </div>
                       <div className="mt-2 flex items-center text-sm text-gray-500">
-                        <span className="truncate">{getCompanyName(app.company_id)}</span>
+                        <span className="truncate">{app.company?.name || 'Unknown Company'}</span>
                         {app.salary_min && (
                           <span className="ml-4">
                             {app.salary_currency} {app.salary_min}
@@ -30,12 +30,16 @@ export default function Contacts() {
 
   useEffect(() => {
     fetchContacts()
-    fetchCompanies()
   }, [])
 
+  // The company list is only needed for the form's dropdown
+  useEffect(() => {
+    if (showModal && companies.length === 0) fetchCompanies()
+  }, [showModal])
+
   const fetchContacts = async () => {
     try {
-      const response = await axios.get('/api/contacts/')
+      const response = await axios.get('/api/contacts/', { params: { expand: 'company' } })
       setContacts(response.data)
     } catch (error) {
       console.error('Failed to fetch contacts:', error)
@@ -20,18 +20,7 @@ interface Interview {
 export default function Interviews() {
   const [interviews, setInterviews] = useState<Interview[]>([])
   const [applications, setApplications] = useState<any[]>([])
-  const [companies, setCompanies] = useState<any[]>([])
   const [loading, setLoading] = useState(true)
-  
-  const getApplicationInfo = (applicationId: number) => {
-    const app = applications.find(a => a.id === applicationId)
-    if (!app) return { job_title: 'Unknown Position', company_name: null }
-    const company = companies.find(c => c.id === app.company_id)
-    return {
-      job_title: app.job_title || 'Unknown Position',
-      company_name: company?.name || null
-    }
-  }
   const [showModal, setShowModal] = useState(false)
   const [editing, setEditing] = useState<Interview | null>(null)
   const [formData, setFormData] = useState({
@@ -48,22 +37,16 @@ export default function Interviews() {
 
   useEffect(() => {
     fetchInterviews()
-    fetchApplications()
-    fetchCompanies()
   }, [])
-  
-  const fetchCompanies = async () => {
-    try {
-      const response = await axios.get('/api/companies/')
-      setCompanies(response.data)
-    } catch (error) {
-      console.error('Failed to fetch companies:', error)
-    }
-  }
+
+  // The application list is only needed for the form's dropdown
+  useEffect(() => {
+    if (showModal && applications.length === 0) fetchApplications()
+  }, [showModal])
 
   const fetchInterviews = async () => {
     try {
-      const response = await axios.get('/api/interviews/')
+      const response = await axios.get('/api/interviews/', { params: { expand: 'application,company' } })
       setInterviews(response.data)
     } catch (error) {
       console.error('Failed to fetch interviews:', error)
@@ -74,7 +57,7 @@ export default function Interviews() {
 
   const fetchApplications = async () => {
     try {
-      const response = await axios.get('/api/applications/')
+      const response = await axios.get('/api/applications/', { params: { expand: 'company' } })
       setApplications(response.data)
     } catch (error) {
       console.error('Failed to fetch applications:', error)
@@ -190,19 +173,12 @@ export default function Interviews() {
                 <div className="flex items-center justify-between">
                   <div className="flex items-center">
                     <div>
-                      {(() => {
-                        const appInfo = getApplicationInfo(interview.application_id)
-                        return (
-                          <>
-                            <p className="text-sm font-medium text-blue-600 truncate">
-                              {appInfo.job_title}
-                            </p>
-                            {appInfo.company_name && (
-                              <p className="text-sm text-gray-500">{appInfo.company_name}</p>
-                            )}
-                          </>
-                        )
-                      })()}
+                      <p className="text-sm font-medium text-blue-600 truncate">
+                        {interview.application?.job_title || 'Unknown Position'}
+                      </p>
+                      {interview.application?.company && (
+                        <p className="text-sm text-gray-500">{interview.application.company.name}</p>
+                      )}
                       <div className="mt-2 flex items-center text-sm text-gray-500 space-x-4">
                         <span>{format(new Date(interview.scheduled_at), 'MMM d, yyyy h:mm a')}</span>
                         {interview.interview_type && (
@@ -267,14 +243,11 @@ export default function Interviews() {
                         onChange={(e) => setFormData({ ...formData, application_id: e.target.value })}
                       >
                         <option value="">Select an application</option>
-                        {applications.map((app) => {
-                          const company = companies.find(c => c.id === app.company_id)
-                          return (
-                            <option key={app.id} value={app.id}>
-                              {app.job_title} - {company?.name || 'Unknown'}
-                            </option>
-                          )
-                        })}
+                        {applications.map((app) => (
+                          <option key={app.id} value={app.id}>
+                            {app.job_title} - {app.company?.name || 'Unknown'}
+                          </option>
+                        ))}
                       </select>
                     </div>
                     <div>